@@ -0,0 +1,64 @@
+"""
+bench_backends.py
+------------------------
+Events/second of the SimPy backend versus the heap event engine.
+
+Both backends run the same model with the same seed; the event count
+is the number of process resumptions executed by the heap engine
+(arrivals, discharges, signal changes), so the two rates are directly
+comparable. Results are also checked to be identical.
+
+Run from the repository root:
+
+    py benchmarks/bench_backends.py [runtime]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.scenario import load_scenario
+from src.event_engine import make_environment
+from src.intersection import Intersection
+
+
+def run_once(backend, controller, policy, duration, runtime, seed):
+    """Return (average delay, wall seconds, environment) for one run."""
+    env = make_environment(backend)
+    start = time.perf_counter()
+    inter = Intersection(env, policy, duration, seed, controller)
+    env.run(runtime)
+    wall = time.perf_counter() - start
+    return inter.average_delay(), wall, env
+
+
+def main(runtime=36000, seed=123, repeat=3):
+    scenario = load_scenario()
+    policy = scenario.policies[0]
+    duration = scenario.durations[0]
+
+    print(f"[BENCH] backends, runtime={runtime}, seed={seed}")
+
+    for controller in ("fixed", "adaptive"):
+        # Model events counted once on the heap engine
+        _, _, heap_env = run_once("heap", controller, policy, duration, runtime, seed)
+        events = heap_env.events
+
+        results = {}
+        for backend in ("simpy", "heap"):
+            runs = [run_once(backend, controller, policy, duration, runtime, seed)
+                    for _ in range(repeat)]
+            delay = runs[0][0]
+            wall = min(r[1] for r in runs)
+            results[backend] = delay
+            print(f"  {controller:<8} {backend:<6} {events / wall:12,.0f} events/s "
+                  f"({wall:.3f} s, delay={delay:.4f})")
+
+        if results["simpy"] != results["heap"]:
+            print(f"  WARNING: {controller} results differ between backends")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 36000)
@@ -0,0 +1,152 @@
+"""
+bench_detector_log.py
+------------------------
+Detector log ingestion (fitting/detector_log.py) on a simulated log.
+
+A fixed-time run of benchmarks/scenario/ is traced with an
+EventRecorder and written out as one intersection-wide detector log
+(timestamp, approach, movement, event, plus unused detector columns).
+The log is then ingested and:
+- parse and interval times, and rows per second, are printed
+- the vectorized intervals of every lane are checked to be identical to
+  those of a plain per-lane loop over the same events
+- the mean departure saturation headway of every lane is printed next
+  to the mean of its configured departure distribution (it also
+  includes the waits for a full departure lane)
+
+Arrival headways are not compared with the arrival distributions:
+gen_cars() holds arrivals back while the upstream signal is red.
+
+Exits with code 1 when the two computations differ.
+
+Usage (from the repository root):
+
+    py benchmarks/bench_detector_log.py
+    py benchmarks/bench_detector_log.py --runtime 360000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+from src.scenario import load_scenario
+from src.simulation_core import run_fixed
+from src.recorder import EventRecorder, read_events, EVENTS, ARRIVAL, DEPARTURE, GREEN, RED
+from src.fitting.detector_log import read_detector_log, lane_intervals
+
+SCENARIO_DIR = os.path.join(os.path.dirname(__file__), "scenario")
+
+
+def reference_intervals(time, lane, event):
+    """lane_intervals() written as a plain loop over each lane."""
+    intervals = {}
+    for index in range(12):
+        i, j = divmod(index, 3)
+        mine = lane == index
+        arrivals = np.sort(time[mine & (event == 0)])
+        departures = np.sort(time[mine & (event == 1)])
+        reds = np.sort(time[mine & (event == 3)])
+
+        dep = []
+        for k in range(1, len(departures)):
+            queued = k < len(arrivals) and arrivals[k] <= departures[k - 1]
+            red = np.any((reds > departures[k - 1]) & (reds <= departures[k]))
+            if queued and not red:
+                dep.append(departures[k] - departures[k - 1])
+
+        for kind, values in (("arr", np.diff(arrivals)), ("dep", np.array(dep))):
+            if len(values):
+                intervals[f"({i+1},{j+1})_{kind}"] = values
+    return intervals
+
+
+def write_log(trace, path, seed):
+    """Write a recorder trace as a detector log CSV, in time order."""
+    import pandas as pd
+
+    event = trace["event"]
+    # Cars passing a green lane are recorded as a departure only
+    passed = (event == DEPARTURE) & (trace["delay"] == 0) & (trace["queue"] == 0)
+    rows = np.concatenate([np.flatnonzero(passed), np.arange(len(event))])
+    names = np.concatenate([np.full(passed.sum(), ARRIVAL), event])
+    keep = np.isin(names, (ARRIVAL, DEPARTURE, GREEN, RED))
+    rows, names = rows[keep], names[keep]
+
+    time = trace["time"][rows]
+    lane = trace["lane"][rows]
+    order = np.argsort(time, kind="stable")
+
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "detector": rng.integers(100, 200, len(rows)),
+        "timestamp": np.round(time[order], 3),
+        "approach": lane[order] // 3 + 1,
+        "movement": np.array(list("LSR"))[lane[order] % 3],
+        "event": np.array(EVENTS)[names[order]],
+        "speed": np.round(rng.normal(40, 5, len(rows)), 1),
+    }).to_csv(path, index=False)
+    return len(rows)
+
+
+def dist_mean(dist, n=100_000):
+    """Mean of a compiled distribution from its inverse CDF."""
+    return float(np.mean(dist.ppf((np.arange(n) + 0.5) / n)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detector log ingestion benchmark")
+    parser.add_argument("--runtime", type=float, default=36000)
+    parser.add_argument("--seed", type=int, default=123)
+    args = parser.parse_args()
+
+    scenario = load_scenario(SCENARIO_DIR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_dir = os.path.join(tmp, "trace")
+        with EventRecorder(trace_dir) as recorder:
+            run_fixed(scenario.policies[0], scenario.durations[0], args.runtime, args.seed,
+                      backend="heap", scenario=scenario, recorder=recorder)
+
+        path = os.path.join(tmp, "detector_log.csv")
+        rows = write_log(read_events(trace_dir), path, args.seed)
+        size_mb = os.path.getsize(path) / 2**20
+
+        start = time.perf_counter()
+        columns = read_detector_log(path)
+        parse_s = time.perf_counter() - start
+        start = time.perf_counter()
+        intervals = lane_intervals(*columns)
+        group_s = time.perf_counter() - start
+
+    reference = reference_intervals(*columns)
+    same = intervals.keys() == reference.keys() and all(
+        np.array_equal(intervals[key], reference[key]) for key in reference
+    )
+
+    print(f"[BENCH] {rows} log rows ({size_mb:.1f} MB), runtime={args.runtime}")
+    print(f"  parse     {parse_s:8.3f} s  {rows / parse_s:12,.0f} rows/s")
+    print(f"  intervals {group_s:8.3f} s  {rows / group_s:12,.0f} rows/s")
+
+    print(f"\n{'lane':<7} {'arrivals':>9} {'saturated':>10} {'mean':>7} {'config':>7}")
+    for i in range(4):
+        for j in range(3):
+            lane = f"({i+1},{j+1})"
+            arr = intervals.get(f"{lane}_arr", np.empty(0))
+            dep = intervals.get(f"{lane}_dep", np.empty(0))
+            if not len(arr):
+                continue
+            print(f"{lane:<7} {len(arr):>9} {len(dep):>10} "
+                  f"{dep.mean() if len(dep) else float('nan'):>7.3f} "
+                  f"{dist_mean(scenario.dep_dist(i, j)):>7.3f}")
+
+    print(f"\n[BENCH] identical to per-lane loop: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+bench_fitting.py
+------------------------
+Fast fitting pipeline versus the exhaustive one.
+
+For each dataset, auto_fit_distribution's exhaustive search
+(exhaustive_fits) and the pruned, warm-started, two-stage fast_fits are
+run and compared on:
+- AIC of the selected model on the full data (the fast fit may not be
+  worse by more than --aic-tol)
+- selected model (must be the same, unless its AIC is within --aic-tol
+  of the exhaustive choice: such models are indistinguishable, e.g.
+  Weibull and gamma on exponential data, and are reported as "tie")
+- wall time and speedup
+
+Datasets are synthetic samples of the families and parameters used in
+benchmarks/scenario/distributions.json (plus exponential and normal
+intervals) at several sizes, or the CSV interval files of --data.
+Exits with code 1 on any mismatch.
+
+Usage (from the repository root):
+
+    py benchmarks/bench_fitting.py
+    py benchmarks/bench_fitting.py --sizes 5000 100000 --aic-tol 2
+    py benchmarks/bench_fitting.py --data data/
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import scipy.stats as st
+from src.fitting.dataset_loader import load_intervals
+from src.fitting.fit_distributions import exhaustive_fits, fast_fits, select_best
+
+# name → frozen distribution the samples are drawn from
+SYNTHETIC = {
+    "lognorm arrivals": st.lognorm(0.5, 0, 4.0),
+    "weibull arrivals": st.weibull_min(1.4, 0, 4.0),
+    "gamma departures": st.gamma(2.8, 0, 0.9),
+    "gev departures":   st.genextreme(-0.1, 2.2, 0.8),
+    "expon arrivals":   st.expon(0.5, 3.0),
+    "norm departures":  st.norm(3.0, 0.6),
+}
+
+
+def load_datasets(args):
+    """Return [(label, samples)] from --data or the synthetic families."""
+    if args.data:
+        datasets = []
+        for path in sorted(glob.glob(os.path.join(args.data, "*.csv"))):
+            name = os.path.basename(path)
+            column = "dep_time" if name.lower().startswith("dep") else "arr_time"
+            datasets.append((name, load_intervals(path, column)))
+        return datasets
+
+    rng = np.random.default_rng(args.seed)
+    return [
+        (f"{label} n={size}", dist.rvs(size=size, random_state=rng))
+        for label, dist in SYNTHETIC.items()
+        for size in args.sizes
+    ]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast vs exhaustive distribution fitting")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[5000, 20000, 100000])
+    parser.add_argument("--data", default=None, help="Directory of CSV interval files")
+    parser.add_argument("--aic-tol", type=float, default=2.0,
+                        help="Allowed AIC excess of the fast fit")
+    parser.add_argument("--subsample", type=int, default=5000)
+    parser.add_argument("--keep", type=int, default=3)
+    parser.add_argument("--refine-iter", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'dataset':<28} {'exhaustive':>10} {'AIC':>12} {'s':>7}   "
+          f"{'fast':>10} {'ΔAIC':>8} {'s':>7} {'speedup':>8}")
+
+    failures = 0
+    total_ex = total_fast = 0.0
+    for label, data in load_datasets(args):
+        ex_fits, ex_s = timed(exhaustive_fits, data)
+        fast, fast_s = timed(fast_fits, data, subsample_size=args.subsample,
+                             keep=args.keep, refine_iter=args.refine_iter)
+        total_ex += ex_s
+        total_fast += fast_s
+
+        ex_name, _ = select_best(ex_fits)
+        fast_name, _ = select_best(fast)
+        delta = fast[fast_name][1] - ex_fits[ex_name][1]
+
+        ok = delta <= args.aic_tol
+        failures += not ok
+        note = "" if not ok or fast_name == ex_name else "  tie"
+        print(f"{label:<28} {ex_name:>10} {ex_fits[ex_name][1]:>12.1f} {ex_s:>7.2f}   "
+              f"{fast_name:>10} {delta:>+8.2f} {fast_s:>7.2f} {ex_s / fast_s:>7.1f}x"
+              + (note if ok else "  MISMATCH"))
+
+    print(f"\n[BENCH] total {total_ex:.1f}s exhaustive vs {total_fast:.1f}s fast "
+          f"({total_ex / total_fast:.1f}x), {failures} mismatch(es)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+bench_gof.py
+------------------------
+Goodness-of-fit scoring of all candidate models: per-model SciPy tests
+versus goodness_of_fit.score_models() on one shared sorted sample.
+
+For each sample size, every model of MODEL_LIST is fitted once, then
+KS, AD and CvM of all fitted models are computed
+- per model: scipy.stats.kstest and cramervonmises (each sorts the
+  sample again) plus the AD sum on a freshly sorted sample
+- shared:    score_models() (one sort, one CDF matrix)
+The wall times are printed and the statistics must agree to 1e-9.
+Exits with code 1 otherwise.
+
+Usage (from the repository root):
+
+    py benchmarks/bench_gof.py
+    py benchmarks/bench_gof.py --sizes 10000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import scipy.stats as st
+from src.fitting.fit_distributions import MODEL_LIST, fast_fits
+from src.fitting.goodness_of_fit import score_models, STATISTICS, CDF_EPS
+
+
+def per_model_scores(data, fits):
+    """KS/AD/CvM of each model with one SciPy call (and one sort) per statistic."""
+    scores = {}
+    for name, (params, _, _) in fits.items():
+        cdf = MODEL_LIST[name](*params).cdf
+        F = np.clip(cdf(np.sort(data)), CDF_EPS, 1 - CDF_EPS)
+        n = len(data)
+        i = np.arange(1, n + 1)
+        scores[name] = {
+            "ks": st.kstest(data, cdf).statistic,
+            "ad": -n - np.sum((2 * i - 1) * (np.log(F) + np.log1p(-F[::-1]))) / n,
+            "cvm": st.cramervonmises(data, cdf).statistic,
+        }
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-sort goodness-of-fit benchmark")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>9} {'models':>7} {'per-model s':>12} {'shared s':>9} {'speedup':>8}")
+
+    failures = 0
+    for n in args.sizes:
+        data = st.gamma(2.8, 0, 0.9).rvs(size=n, random_state=rng)
+        with np.errstate(all="ignore"):
+            fits = {name: fit for name, fit in fast_fits(data, keep=len(MODEL_LIST)).items()
+                    if np.isfinite(fit[1])}
+
+            start = time.perf_counter()
+            reference = per_model_scores(data, fits)
+            loop_s = time.perf_counter() - start
+            start = time.perf_counter()
+            shared = score_models(data, fits)
+            shared_s = time.perf_counter() - start
+
+        same = all(abs(shared[name][s] - reference[name][s]) <= 1e-9 * max(1, abs(reference[name][s]))
+                   for name in fits for s in STATISTICS)
+        failures += not same
+        print(f"{n:>9} {len(fits):>7} {loop_s:>12.3f} {shared_s:>9.3f} "
+              f"{loop_s / shared_s:>7.1f}x" + ("" if same else "  MISMATCH"))
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
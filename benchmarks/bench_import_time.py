@@ -0,0 +1,114 @@
+"""
+bench_import_time.py
+------------------------
+Import-time budget check for each CLI mode and for worker processes.
+
+Every mode is started in a fresh interpreter under `python -X importtime`
+(CLI modes run for real on the benchmark scenario, with the result cache
+off). The total self time of all imports is compared with the mode's
+budget, and modules a mode must not load at all (e.g. matplotlib for a
+--fixed run) are reported. Exits with code 1 on any violation.
+
+Budgets are in milliseconds on a typical desktop; scale them for slower
+machines with --scale.
+
+Usage (from the repository root):
+
+    py benchmarks/bench_import_time.py
+    py benchmarks/bench_import_time.py --scale 2 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCENARIO = os.path.join(ROOT, "benchmarks", "scenario")
+
+# mode → (interpreter arguments, budget ms, top-level packages it must not import)
+MODES = {
+    "help": (["main.py", "--help"], 100,
+             ("numpy", "scipy", "simpy", "matplotlib", "pandas")),
+    "fixed": (["main.py", "--fixed", "--no-cache"], 2000,
+              ("matplotlib", "pandas")),
+    "adaptive": (["main.py", "--adaptive", "--no-cache"], 2000,
+                 ("matplotlib", "pandas")),
+    "experiment": (["main.py", "--experiment", "--no-cache"], 2000,
+                   ("pandas",)),
+    "worker": (["-c", "import src.parallel, src.simulation_core"], 2000,
+               ("matplotlib", "pandas")),
+    "fit": (["-c", "import src.fitting.fit_all_distributions"], 2000,
+            ("matplotlib", "simpy", "pandas")),
+}
+
+
+def import_profile(args):
+    """
+    Run `python -X importtime <args>` and parse its report.
+
+    Returns:
+        (total self time in ms, {top-level package: self time in ms})
+    """
+    env = dict(os.environ, ASC_CONFIG_DIR=SCENARIO, ASC_NO_CACHE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+
+    total = 0
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+
+    return total / 1000, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-mode import-time budgets")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget (slower machines)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per mode; the fastest counts")
+    parser.add_argument("--modes", nargs="*", default=list(MODES),
+                        help=f"Modes to check (default: all of {', '.join(MODES)})")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'mode':<12} {'import ms':>10} {'budget':>8}  heaviest packages")
+    for mode in args.modes:
+        cmd, budget, forbidden = MODES[mode]
+        budget *= args.scale
+
+        runs = [import_profile(cmd) for _ in range(args.repeat)]
+        total, packages = min(runs, key=lambda r: r[0])
+
+        heaviest = sorted(packages.items(), key=lambda kv: -kv[1])[:3]
+        print(f"{mode:<12} {total:>10.1f} {budget:>8.0f}  "
+              + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest))
+
+        if total > budget:
+            failures.append(f"{mode}: {total:.0f} ms of imports > budget {budget:.0f} ms")
+        loaded = sorted(set(forbidden) & set(packages))
+        if loaded:
+            failures.append(f"{mode}: imports {', '.join(loaded)}")
+
+    if failures:
+        print(f"\n[BENCH] {len(failures)} import budget violation(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print("\n[BENCH] All modes within their import budgets.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
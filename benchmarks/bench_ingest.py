@@ -0,0 +1,96 @@
+"""
+bench_ingest.py
+------------------------
+CSV interval ingestion: whole-file pandas load versus the chunked,
+column-pruned loader and its `.npy` cache (dataset_loader.py).
+
+A detector-style CSV with `--columns` extra columns is written to a
+temporary directory, then three ways of getting its `arr_time` intervals
+are timed, with their peak traced memory:
+- full:   load_dataset() + column extraction (the old fit_all path)
+- cold:   load_intervals() on a cache miss (chunked parse + cache write)
+- cached: load_intervals() on a cache hit (memory-mapped .npy)
+
+All three must return the same values. Exits with code 1 otherwise.
+
+Usage (from the repository root):
+
+    py benchmarks/bench_ingest.py
+    py benchmarks/bench_ingest.py --rows 5000000 --columns 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+from src.fitting.dataset_loader import load_dataset, load_intervals
+
+
+def write_csv(path, rows, columns, seed):
+    """Detector-like export: timestamp, lane, arr_time and float columns."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "timestamp": np.cumsum(rng.exponential(3.0, rows)),
+        "lane": rng.integers(1, 13, rows),
+        "arr_time": rng.lognormal(1.0, 0.5, rows),
+    })
+    for c in range(columns):
+        df[f"sensor_{c}"] = rng.random(rows)
+    df.loc[rng.choice(rows, rows // 1000, replace=False), "arr_time"] = np.nan
+    df.to_csv(path, index=False)
+
+
+def measure(func, *args, **kwargs):
+    """Run func: (result, seconds, peak traced MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def full_load(path):
+    return load_dataset(path)["arr_time"].dropna().values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV interval ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "arr_12.csv")
+        write_csv(path, args.rows, args.columns, args.seed)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"[BENCH] {args.rows} rows, {args.columns + 3} columns, {size_mb:.0f} MB")
+
+        full, full_s, full_mb = measure(full_load, path)
+        cold, cold_s, cold_mb = measure(load_intervals, path, "arr_time", args.chunk_size)
+        cached, cached_s, cached_mb = measure(load_intervals, path, "arr_time", args.chunk_size)
+
+        print(f"{'path':<8} {'wall s':>8} {'peak MB':>9} {'speedup':>8}")
+        for name, seconds, peak in (("full", full_s, full_mb), ("cold", cold_s, cold_mb),
+                                    ("cached", cached_s, cached_mb)):
+            print(f"{name:<8} {seconds:>8.3f} {peak:>9.1f} {full_s / seconds:>7.1f}x")
+
+        same = np.array_equal(full, cold) and np.array_equal(full, cached)
+        print(f"[BENCH] identical values: {same}")
+        del cached  # release the memory map before the directory is removed
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+bench_lane_queue.py
+------------------------
+Micro-benchmark of the lane queue hot path.
+
+Compares per-event cost (one enqueue + one dequeue at a steady queue
+depth) of:
+- before: per-car object() in a list plus a parallel timestamp list,
+          dequeued with list.pop(0) twice
+- after:  bounded deque of timestamps, as used by Lane
+
+Run from the repository root:
+
+    py benchmarks/bench_lane_queue.py
+"""
+
+import timeit
+from collections import deque
+
+
+def list_queue_events(n_events, depth):
+    """Old Lane storage: lane_q of objects + time_q of timestamps."""
+    lane_q = [object() for _ in range(depth)]
+    time_q = [0.0] * depth
+    now = 0.0
+    for _ in range(n_events):
+        now += 1.0
+        lane_q.append(object())
+        time_q.append(now)
+        lane_q.pop(0)
+        time_q.pop(0)
+
+
+def ring_queue_events(n_events, depth):
+    """New Lane storage: bounded ring of timestamps."""
+    q = deque([0.0] * depth, maxlen=depth + 1)
+    now = 0.0
+    for _ in range(n_events):
+        now += 1.0
+        q.append(now)
+        q.popleft()
+
+
+def main(n_events=200_000, depth=30, repeat=5):
+    print(f"[BENCH] lane queue, depth={depth}, events={n_events}")
+
+    for label, func in [("list (before)", list_queue_events),
+                        ("ring (after)", ring_queue_events)]:
+        best = min(timeit.repeat(lambda: func(n_events, depth), number=1, repeat=repeat))
+        print(f"  {label:<14} {best / n_events * 1e9:8.1f} ns/event")
+
+
+if __name__ == "__main__":
+    main()
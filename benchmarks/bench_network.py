@@ -0,0 +1,70 @@
+"""
+bench_network.py
+------------------------
+Scaling of partitioned corridor simulation (network.py).
+
+Corridors of 1 to 32 intersections are simulated with 1, 2, 4, ...
+partitions (one process each beyond the first). For every size the
+wall time, speedup over one partition, parallel efficiency and
+intersection-seconds simulated per wall second are printed, and the
+results of every partitioning are checked to be identical.
+
+Speedup needs free cores: with fewer cores than partitions the extra
+processes only add window synchronization cost.
+
+Run from the repository root:
+
+    py benchmarks/bench_network.py [runtime] [max_partitions]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.scenario import load_scenario
+from src.network import corridor_topology, run_network
+
+SIZES = (1, 2, 4, 8, 16, 32)
+
+
+def main(runtime=3600, max_partitions=None, seed=123, travel_time=30.0, backend="heap"):
+    scenario = load_scenario()
+    max_partitions = max_partitions or os.cpu_count() or 1
+
+    print(f"[BENCH] corridor scaling, runtime={runtime}, travel_time={travel_time}s, "
+          f"backend={backend}, {os.cpu_count()} core(s)")
+    print(f"{'size':>5} {'parts':>6} {'wall s':>8} {'speedup':>8} {'effic.':>7} "
+          f"{'int·s/s':>10} {'windows':>8} {'transfers':>10}")
+
+    mismatches = 0
+    for size in SIZES:
+        topology = corridor_topology(size, travel_time)
+        partitions = [1]
+        while partitions[-1] * 2 <= min(size, max_partitions):
+            partitions.append(partitions[-1] * 2)
+
+        baseline = None
+        for parts in partitions:
+            result = run_network(topology, runtime, seed, parts, backend=backend,
+                                 scenario=scenario)
+            if baseline is None:
+                baseline = result
+            elif result["intersections"] != baseline["intersections"]:
+                mismatches += 1
+                print(f"  WARNING: {size} intersections, {parts} partitions: "
+                      f"results differ from 1 partition")
+
+            speedup = baseline["wall"] / result["wall"]
+            print(f"{size:>5} {parts:>6} {result['wall']:>8.2f} {speedup:>8.2f} "
+                  f"{speedup / parts:>7.2f} {size * runtime / result['wall']:>10,.0f} "
+                  f"{result['windows']:>8} {result['transfers']:>10}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 3600,
+        int(sys.argv[2]) if len(sys.argv) > 2 else None,
+    ))
@@ -0,0 +1,408 @@
+"""
+run_benchmarks.py
+------------------------
+Performance benchmark suite with stored baselines.
+
+Covers:
+- run_fixed / run_adaptive at several runtimes
+- get_inverse_cdf throughput per distribution in DISTRIBUTION_MAP
+- auto_fit_distribution on synthetic datasets of increasing size
+- full experiment wall time (fixed + adaptive experiments)
+- a fixed reference workload timing the machine itself
+
+Each benchmark records wall time, a throughput (events/s, calls/s or
+samples/s) and peak traced memory. Wall time is the best of several
+timed samples (see measure_all): short benchmarks are repeated for at
+least MIN_SAMPLE_S seconds per sample, and the samples of each
+benchmark are interleaved with those of the others, so
+millisecond-scale runs compare reliably on a noisy machine.
+
+Results are written to JSON and compared against a committed baseline;
+the run fails (exit code 1) when any metric regresses by more than the
+tolerance. Throughputs are compared relative to a fixed reference
+workload timed along with the benchmarks, so a machine that is
+uniformly slower than when the baseline was recorded does not count as
+a regression.
+
+By default the self-contained scenario in benchmarks/scenario/ is used,
+so results do not depend on locally fitted distributions.
+
+Usage (from the repository root):
+
+    py benchmarks/run_benchmarks.py                    # compare to baseline
+    py benchmarks/run_benchmarks.py --update-baseline  # store new baseline
+    py benchmarks/run_benchmarks.py --quick --tolerance 0.5
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCENARIO = os.path.join(BENCH_DIR, "scenario")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+
+# Representative parameters for each distribution family
+PPF_PARAMS = {
+    "genextreme":  [-0.1, 0, 1],
+    "lognorm":     [0.5, 0, 1],
+    "gamma":       [2.0, 0, 1],
+    "weibull_min": [1.5, 0, 1],
+    "pareto":      [3.0, 0, 1],
+    "burr":        [3.0, 2.0, 0, 1],
+    "burr12":      [3.0, 2.0, 0, 1],
+    "beta":        [2.0, 3.0, 0, 1],
+    "chi2":        [3.0, 0, 1],
+    "logistic":    [0, 1],
+    "rayleigh":    [0, 1],
+    "uniform":     [0, 1],
+    "norm":        [0, 1],
+    "expon":       [0, 1],
+}
+
+# Compared metric → True if larger values are better
+# (wall_s is reported but not compared: it mirrors throughput)
+METRIC_HIGHER_IS_BETTER = {
+    "throughput": True,
+    "peak_mem_mb": False,
+}
+
+
+# Shortest timed sample: faster calls are repeated within one sample
+# until it lasts this long, so timer resolution does not matter
+MIN_SAMPLE_S = 0.2
+DEFAULT_ROUNDS = 7
+
+# Benchmark of the machine itself (see bench_machine)
+REFERENCE_CASE = "machine_reference"
+
+
+def _quiet_call(func, number=1):
+    """Call `func` `number` times without output; (last result, seconds per call)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(number):
+            work = func()
+        return work, (time.perf_counter() - start) / number
+
+
+def measure_all(cases, rounds=DEFAULT_ROUNDS, min_sample_s=MIN_SAMPLE_S):
+    """
+    Time every benchmark case and measure its peak traced memory.
+
+    One untimed call per case warms caches up and calibrates how many
+    calls (`number`) one timed sample needs to last `min_sample_s`.
+    Samples are then taken in `rounds` rounds of one sample per case,
+    so the samples of a case are spread over the whole suite rather
+    than taken back to back: a slow spell of the machine (other load,
+    frequency scaling) then affects one sample of many cases instead
+    of every sample of one case. The wall time is the best per-call
+    time; `spread` (median sample over the best one, minus one) shows
+    the timing noise.
+
+    Args:
+        cases (dict): name → function returning the amount of work done
+            (events, calls, samples), which is turned into a throughput
+        rounds (int): timed samples per case
+
+    Returns:
+        dict: name → {"wall_s", "throughput", "peak_mem_mb", "number", "spread"}
+    """
+    numbers, work = {}, {}
+    for name, func in cases.items():
+        work[name], first = _quiet_call(func)
+        numbers[name] = max(1, math.ceil(min_sample_s / first)) if first > 0 else 1
+
+    samples = {name: [] for name in cases}
+    for r in range(rounds):
+        print(f"[BENCH] round {r + 1}/{rounds}...")
+        for name, func in cases.items():
+            samples[name].append(_quiet_call(func, numbers[name])[1])
+
+    results = {}
+    for name, func in cases.items():
+        # Separate run for memory: tracing slows execution down. Collect
+        # first, so garbage of earlier cases does not count.
+        gc.collect()
+        tracemalloc.start()
+        _quiet_call(func)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = min(samples[name])
+        results[name] = {
+            "wall_s": best,
+            "throughput": work[name] / best if best > 0 else 0.0,
+            "peak_mem_mb": peak / 2**20,
+            "number": numbers[name],
+            "spread": statistics.median(samples[name]) / best - 1 if best > 0 else 0.0,
+        }
+    return results
+
+
+def bench_simulation(runtimes):
+    """run_fixed / run_adaptive; throughput = model events per second."""
+    from src.scenario import load_scenario
+    from src.event_engine import HeapEnvironment
+    from src.intersection import Intersection
+    from src.simulation_core import run_fixed, run_adaptive
+
+    scenario = load_scenario()
+    policy = scenario.policies[0]
+    duration = scenario.durations[0]
+    seed = scenario.base["seed"]
+
+    cases = {}
+    for controller, run in (("fixed", run_fixed), ("adaptive", run_adaptive)):
+        for runtime in runtimes:
+            # Count model events once with the heap engine
+            env = HeapEnvironment()
+            Intersection(env, policy, duration, seed, controller)
+            env.run(runtime)
+
+            def work(run=run, runtime=runtime, events=env.events):
+                run(policy, duration, runtime, seed)
+                return events
+
+            cases[f"run_{controller}[{runtime}]"] = work
+
+    return cases
+
+
+def bench_inverse_cdf(n_calls):
+    """Scalar get_inverse_cdf calls per second for each distribution."""
+    import numpy as np
+    from src.distributions_dynamic import DISTRIBUTION_MAP, get_inverse_cdf
+
+    u = np.random.default_rng(0).random(n_calls).tolist()
+
+    cases = {}
+    seen = set()
+    for name, dist in DISTRIBUTION_MAP.items():
+        if dist.name in seen:
+            continue
+        seen.add(dist.name)
+
+        def work(name=name, params=PPF_PARAMS[dist.name]):
+            for p in u:
+                get_inverse_cdf(name, params, p)
+            return n_calls
+
+        cases[f"inverse_cdf[{dist.name}]"] = work
+
+    return cases
+
+
+def bench_fitting(sizes):
+    """auto_fit_distribution on synthetic gamma data; samples per second."""
+    import numpy as np
+    from src.fitting.fit_distributions import auto_fit_distribution
+
+    cases = {}
+    for n in sizes:
+        def work(n=n, data=np.random.default_rng(n).gamma(2.5, 1.2, size=n)):
+            auto_fit_distribution(data)
+            return n
+
+        cases[f"auto_fit[{n}]"] = work
+
+    return cases
+
+
+def bench_experiment():
+    """Full fixed + adaptive experiment; throughput = runs per second."""
+    from src.scenario import load_scenario
+    from src.experiment import run_all_fixed_experiments
+    from src.adaptive_experiment import run_adaptive_experiment
+
+    scenario = load_scenario()
+    base = scenario.base
+    n_sets = len(scenario.durations)
+    n_runs = n_sets * base["fixed_rep"] + base["adaptive_rep"]
+
+    def work():
+        run_all_fixed_experiments()
+        run_adaptive_experiment()
+        return n_runs
+
+    return {"experiment": work}
+
+
+def bench_machine():
+    """
+    Fixed reference workload (heap operations and a NumPy sort) that
+    times the machine itself; compare() scales throughputs by it.
+    """
+    import heapq
+    import numpy as np
+
+    values = np.random.default_rng(0).random(20000)
+
+    def work():
+        heap = []
+        for i, v in enumerate(values.tolist()):
+            heapq.heappush(heap, (v, i))
+        while heap:
+            heapq.heappop(heap)
+        np.sort(values)
+        return len(values)
+
+    return {REFERENCE_CASE: work}
+
+
+def run_suite(quick=False, rounds=DEFAULT_ROUNDS):
+    """Run every benchmark and return {name: metrics}."""
+    runtimes = [600, 1800] if quick else [600, 1800, 7200]
+    n_calls = 500 if quick else 2000
+    sizes = [500, 2000] if quick else [1000, 10000, 50000]
+
+    cases = {}
+    for label, bench in [
+        ("simulation", lambda: bench_simulation(runtimes)),
+        ("inverse_cdf", lambda: bench_inverse_cdf(n_calls)),
+        ("fitting", lambda: bench_fitting(sizes)),
+        ("experiment", bench_experiment),
+        ("machine reference", bench_machine),
+    ]:
+        print(f"[BENCH] {label}...")
+        cases.update(bench())
+
+    return measure_all(cases, rounds)
+
+
+def machine_speed(results, baseline):
+    """
+    Speed of this machine relative to the baseline run: the ratio of
+    the reference workload's wall times (1.0 if either lacks it).
+    """
+    old = baseline.get(REFERENCE_CASE, {}).get("wall_s")
+    new = results.get(REFERENCE_CASE, {}).get("wall_s")
+    return old / new if old and new else 1.0
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Throughputs are compared after scaling the baseline by
+    machine_speed(), so a machine that is uniformly slower or faster
+    than when the baseline was recorded (other load, frequency
+    scaling, different hardware) does not count as a regression.
+
+    Returns:
+        list: regressions as (name, metric, baseline value, new value, change),
+            with the baseline value scaled
+    """
+    speed = machine_speed(results, baseline)
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline or name == REFERENCE_CASE:
+            continue
+        for metric, higher_is_better in METRIC_HIGHER_IS_BETTER.items():
+            old = baseline[name].get(metric)
+            new = metrics.get(metric)
+            if not old or new is None:
+                continue
+            if metric == "throughput":
+                old *= speed
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append((name, metric, old, new, change))
+
+    return regressions
+
+
+def print_table(results, baseline):
+    """Print results, with relative change against the baseline."""
+    print(f"\n{'benchmark':<28} {'wall_s':>10} {'throughput':>14} {'peak_mb':>9} "
+          f"{'spread':>7} {'Δwall':>8}")
+    for name, m in results.items():
+        delta = ""
+        if name in baseline and baseline[name].get("wall_s"):
+            delta = f"{(m['wall_s'] / baseline[name]['wall_s'] - 1) * 100:+.0f}%"
+        print(f"{name:<28} {m['wall_s']:>10.4f} {m['throughput']:>14,.0f} "
+              f"{m['peak_mem_mb']:>9.2f} {m['spread']:>7.1%} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulator benchmark suite")
+    parser.add_argument("--config-dir", default=DEFAULT_SCENARIO,
+                        help="Scenario config directory (default: benchmarks/scenario)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative regression per metric (default 0.25)")
+    parser.add_argument("--quick", action="store_true", help="Smaller problem sizes")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help=f"Timed samples per benchmark (default {DEFAULT_ROUNDS})")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    # Must be set before any src module reads its configuration
+    os.environ["ASC_CONFIG_DIR"] = os.path.abspath(args.config_dir)
+    # Always simulate: cached results would hide the real cost
+    os.environ["ASC_NO_CACHE"] = "1"
+
+    results = run_suite(args.quick, args.rounds)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "rounds": args.rounds,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] Baseline updated → {args.baseline}")
+        print_table(results, {})
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+    else:
+        print(f"[BENCH] No baseline at {args.baseline}; nothing to compare.")
+
+    print_table(results, baseline)
+    if baseline:
+        print(f"\n[BENCH] Machine speed vs baseline: ×{machine_speed(results, baseline):.2f} "
+              f"({REFERENCE_CASE}); throughputs are compared at that speed.")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n[BENCH] {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for name, metric, old, new, change in regressions:
+            print(f"  {name} {metric}: {old:.4g} → {new:.4g} ({change:+.0%})")
+        return 1
+
+    print("\n[BENCH] No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
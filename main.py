@@ -5,16 +5,26 @@ Supports:
 - Fixed scheduling (--fixed)
 - Adaptive scheduling (--adaptive)
 - Full experiment mode (--experiment)
-- Distribution fitting from datasets (--fit)
+- Distribution fitting from datasets (--fit [--detector-log CSV])
+- Tabulated PPF error report (--ppf-report)
+- Parallel replications (--workers N)
+- Analytical pre-screening of duration sets (--screen)
+- Event engine selection (--backend simpy|heap)
+- Sequential stopping / racing of duration sets (--sequential)
+- Green-split optimization at a fixed cycle (--optimize [--cycle C])
+- Linked-intersection corridors from network.json (--network [--partitions P])
+- Replications forked from a warm-up snapshot (--warm-start with --fixed/--adaptive)
+- Persistent result cache, bypassed with --no-cache
+- Hot-path profiling of a single run (--profile [--profile-out FILE])
+- Per-event trace of a single run (--record DIR)
+
+Only argparse is imported at module level: each mode imports what it
+uses after the arguments are parsed, so --help is instant, a --fixed run
+never loads matplotlib or pandas, and worker processes that re-import
+this module (spawn start method) stay light.
 """
 
 import argparse
-from src.config_loader import load_json
-from src.config_validator import validate_all
-from src.simulation_core import run_fixed, run_adaptive
-from src.experiment import run_all_fixed_experiments
-from src.adaptive_experiment import run_adaptive_experiment
-from src.plotter import plot_results
 
 
 def main():
@@ -23,15 +33,49 @@ def main():
     parser.add_argument("--adaptive", action="store_true", help="Run adaptive scheduling simulation")
     parser.add_argument("--experiment", action="store_true", help="Run all experiments (fixed+adaptive+plots)")
     parser.add_argument("--fit", action="store_true", help="Fit distributions from raw data")
+    parser.add_argument("--detector-log", default=None, metavar="CSV",
+                        help="With --fit: also fit the lanes of a raw detector log")
+    parser.add_argument("--ppf-report", action="store_true",
+                        help="Report worst-case tabulated PPF error per distribution")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for experiment replications (0 = all cores)")
+    parser.add_argument("--screen", action="store_true",
+                        help="Screen duration sets analytically and simulate only the best")
+    parser.add_argument("--backend", choices=["simpy", "heap"], default=None,
+                        help="Event engine (default: base_settings.json 'backend')")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Replicate each duration set until its CI target is met, racing sets")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Search the green split of one policy at a fixed cycle length")
+    parser.add_argument("--cycle", type=int, default=None,
+                        help="With --optimize: cycle length in seconds (default: base_settings.json)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="With --fixed/--adaptive: simulate the warm-up once and fork replications")
+    parser.add_argument("--network", action="store_true",
+                        help="Simulate the linked intersections of network.json")
+    parser.add_argument("--partitions", type=int, default=None,
+                        help="With --network: partitions run in parallel (default: workers)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Simulate every run instead of using the result cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a hot-path breakdown of the --fixed/--adaptive run")
+    parser.add_argument("--profile-out", default=None,
+                        help="With --profile: also dump cProfile stats (pstats format) here")
+    parser.add_argument("--record", default=None, metavar="DIR",
+                        help="With --fixed/--adaptive: stream a per-event trace to DIR")
     args = parser.parse_args()
 
-    # Load configuration sets
-    base        = load_json("base_settings.json")
-    durations   = load_json("durations.json")["duration_sets"]
-    policies    = load_json("policies.json")["policy_sets"]
-    dists       = load_json("distributions.json")
-    init        = load_json("init_conditions.json")
-    capacity    = load_json("capacity.json")
+    from src.scenario import load_scenario
+    from src.config_validator import validate_all
+
+    # Load and compile the scenario once; every mode below reuses it
+    scenario    = load_scenario()
+    base        = scenario.base
+    durations   = scenario.durations
+    policies    = scenario.policies
+    dists       = scenario.raw["dists"]
+    init        = scenario.raw["init"]
+    capacity    = scenario.raw["caps"]
 
     # Combine everything into one dictionary for validation
     configs = {
@@ -49,31 +93,150 @@ def main():
     # Run distribution fitting
     if args.fit:
         from src.fitting.fit_all_distributions import fit_all
-        fit_all()
+        from src.parallel import resolve_workers
+        fitting = base.get("fitting", {})
+        workers = resolve_workers(
+            args.workers if args.workers is not None else fitting.get("workers", 1)
+        )
+        fit_all(workers=workers, timeout=fitting.get("model_timeout"),
+                detector_log=args.detector_log,
+                **{k: fitting[k] for k in ("method", "subsample_size", "keep", "refine_iter",
+                                           "chunk_size", "cache", "n_boot")
+                   if k in fitting})
         return
 
+    # Report tabulated PPF accuracy against the exact PPF
+    if args.ppf_report:
+        from src.distributions_dynamic import (
+            compile_registry, tabulation_error_report, print_tabulation_report
+        )
+        registry = compile_registry(dists, mode="tabulated",
+                                    max_error=base.get("ppf_max_error", 1e-3))
+        print_tabulation_report(tabulation_error_report(registry))
+        return
+
+    from src.distributions_dynamic import DEFAULT_BLOCK_SIZE
+    from src.parallel import resolve_workers
+    from src.result_cache import get_cache, disable_cache, print_cache_stats
+
+    if args.no_cache:
+        disable_cache()
+    cache = get_cache(scenario)
+    cache_before = cache.stats() if cache is not None else None
+
+    backend = args.backend or base.get("backend", "simpy")
+    block_size = base.get("variate_block_size", DEFAULT_BLOCK_SIZE)
+
+    profile = None
+    if args.profile:
+        from src.profiling import RunProfile, profile_call, print_profile
+        profile = RunProfile()
+
     # Run simulations
-    if args.fixed:
-        print("Running FIXED simulation...")
-        result = run_fixed(policies[0], durations[0], base["runtime"], base["seed"])
-        print("Fixed result:", result)
+    if (args.fixed or args.adaptive) and args.warm_start:
+        from src.warmup import run_warm_replications
+        mode = "FIXED" if args.fixed else "ADAPTIVE"
+        workers = resolve_workers(
+            args.workers if args.workers is not None else base.get("workers", 1)
+        )
+        n_rep = base["fixed_rep"] if args.fixed else base["adaptive_rep"]
+        print(f"Running {mode} simulation from a warm-up snapshot ({n_rep} forks)...")
+
+        result = run_warm_replications(
+            policies[0], durations[0], base["runtime"], base["seed"], n_rep,
+            controller=mode.lower(), workers=workers, block_size=block_size,
+            backend=backend, scenario=scenario
+        )
+        print(f"{mode.capitalize()} steady-state result:", result)
+
+    elif args.fixed or args.adaptive:
+        from src.simulation_core import run_fixed, run_adaptive
+        mode = "FIXED" if args.fixed else "ADAPTIVE"
+        run = run_fixed if args.fixed else run_adaptive
+        print(f"Running {mode} simulation...")
 
-    elif args.adaptive:
-        print("Running ADAPTIVE simulation...")
-        result = run_adaptive(policies[0], durations[0], base["runtime"], base["seed"])
-        print("Adaptive result:", result)
+        recorder = None
+        if args.record:
+            from src.recorder import EventRecorder, DEFAULT_CHUNK_SIZE
+            recorder = EventRecorder(
+                args.record, base.get("recorder", {}).get("chunk_size", DEFAULT_CHUNK_SIZE)
+            )
+
+        run_args = (policies[0], durations[0], base["runtime"], base["seed"], block_size)
+        if profile is None:
+            result, summary = run(*run_args, backend=backend, scenario=scenario,
+                                  recorder=recorder, summary=True)
+        else:
+            (result, summary), _ = profile_call(run, *run_args, stats_path=args.profile_out,
+                                                backend=backend, profile=profile,
+                                                scenario=scenario, recorder=recorder,
+                                                summary=True)
+        if recorder is not None:
+            recorder.close()
+        print(f"{mode.capitalize()} result:", result)
+
+        from src.delay_stats import print_delay_summary
+        print_delay_summary(summary)
+
+        if profile is not None:
+            print_profile(profile)
+
+    elif args.network:
+        from src.network import load_topology, run_network, print_network_results
+        partitions = args.partitions or resolve_workers(
+            args.workers if args.workers is not None else base.get("workers", 1)
+        )
+        print(f"Running NETWORK simulation with {partitions} partition(s)...")
+        result = run_network(load_topology(scenario.config_dir), base["runtime"], base["seed"],
+                             partitions, block_size, backend, scenario)
+        print_network_results(result)
+
+    elif args.optimize:
+        from src.optimizer import optimize_green_split
+        workers = resolve_workers(
+            args.workers if args.workers is not None else base.get("workers", 1)
+        )
+        result = optimize_green_split(workers, cycle=args.cycle, backend=backend,
+                                      scenario=scenario)
+        print("Optimized split:", result)
 
     elif args.experiment:
-        print("Running FULL experiment...")
-        fixed_results = run_all_fixed_experiments()
-        adaptive_results = run_adaptive_experiment()
+        from src.experiment import run_all_fixed_experiments, run_sequential_fixed_experiments
+        from src.adaptive_experiment import run_adaptive_experiment
+        workers = resolve_workers(
+            args.workers if args.workers is not None else base.get("workers", 1)
+        )
+        print(f"Running FULL experiment with {workers} worker(s)...")
+
+        set_indices = None
+        if args.screen:
+            from src.screening import screen_duration_sets, screening_correlation
+            ranking, set_indices = screen_duration_sets(
+                scenario, **base.get("screening", {})
+            )
+
+        if args.sequential:
+            fixed_results = run_sequential_fixed_experiments(
+                workers, set_indices, backend, scenario
+            )
+        else:
+            fixed_results = run_all_fixed_experiments(workers, set_indices, backend, scenario)
+        adaptive_results = run_adaptive_experiment(workers, backend, scenario)
+
+        if args.screen:
+            screening_correlation(ranking, fixed_results)
+
         print("Fixed experiment results:", fixed_results)
         print("Adaptive experiment results:", adaptive_results)
 
         if base.get("save_plots", True):
-            plot_results(fixed_results, adaptive_results)
+            from src.plotter import plot_results
+            plot_results(fixed_results, adaptive_results, scenario)
             print("Plots saved under results/plots/")
 
+    if cache is not None:
+        print_cache_stats(cache_before, cache.stats())
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,52 +4,84 @@ adaptive_experiment.py
 Runs adaptive scheduling experiment:
 - Repeats adaptive control simulation N times
 - Computes mean delay and std deviation
+- Reports delay percentiles and maximum queue (delay_stats.py)
 - Returns results for comparison with fixed experiments
+- Optionally fans runs out over a process pool
+- Optionally batches runs into one SimPy environment
 """
 
 import numpy as np
-from .simulation_core import run_adaptive
-from .config_loader import load_json
+from .simulation_core import run_batch
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .scenario import load_scenario
+from .parallel import run_tasks
+from .delay_stats import summarize_runs
 
 
-def run_adaptive_experiment():
+def run_adaptive_experiment(workers=1, backend=None, scenario=None):
     """
     Run repeated adaptive scheduling experiments.
 
+    Args:
+        workers (int): worker processes for the replications
+            (1 = serial). Results do not depend on this value.
+        backend (str | None): "simpy" or "heap"; None = base_settings.json
+        scenario (Scenario | None): configuration to simulate
+            (None = load_scenario() of the default config directory)
+
     Returns:
         dict {
             "mean_delay": float,
             "std_delay": float,
-            "samples": [...]
+            "samples": [...],
+            "p50_delay", "p95_delay", "p99_delay": float
+                (mean over runs of each run's percentile),
+            "max_queue": int (largest lane queue of any run)
         }
     """
-    base = load_json("base_settings.json")
-    durations = load_json("durations.json")["duration_sets"]
-    policies  = load_json("policies.json")["policy_sets"]
+    scenario = scenario if scenario is not None else load_scenario()
+    base = scenario.base
 
     adaptive_rep = base["adaptive_rep"]
     runtime = base["runtime"]
     seed = base["seed"]
+    batch_size = max(1, base.get("batch_size", 1))
+    block_size = base.get("variate_block_size", DEFAULT_BLOCK_SIZE)
+    backend = backend or base.get("backend", "simpy")
 
     # Use first policy/duration as base
-    policy = policies[0]
-    duration_set = durations[0]
-
-    samples = []
+    policy = scenario.policies[0]
+    duration_set = scenario.durations[0]
 
     print(f"[ADAPTIVE-EXPERIMENT] Running {adaptive_rep} trials...")
 
-    for r in range(adaptive_rep):
-        s = seed + 999 + r
-        avg_delay = run_adaptive(policy, duration_set, runtime, s)
-        samples.append(avg_delay)
-        print(f"  Run {r+1}/{adaptive_rep} → delay={avg_delay:.4f}")
+    # One task = up to `batch_size` runs sharing an environment
+    tasks = []
+    for r0 in range(0, adaptive_rep, batch_size):
+        specs = [
+            {"policy": policy, "duration": duration_set,
+             "seed": seed + 999 + r, "controller": "adaptive"}
+            for r in range(r0, min(r0 + batch_size, adaptive_rep))
+        ]
+        tasks.append((r0, run_batch,
+                      (specs, runtime, block_size, backend, scenario, True)))
+
+    def report(r0, batch_results):
+        for k, (avg_delay, _) in enumerate(batch_results):
+            print(f"  Run {r0+k+1}/{adaptive_rep} → delay={avg_delay:.4f}")
+
+    runs = [out for batch in run_tasks(tasks, workers, on_result=report) for out in batch]
+    samples = [delay for delay, _ in runs]
 
     results = {
         "mean_delay": float(np.mean(samples)),
         "std_delay": float(np.std(samples)),
         "samples": samples
     }
+    results.update(summarize_runs([stats for _, stats in runs]))
+    print(f"[ADAPTIVE-EXPERIMENT] p50={results['p50_delay']:.2f} "
+          f"p95={results['p95_delay']:.2f} p99={results['p99_delay']:.2f} "
+          f"max queue={results['max_queue']}")
 
     print("[ADAPTIVE-EXPERIMENT] Completed.")
     return results
@@ -8,62 +8,150 @@ After every full cycle:
 - Increase duration of the highest-pressure phase
 - Decrease duration of the lowest-pressure phase
 - Total cycle length stays constant
+
+Pressure is maintained incrementally as delays are recorded, so the
+cost of an update does not grow with simulated time. Modes:
+- "cumulative": mean of all delays so far (running sums)
+- "window":     mean of the last `window` delays
+- "ewma":       exponentially weighted mean with weight `alpha`
 """
 
-import numpy as np
+from collections import deque
+from time import perf_counter
 from .light_control import LightControl
 
 
+class CumulativePressure:
+    """Mean of every delay recorded so far."""
+
+    __slots__ = ("total", "count")
+
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, delay):
+        self.total += delay
+        self.count += 1
+
+    def value(self):
+        return self.total / self.count if self.count else 0
+
+
+class WindowPressure:
+    """Mean of the most recent `window` delays."""
+
+    __slots__ = ("delays", "total")
+
+    def __init__(self, window):
+        self.delays = deque(maxlen=window)
+        self.total = 0.0
+
+    def add(self, delay):
+        if len(self.delays) == self.delays.maxlen:
+            self.total -= self.delays[0]
+        self.delays.append(delay)
+        self.total += delay
+
+    def value(self):
+        return self.total / len(self.delays) if self.delays else 0
+
+
+class EwmaPressure:
+    """Exponentially weighted moving average of delays."""
+
+    __slots__ = ("alpha", "mean", "seen")
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.seen = False
+
+    def add(self, delay):
+        if self.seen:
+            self.mean += self.alpha * (delay - self.mean)
+        else:
+            self.mean = delay
+            self.seen = True
+
+    def value(self):
+        return self.mean
+
+
+def make_pressure_tracker(mode="cumulative", window=100, alpha=0.05):
+    """Create a per-lane pressure tracker for the given mode."""
+    if mode == "cumulative":
+        return CumulativePressure()
+    if mode == "window":
+        return WindowPressure(window)
+    if mode == "ewma":
+        return EwmaPressure(alpha)
+    raise ValueError(
+        f"Unknown pressure mode '{mode}'. Use 'cumulative', 'window' or 'ewma'."
+    )
+
+
 class AdaptiveLightControl(LightControl):
 
-    def __init__(self, env, policy, duration, dep_cycle, lane_list, log_enabled=True):
+    def __init__(self, env, policy, duration, dep_cycle, dep_queue, dep_vanish,
+                 lane_list, log_enabled=True, pressure_mode="cumulative",
+                 pressure_window=100, pressure_alpha=0.05, duration_log_max=1000):
         """
         Extends LightControl with adaptive updates.
+
+        Args (in addition to LightControl):
+            lane_list (list): 4x3 grid of Lane objects
+            log_enabled (bool): keep a log of durations after each update
+            pressure_mode (str): "cumulative", "window" or "ewma"
+            pressure_window (int): window mode — delays per lane kept
+            pressure_alpha (float): ewma mode — weight of the newest delay
+            duration_log_max (int): log size limit; when exceeded the log
+                is thinned to every other entry and the logging stride doubles
         """
-        super().__init__(env, policy, duration, dep_cycle)
+        super().__init__(env, policy, duration, dep_cycle, dep_queue, dep_vanish)
         self.lane_list = lane_list
         self.log_enabled = log_enabled
+
         self.duration_log = []
+        self.duration_log_max = duration_log_max
+        self.duration_log_stride = 1
+        self._cycles = 0
 
-    def run_main_lights(self):
-        """Override fixed-light cycle to insert duration update after each full cycle."""
-        while True:
-            for phase_index, phase in enumerate(self.policy):
-                # Green
-                for lane, d in phase:
-                    self._broadcast(self.green_list[lane - 1][d - 1])
-                yield self.env.timeout(self.duration[phase_index])
+        # Attach one pressure tracker per lane; lanes feed it every delay
+        self.pressure = []
+        for i in range(4):
+            for j in range(3):
+                tracker = make_pressure_tracker(pressure_mode, pressure_window, pressure_alpha)
+                lane_list[i][j].pressure = tracker
+                self.pressure.append(tracker)
 
-                # Red
-                for lane, d in phase:
-                    self._broadcast(self.red_list[lane - 1][d - 1])
+        # Flattened lane index (i*3 + j) → first phase serving that lane
+        self.lane_phase = [None] * 12
+        for pi, phase in enumerate(policy):
+            for lane, d in phase:
+                idx = (lane - 1) * 3 + (d - 1)
+                if self.lane_phase[idx] is None:
+                    self.lane_phase[idx] = pi
 
-            # After completing full cycle → update durations
+    def end_of_cycle(self):
+        """After completing a full cycle → update durations."""
+        if self.profile is not None:
+            start = perf_counter()
+            self.update_duration()
+            self.profile.record("controller_updates", 1, perf_counter() - start)
+        else:
             self.update_duration()
 
     def update_duration(self):
         """Adjust durations based on lane delay pressure."""
-        pressure = []
-        for i in range(4):
-            for j in range(3):
-                delays = self.lane_list[i][j].delay_list
-                pressure.append(np.mean(delays) if delays else 0)
+        pressure = [tracker.value() for tracker in self.pressure]
 
-        # Identify phase with highest and lowest pressure
-        max_i = np.argmax(pressure)
-        min_i = np.argmin(pressure)
+        # Identify lanes with highest and lowest pressure (first on ties)
+        max_i = max(range(12), key=pressure.__getitem__)
+        min_i = min(range(12), key=pressure.__getitem__)
 
-        # Convert flattened index to lane/direction
-        def find_phase(idx):
-            L = idx // 3 + 1
-            D = idx % 3 + 1
-            for pi, phase in enumerate(self.policy):
-                if (L, D) in phase:
-                    return pi
-            return None
-
-        high_phase = find_phase(max_i)
-        low_phase  = find_phase(min_i)
+        high_phase = self.lane_phase[max_i]
+        low_phase  = self.lane_phase[min_i]
 
         if high_phase is None or low_phase is None:
             return
@@ -75,4 +163,15 @@ class AdaptiveLightControl(LightControl):
 
         # Log duration adjustment
         if self.log_enabled:
+            self._log_duration()
+
+    def _log_duration(self):
+        """Append to the duration log, thinning it when it grows too long."""
+        if self._cycles % self.duration_log_stride == 0:
             self.duration_log.append(self.duration.copy())
+
+            if len(self.duration_log) > self.duration_log_max:
+                del self.duration_log[1::2]
+                self.duration_log_stride *= 2
+
+        self._cycles += 1
@@ -7,6 +7,9 @@ All configuration files are stored under:
 
     src/config/
 
+unless the ASC_CONFIG_DIR environment variable points elsewhere
+(e.g. the benchmark scenario in benchmarks/scenario/).
+
 This loader provides a single function `load_json()` that:
 - Builds the correct absolute path internally
 - Opens the JSON file safely
@@ -17,7 +20,9 @@ import json
 import os
 
 # Determine the absolute path to the config directory
-CONFIG_DIR = os.path.join(os.path.dirname(__file__), "config")
+CONFIG_DIR = os.environ.get(
+    "ASC_CONFIG_DIR", os.path.join(os.path.dirname(__file__), "config")
+)
 
 
 def load_json(filename):
@@ -0,0 +1,142 @@
+"""
+delay_stats.py
+------------------------
+Constant-memory delay statistics of a lane.
+
+A DelayStats keeps, instead of every vehicle's delay:
+- count, running mean and variance (Welford)
+- maximum delay and maximum queue length
+- a fixed-size histogram with logarithmic buckets: one bucket for
+  delays below BUCKET_MIN, then buckets growing by BUCKET_GROWTH up to
+  BUCKET_MAX (larger delays go to the last bucket)
+
+Quantiles are read from the histogram, so p50/p95/p99 carry at most
+about (BUCKET_GROWTH - 1) / 2 relative error, and memory does not grow
+with the runtime. Stats of several lanes merge exactly.
+"""
+
+import math
+
+BUCKET_MIN = 0.1
+BUCKET_MAX = 1e6
+BUCKET_GROWTH = 1.02
+N_BUCKETS = 2 + int(math.log(BUCKET_MAX / BUCKET_MIN) / math.log(BUCKET_GROWTH))
+
+_INV_LOG_GROWTH = 1 / math.log(BUCKET_GROWTH)
+
+QUANTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+
+class DelayStats:
+    """Running mean/variance, maxima and log-bucketed delay histogram."""
+
+    __slots__ = ("count", "mean", "m2", "max_delay", "max_queue", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max_delay = 0.0
+        self.max_queue = 0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, delay):
+        """Record one vehicle's delay."""
+        self.count += 1
+        diff = delay - self.mean
+        self.mean += diff / self.count
+        self.m2 += diff * (delay - self.mean)
+        if delay > self.max_delay:
+            self.max_delay = delay
+
+        if delay < BUCKET_MIN:
+            self.buckets[0] += 1
+        else:
+            k = 1 + int(math.log(delay / BUCKET_MIN) * _INV_LOG_GROWTH)
+            self.buckets[k if k < N_BUCKETS else N_BUCKETS - 1] += 1
+
+    def merge(self, other):
+        """Accumulate another DelayStats into this one."""
+        if not other.count:
+            self.max_queue = max(self.max_queue, other.max_queue)
+            return
+
+        count = self.count + other.count
+        diff = other.mean - self.mean
+        self.mean += diff * other.count / count
+        self.m2 += other.m2 + diff * diff * self.count * other.count / count
+        self.count = count
+        self.max_delay = max(self.max_delay, other.max_delay)
+        self.max_queue = max(self.max_queue, other.max_queue)
+        for k, n in enumerate(other.buckets):
+            self.buckets[k] += n
+
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile of the recorded delays.
+
+        Returns the geometric midpoint of the bucket holding it (0 for
+        the bucket below BUCKET_MIN), capped at the maximum delay.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                if k == 0:
+                    return 0.0
+                mid = BUCKET_MIN * BUCKET_GROWTH ** (k - 0.5)
+                return min(mid, self.max_delay)
+        return self.max_delay
+
+    def summary(self):
+        """
+        Returns:
+            dict: {"count", "mean", "std", "p50", "p95", "p99",
+                   "max_delay", "max_queue"}
+        """
+        result = {"count": self.count, "mean": self.mean, "std": self.std()}
+        for name, q in QUANTILES.items():
+            result[name] = self.quantile(q)
+        result["max_delay"] = self.max_delay
+        result["max_queue"] = self.max_queue
+        return result
+
+
+def summarize_runs(summaries):
+    """
+    Combine the intersection summaries of several replications.
+
+    Percentiles are averaged over the replications; the maximum queue is
+    the largest of any replication.
+
+    Args:
+        summaries (list): Intersection.delay_summary() of each run
+
+    Returns:
+        dict: {"p50_delay", "p95_delay", "p99_delay", "max_queue"}
+    """
+    totals = [s["intersection"] for s in summaries]
+    result = {
+        f"{name}_delay": sum(t[name] for t in totals) / len(totals)
+        for name in QUANTILES
+    }
+    result["max_queue"] = max(t["max_queue"] for t in totals)
+    return result
+
+
+def print_delay_summary(summary):
+    """Print a per-lane and intersection table of a delay_summary()."""
+    print(f"{'lane':<16} {'vehicles':>9} {'mean':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'max':>8} {'max queue':>10}")
+    rows = list(summary["lanes"].items()) + [("Intersection", summary["intersection"])]
+    for name, s in rows:
+        print(f"{name:<16} {s['count']:>9} {s['mean']:>8.2f} {s['p50']:>8.2f} "
+              f"{s['p95']:>8.2f} {s['p99']:>8.2f} {s['max_delay']:>8.2f} "
+              f"{s['max_queue']:>10}")
@@ -10,12 +10,21 @@ Supports:
 - Automatic name normalization (lowercase, no spaces)
 - Arbitrary number of parameters (shape, loc, scale,…)
 
+Distributions can also be compiled once into a registry of frozen
+objects keyed by lane (e.g. "(1,2)_arr"), optionally in "tabulated"
+mode where the PPF is replaced by interpolation in a quantile table.
+
 This module is the core of the dynamic distribution system:
 Simulation never needs to know which distribution is used.
 """
 
+import copy
+from functools import lru_cache
+from time import perf_counter
+
 import numpy as np
 import scipy.stats as st
+from .sampling import DEFAULT_STRATA, make_uniform_source
 
 
 # ---------------------------------------------------------
@@ -82,6 +91,30 @@ def _normalize_name(name: str) -> str:
 # Inverse CDF (PPF) wrapper
 # ---------------------------------------------------------
 
+def _lookup(dist_name):
+    """
+    Resolve a configured distribution name to its SciPy distribution.
+
+    Raises:
+        ValueError: if the normalized name is not in DISTRIBUTION_MAP.
+    """
+    name = _normalize_name(dist_name)
+
+    if name not in DISTRIBUTION_MAP:
+        raise ValueError(
+            f"Unsupported distribution '{dist_name}'. "
+            f"Normalized key '{name}' not found in DISTRIBUTION_MAP."
+        )
+
+    return DISTRIBUTION_MAP[name]
+
+
+@lru_cache(maxsize=256)
+def _freeze(dist_name, params):
+    """Return a cached frozen distribution for (name, params-tuple)."""
+    return _lookup(dist_name)(*params)
+
+
 def get_inverse_cdf(dist_name, params, p):
     """
     Compute inverse CDF (PPF) for any configured distribution.
@@ -98,21 +131,287 @@ def get_inverse_cdf(dist_name, params, p):
     Returns:
         float: inverse CDF value
     """
-    name = _normalize_name(dist_name)
-
-    if name not in DISTRIBUTION_MAP:
-        raise ValueError(
-            f"Unsupported distribution '{dist_name}'. "
-            f"Normalized key '{name}' not found in DISTRIBUTION_MAP."
-        )
-
-    dist = DISTRIBUTION_MAP[name]
+    frozen = _freeze(dist_name, tuple(params))
 
     # SciPy distribution objects accept parameters as *args
     try:
-        return float(dist(*params).ppf(p))
+        return float(frozen.ppf(p))
     except Exception as e:
         raise RuntimeError(
             f"Failed computing PPF for '{dist_name}' "
             f"with params={params}, p={p}: {e}"
         )
+
+
+# ---------------------------------------------------------
+# Compiled distribution registry
+# ---------------------------------------------------------
+
+DEFAULT_MAX_ERROR = 1e-3    # seconds
+DEFAULT_TAIL = 1e-6         # probability mass left to the exact PPF
+DEFAULT_MAX_POINTS = 1 << 16
+
+
+class CompiledDistribution:
+    """
+    A distributions.json entry compiled once into a frozen SciPy object.
+
+    `ppf(u)` accepts scalars or arrays and evaluates the exact PPF.
+    """
+
+    mode = "exact"
+
+    def __init__(self, key, dist_name, params):
+        self.key = key
+        self.dist_name = dist_name
+        self.params = list(params)
+        self.frozen = _freeze(dist_name, tuple(self.params))
+
+    def ppf(self, u):
+        try:
+            return self.frozen.ppf(u)
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed computing PPF for '{self.key}' ({self.dist_name}) "
+                f"with params={self.params}: {e}"
+            )
+
+
+class TabulatedDistribution(CompiledDistribution):
+    """
+    Compiled distribution sampled by interpolation in a quantile table.
+
+    Knots are evenly spaced in z = logit(u) over [tail, 1 - tail], which
+    puts more of them in the steep tails of the PPF, and lets a lookup
+    compute its table index directly instead of searching. The grid is
+    doubled until linear interpolation at every interval midpoint is
+    within half of `max_error` of the exact PPF, which leaves headroom
+    for the error between midpoints.
+    Uniforms in the tails fall back to the exact PPF.
+    """
+
+    mode = "tabulated"
+
+    def __init__(self, key, dist_name, params, max_error=DEFAULT_MAX_ERROR,
+                 tail=DEFAULT_TAIL, max_points=DEFAULT_MAX_POINTS):
+        super().__init__(key, dist_name, params)
+        self.max_error = max_error
+        self.tail = tail
+        self._z_lo = float(np.log(tail) - np.log1p(-tail))
+        self.q_table = self._build_table(max_error, max_points)
+        self._inv_step = (len(self.q_table) - 1) / (-2.0 * self._z_lo)
+
+    @property
+    def u_table(self):
+        """Probabilities of the table knots."""
+        z = np.linspace(self._z_lo, -self._z_lo, len(self.q_table))
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def _build_table(self, max_error, max_points):
+        """Double the logit grid until midpoint errors are within bound."""
+        n = 65
+        while True:
+            z = np.linspace(self._z_lo, -self._z_lo, n)
+            q = self.frozen.ppf(1.0 / (1.0 + np.exp(-z)))
+
+            mid_z = 0.5 * (z[:-1] + z[1:])
+            mid_q = self.frozen.ppf(1.0 / (1.0 + np.exp(-mid_z)))
+            if np.max(np.abs(mid_q - 0.5 * (q[:-1] + q[1:]))) <= 0.5 * max_error:
+                break
+
+            n = 2 * n - 1
+            if n > max_points:
+                raise ValueError(
+                    f"Tabulating '{self.key}' ({self.dist_name}) needs more than "
+                    f"{max_points} points for max_error={max_error}. "
+                    f"Increase max_error or tail."
+                )
+
+        # Guard against tiny non-monotone wiggles from the exact PPF
+        return np.maximum.accumulate(q)
+
+    def ppf(self, u):
+        u = np.asarray(u, dtype=float)
+        q = self.q_table
+
+        with np.errstate(divide="ignore"):
+            t = (np.log(u) - np.log1p(-u) - self._z_lo) * self._inv_step
+        t = np.clip(t, 0.0, len(q) - 1.000001)
+        k = t.astype(np.intp)
+        values = q[k] + (q[k + 1] - q[k]) * (t - k)
+
+        tails = (u < self.tail) | (u > 1.0 - self.tail)
+        if tails.any():
+            if values.ndim == 0:
+                return super().ppf(u)
+            values[tails] = super().ppf(u[tails])
+
+        return values
+
+
+def compile_registry(dist_cfg, mode="exact", max_error=DEFAULT_MAX_ERROR,
+                     tail=DEFAULT_TAIL, max_points=DEFAULT_MAX_POINTS):
+    """
+    Compile every distributions.json entry into a frozen distribution.
+
+    Args:
+        dist_cfg (dict): loaded distributions.json
+        mode (str): "exact" (SciPy PPF) or "tabulated" (quantile table)
+        max_error (float): tabulated mode only — interpolation error bound
+        tail (float): tabulated mode only — tail mass left to exact PPF
+        max_points (int): tabulated mode only — table size limit
+
+    Returns:
+        dict: key (e.g. "(1,2)_arr") → CompiledDistribution
+    """
+    if mode not in ("exact", "tabulated"):
+        raise ValueError(f"Unknown PPF mode '{mode}'. Use 'exact' or 'tabulated'.")
+
+    registry = {}
+    for key, entry in dist_cfg.items():
+        if mode == "tabulated":
+            registry[key] = TabulatedDistribution(
+                key, entry["dist"], entry["params"], max_error, tail, max_points
+            )
+        else:
+            registry[key] = CompiledDistribution(key, entry["dist"], entry["params"])
+
+    return registry
+
+
+def tabulation_error_report(registry, n_check=200_000):
+    """
+    Measure worst-case error of each tabulated entry against the exact PPF.
+
+    The check grid is a dense uniform grid over [tail, 1 - tail] plus
+    every table interval midpoint.
+
+    Returns:
+        dict: key → {"dist", "points", "max_error", "worst_u"}
+              (exact entries report 0 error and no table)
+    """
+    report = {}
+
+    for key, entry in registry.items():
+        if not isinstance(entry, TabulatedDistribution):
+            report[key] = {"dist": entry.dist_name, "points": 0,
+                           "max_error": 0.0, "worst_u": None}
+            continue
+
+        u_table = entry.u_table
+        u = np.concatenate([
+            np.linspace(entry.tail, 1.0 - entry.tail, n_check),
+            0.5 * (u_table[:-1] + u_table[1:]),
+        ])
+        err = np.abs(entry.ppf(u) - entry.frozen.ppf(u))
+        worst = int(np.argmax(err))
+
+        report[key] = {
+            "dist": entry.dist_name,
+            "points": len(u_table),
+            "max_error": float(err[worst]),
+            "worst_u": float(u[worst]),
+        }
+
+    return report
+
+
+def print_tabulation_report(report):
+    """Print a tabulation_error_report() result as a table."""
+    print(f"{'entry':<12} {'dist':<12} {'points':>8} {'max_error':>12} {'worst_u':>10}")
+    for key, r in report.items():
+        worst_u = "-" if r["worst_u"] is None else f"{r['worst_u']:.6f}"
+        print(f"{key:<12} {r['dist']:<12} {r['points']:>8} "
+              f"{r['max_error']:>12.3e} {worst_u:>10}")
+
+
+# ---------------------------------------------------------
+# Block-buffered variate stream
+# ---------------------------------------------------------
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# First refill size; blocks then double up to block_size. A multiple of
+# the stratification size, so LHS / Sobol' blocks stay valid.
+INITIAL_BLOCK_SIZE = DEFAULT_STRATA
+
+
+class VariateStream:
+    """
+    Buffered source of variates for one compiled distribution.
+
+    Uniforms are drawn from a private uniform source (see sampling.py)
+    in blocks, pushed through a single vectorized PPF call, and then
+    handed out one value at a time. The buffer refills automatically;
+    the first block has INITIAL_BLOCK_SIZE values and each refill
+    doubles it up to `block_size`, so short runs do not evaluate PPF
+    values they never use.
+
+    For a given seed the sequence of values does not depend on how
+    often the buffer is refilled, so results are reproducible.
+    """
+
+    def __init__(self, dist, seed, block_size=DEFAULT_BLOCK_SIZE,
+                 sampling="mc", antithetic=False):
+        """
+        Args:
+            dist (CompiledDistribution): registry entry to sample from.
+            seed (int | list[int]): seed for numpy.random.default_rng.
+            block_size (int): largest number of variates generated per
+                refill.
+            sampling (str): uniform scheme — "mc", "lhs" or "sobol".
+            antithetic (bool): use 1 - u (second run of an antithetic pair).
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}.")
+
+        self.dist = dist
+        self.block_size = int(block_size)
+
+        self._uniforms = make_uniform_source(sampling, seed, antithetic)
+        self._next_size = min(INITIAL_BLOCK_SIZE, self.block_size)
+        self._buffer = []
+        self._pos = 0
+
+        # Optional RunProfile (see profiling.py)
+        self.profile = None
+
+    def _refill(self):
+        """Draw a new block of uniforms and evaluate the PPF once."""
+        start = perf_counter() if self.profile is not None else 0.0
+        n = self._next_size
+        self._next_size = min(2 * n, self.block_size)
+        u = self._uniforms.block(n)
+
+        # Plain Python floats are much cheaper to index one by one
+        self._buffer = np.asarray(self.dist.ppf(u)).tolist()
+        self._pos = 0
+
+        if self.profile is not None:
+            self.profile.record("ppf_evaluations", n, perf_counter() - start)
+
+    def next(self):
+        """Return the next variate, refilling the buffer if needed."""
+        if self._pos >= len(self._buffer):
+            self._refill()
+
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def get_state(self):
+        """Copy of the stream position: uniform source and unread buffer."""
+        return copy.deepcopy(self._uniforms), self._buffer[self._pos:]
+
+    def set_state(self, state):
+        """Continue from a get_state() copy (the copy stays reusable)."""
+        uniforms, buffer = state
+        self._uniforms = copy.deepcopy(uniforms)
+        self._buffer = list(buffer)
+        self._pos = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
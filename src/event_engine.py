@@ -0,0 +1,77 @@
+"""
+event_engine.py
+------------------------
+Lightweight heap-based event loop, usable in place of simpy.Environment.
+
+The model only needs a small part of SimPy:
+- env.now
+- env.timeout(delay) yielded from generator processes
+- env.process(generator)
+- env.run(until)
+
+HeapEnvironment provides exactly that. A timeout is just the delay
+itself, and each pending process resumption is one (time, priority,
+seq, generator) tuple on a binary heap — no Event objects or callback
+lists. Ties are broken like SimPy (new processes before timeouts, then
+scheduling order), so a run produces the same results as with SimPy.
+"""
+
+from heapq import heappush, heappop
+
+URGENT = 0      # process start (SimPy's Initialize event)
+NORMAL = 1      # timeout expiry
+
+
+class HeapEnvironment:
+    def __init__(self, initial_time=0.0):
+        self.now = initial_time
+        self.events = 0         # process resumptions executed so far
+        self._heap = []
+        self._seq = 0
+
+    def timeout(self, delay):
+        """Return the delay; the yielding process is rescheduled by run()."""
+        return delay
+
+    def process(self, generator):
+        """Start a generator process at the current time."""
+        self._seq += 1
+        heappush(self._heap, (self.now, URGENT, self._seq, generator))
+        return generator
+
+    def run(self, until):
+        """Execute events with time < until, then set now = until."""
+        heap = self._heap
+        events = 0
+
+        while heap and heap[0][0] < until:
+            t, _, _, generator = heappop(heap)
+            self.now = t
+            events += 1
+
+            try:
+                delay = generator.send(None)
+            except StopIteration:
+                continue
+
+            self._seq += 1
+            heappush(heap, (t + delay, NORMAL, self._seq, generator))
+
+        self.events += events
+        self.now = until
+
+
+def make_environment(backend="simpy", initial_time=0.0):
+    """
+    Create a simulation environment for the given backend.
+
+    Args:
+        backend (str): "simpy" or "heap"
+        initial_time (float): start time (> 0 when resuming a snapshot)
+    """
+    if backend == "simpy":
+        import simpy
+        return simpy.Environment(initial_time)
+    if backend == "heap":
+        return HeapEnvironment(initial_time)
+    raise ValueError(f"Unknown backend '{backend}'. Use 'simpy' or 'heap'.")
@@ -7,56 +7,301 @@ Features:
 - Run multiple duration sets (grid search)
 - Repeat each run N times
 - Compute mean and standard deviation
+- Report delay percentiles and maximum queue (delay_stats.py)
 - Return full result table
+- Optionally fan runs out over a process pool
+- Optionally batch replications into one SimPy environment
+- Optional variance reduction (antithetic pairs, LHS / Sobol' uniforms)
+  with the achieved reduction versus plain Monte Carlo
+- Sequential mode: replicate until a CI target is met, racing sets
 """
 
 import numpy as np
-from .simulation_core import run_fixed
-from .config_loader import load_json
+from scipy.stats import t as t_dist
+from .simulation_core import run_batch
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .scenario import load_scenario
+from .parallel import run_tasks
+from .sampling import variance_reduction_factor
+from .delay_stats import summarize_runs
 
+# Replication r of duration set idx uses seed + idx * SET_SEED_STRIDE + r;
+# plain-MC reference runs use a block after those of every set
+SET_SEED_STRIDE = 100
 
-def run_all_fixed_experiments():
+
+def run_all_fixed_experiments(workers=1, set_indices=None, backend=None, scenario=None):
     """
     Run fixed-duration experiments over all duration sets.
 
+    Args:
+        workers (int): worker processes for the replications
+            (1 = serial). Results do not depend on this value.
+        set_indices (list | None): only simulate these duration sets
+            (e.g. the ones kept by analytical screening); None = all.
+        backend (str | None): "simpy" or "heap"; None = base_settings.json
+        scenario (Scenario | None): configuration to simulate
+            (None = load_scenario() of the default config directory)
+
     Returns:
         results (list):
             [
                 {
+                    "set_index": int,
                     "duration_set": [...],
                     "mean_delay": float,
-                    "std_delay": float
+                    "std_delay": float,
+                    "p50_delay", "p95_delay", "p99_delay": float
+                        (mean over replications of each run's percentile),
+                    "max_queue": int (largest lane queue of any run),
+                    "variance_reduction": float | None  (only with a
+                        variance-reduction scheme; Var_MC / Var_scheme
+                        per run)
                 },
                 ...
             ]
     """
-    durations_all = load_json("durations.json")["duration_sets"]
-    policies = load_json("policies.json")["policy_sets"]
-    base = load_json("base_settings.json")
+    scenario = scenario if scenario is not None else load_scenario()
+    durations_all = scenario.durations
+    base = scenario.base
 
     fixed_rep = base["fixed_rep"]
     runtime = base["runtime"]
     seed = base["seed"]
+    batch_size = max(1, base.get("batch_size", 1))
+    block_size = base.get("variate_block_size", DEFAULT_BLOCK_SIZE)
+    backend = backend or base.get("backend", "simpy")
 
-    results = []
+    if set_indices is None:
+        set_indices = range(len(durations_all))
+    sets = [(idx, durations_all[idx]) for idx in set_indices]
+
+    # Variance reduction of the uniforms driving the lane streams
+    vr = base.get("variance_reduction", {})
+    sampling = vr.get("sampling", "mc")
+    antithetic = vr.get("antithetic", False)
+    reference_rep = vr.get("reference_rep", 0) if (sampling != "mc" or antithetic) else 0
+    n_runs = fixed_rep + reference_rep
+    if max(fixed_rep, reference_rep) > SET_SEED_STRIDE:
+        raise ValueError(
+            f"fixed_rep ({fixed_rep}) and reference_rep ({reference_rep}) must not exceed "
+            f"{SET_SEED_STRIDE}, or replication seeds of different runs would repeat."
+        )
+    reference_seed = seed + len(durations_all) * SET_SEED_STRIDE
+
+    def make_spec(idx, policy, duration_set, r):
+        """Replication r of a set; r >= fixed_rep are plain-MC reference runs."""
+        if r >= fixed_rep:
+            return {"policy": policy, "duration": duration_set, "controller": "fixed",
+                    "seed": reference_seed + idx * SET_SEED_STRIDE + (r - fixed_rep)}
+
+        # Antithetic pairs (0,1), (2,3), ... share a seed; the odd run uses 1 - u
+        pair_antithetic = antithetic and r % 2 == 1
+        base_r = r - r % 2 if antithetic else r
+        return {"policy": policy, "duration": duration_set, "controller": "fixed",
+                "seed": seed + idx * SET_SEED_STRIDE + base_r,
+                "sampling": sampling, "antithetic": pair_antithetic}
 
-    for idx, duration_set in enumerate(durations_all):
+    # One task = up to `batch_size` replications sharing an environment
+    tasks = []
+    for idx, duration_set in sets:
         print(f"[FIXED-EXPERIMENT] Set {idx}: duration={duration_set}")
 
-        policy = policies[idx] if idx < len(policies) else policies[0]
+        policy = scenario.policy_for(idx)
 
-        samples = []
-        for r in range(fixed_rep):
-            s = seed + idx * 100 + r
-            avg_delay = run_fixed(policy, duration_set, runtime, s)
-            samples.append(avg_delay)
-            print(f"  Run {r+1}/{fixed_rep} → delay={avg_delay:.4f}")
+        for r0 in range(0, n_runs, batch_size):
+            specs = [
+                make_spec(idx, policy, duration_set, r)
+                for r in range(r0, min(r0 + batch_size, n_runs))
+            ]
+            tasks.append(((idx, r0), run_batch,
+                          (specs, runtime, block_size, backend, scenario, True)))
+
+    def report(key, batch_results):
+        idx, r0 = key
+        for k, (avg_delay, _) in enumerate(batch_results):
+            r = r0 + k
+            if r < fixed_rep:
+                print(f"  Set {idx} run {r+1}/{fixed_rep} → delay={avg_delay:.4f}")
+            else:
+                print(f"  Set {idx} reference run {r-fixed_rep+1}/{reference_rep} "
+                      f"→ delay={avg_delay:.4f}")
+
+    outputs = [out for batch in run_tasks(tasks, workers, on_result=report) for out in batch]
+
+    results = []
+    for n, (idx, duration_set) in enumerate(sets):
+        runs = outputs[n * n_runs:(n + 1) * n_runs]
+        samples = [delay for delay, _ in runs[:fixed_rep]]
+        reference = [delay for delay, _ in runs[fixed_rep:]] or None
 
-        results.append({
-            "duration_set": duration_set,
+        entry = {
+            "set_index": idx,
+            "duration_set": list(duration_set),
             "mean_delay": float(np.mean(samples)),
             "std_delay": float(np.std(samples))
-        })
+        }
+        entry.update(summarize_runs([stats for _, stats in runs[:fixed_rep]]))
+        print(f"[FIXED-EXPERIMENT] Set {idx}: p50={entry['p50_delay']:.2f} "
+              f"p95={entry['p95_delay']:.2f} p99={entry['p99_delay']:.2f} "
+              f"max queue={entry['max_queue']}")
+
+        if sampling != "mc" or antithetic:
+            factor = variance_reduction_factor(
+                samples, antithetic, reference, runs_are_mc=(sampling == "mc")
+            )
+            entry["variance_reduction"] = factor
+            if factor is not None:
+                print(f"[FIXED-EXPERIMENT] Set {idx}: variance reduction ×{factor:.2f} "
+                      f"vs plain MC ≈ {fixed_rep * factor:.1f} plain replications")
+
+        results.append(entry)
 
     print("\n[FIXED-EXPERIMENT] Completed.")
     return results
+
+
+def ci_half_width(samples, confidence=0.95):
+    """Student-t confidence-interval half-width of the sample mean."""
+    n = len(samples)
+    if n < 2:
+        return float("inf")
+    return float(t_dist.ppf(0.5 + confidence / 2, n - 1) * np.std(samples, ddof=1) / np.sqrt(n))
+
+
+def run_sequential_fixed_experiments(workers=1, set_indices=None, backend=None,
+                                     scenario=None):
+    """
+    Sequential (racing) version of run_all_fixed_experiments.
+
+    Every set first gets `min_rep` replications. Then, round by round,
+    each remaining set gets `step` more until the confidence-interval
+    half-width of its mean delay reaches `target_half_width` or it hits
+    `max_rep`. With racing enabled, a set is dropped as soon as its CI
+    lies entirely above the CI of the current best set.
+
+    Settings come from the "sequential" block of base_settings.json.
+    Arguments are as for run_all_fixed_experiments.
+    Replication r of set idx uses seed + idx*SET_SEED_STRIDE + r, so the
+    first runs equal those of the fixed-rep design.
+
+    Returns:
+        results (list): as run_all_fixed_experiments (without
+            "variance_reduction"), plus per set "runs", "half_width"
+            and "status"
+            ("converged", "max_rep" or "dropped")
+
+    Raises:
+        ValueError: max_rep above SET_SEED_STRIDE or below min_rep
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    durations_all = scenario.durations
+    base = scenario.base
+
+    fixed_rep = base["fixed_rep"]
+    runtime = base["runtime"]
+    seed = base["seed"]
+    block_size = base.get("variate_block_size", DEFAULT_BLOCK_SIZE)
+    backend = backend or base.get("backend", "simpy")
+
+    cfg = base.get("sequential", {})
+    min_rep = max(2, cfg.get("min_rep", 3))
+    max_rep = cfg.get("max_rep", 30)
+    step = max(1, cfg.get("step", 1))
+    target = cfg.get("target_half_width", 0.5)
+    confidence = cfg.get("confidence", 0.95)
+    racing = cfg.get("racing", True)
+    if max_rep > SET_SEED_STRIDE:
+        raise ValueError(
+            f"sequential max_rep ({max_rep}) must not exceed {SET_SEED_STRIDE}, "
+            f"or replication seeds of different sets would repeat."
+        )
+    if max_rep < min_rep:
+        raise ValueError(f"sequential max_rep ({max_rep}) must be at least min_rep ({min_rep}).")
+
+    if set_indices is None:
+        set_indices = range(len(durations_all))
+
+    state = {
+        idx: {"samples": [], "summaries": [], "status": "running",
+              "policy": scenario.policy_for(idx)}
+        for idx in set_indices
+    }
+
+    print(f"[SEQUENTIAL] {len(state)} sets, target half-width={target}, "
+          f"confidence={confidence}, racing={racing}")
+
+    round_no = 0
+    while any(st["status"] == "running" for st in state.values()):
+        round_no += 1
+
+        # Next replications for every running set (one task per set)
+        tasks = []
+        for idx, st in state.items():
+            if st["status"] != "running":
+                continue
+            n = len(st["samples"])
+            count = min(min_rep - n if n < min_rep else step, max_rep - n)
+            specs = [
+                {"policy": st["policy"], "duration": durations_all[idx],
+                 "seed": seed + idx * SET_SEED_STRIDE + r, "controller": "fixed"}
+                for r in range(n, n + count)
+            ]
+            tasks.append((idx, run_batch,
+                          (specs, runtime, block_size, backend, scenario, True)))
+
+        for idx, runs in zip([t[0] for t in tasks], run_tasks(tasks, workers)):
+            state[idx]["samples"].extend(delay for delay, _ in runs)
+            state[idx]["summaries"].extend(stats for _, stats in runs)
+
+        # Update confidence intervals
+        for st in state.values():
+            st["mean"] = float(np.mean(st["samples"]))
+            st["half_width"] = ci_half_width(st["samples"], confidence)
+
+        for idx, st in state.items():
+            if st["status"] != "running":
+                continue
+            if st["half_width"] <= target:
+                st["status"] = "converged"
+            elif len(st["samples"]) >= max_rep:
+                st["status"] = "max_rep"
+
+        # Racing: drop running sets whose CI is entirely above the best set's
+        # CI (sets that already stopped keep their reason)
+        if racing:
+            contenders = {i: st for i, st in state.items() if st["status"] != "dropped"}
+            best = min(contenders, key=lambda i: contenders[i]["mean"])
+            best_upper = contenders[best]["mean"] + contenders[best]["half_width"]
+            for idx, st in contenders.items():
+                if (st["status"] == "running" and idx != best
+                        and st["mean"] - st["half_width"] > best_upper):
+                    st["status"] = "dropped"
+
+        running = sum(st["status"] == "running" for st in state.values())
+        print(f"  Round {round_no}: {running} set(s) still running")
+
+    results = []
+    total_runs = 0
+    for idx, st in state.items():
+        n = len(st["samples"])
+        total_runs += n
+        print(f"  Set {idx}: runs={n} mean={st['mean']:.4f} "
+              f"±{st['half_width']:.4f} [{st['status']}]")
+        entry = {
+            "set_index": idx,
+            "duration_set": list(durations_all[idx]),
+            "mean_delay": st["mean"],
+            "std_delay": float(np.std(st["samples"])),
+        }
+        entry.update(summarize_runs(st["summaries"]))
+        entry.update({"runs": n, "half_width": st["half_width"], "status": st["status"]})
+        results.append(entry)
+
+    fixed_design = len(state) * fixed_rep
+    saved = fixed_design - total_runs
+    comparison = (f"saved {saved}" if saved >= 0
+                  else f"used {-saved} more runs than the fixed design")
+    print(f"\n[SEQUENTIAL] Completed: {total_runs} runs vs {fixed_design} in the "
+          f"fixed-rep design ({comparison}).")
+    return results
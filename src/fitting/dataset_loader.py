@@ -1,7 +1,7 @@
 """
 dataset_loader.py
 ----------------------
-Utility function for loading CSV files containing
+Utility functions for loading CSV files containing
 arrival or departure interval data.
 
 Expected CSV format:
@@ -20,10 +20,21 @@ Or:
     3.01
     ...
 
-This loader does not modify data.
+Other columns may be present (detector exports usually have many);
+load_intervals() parses only the interval column, in chunks, and keeps
+the cleaned values in a `.npy` cache next to the CSV so later runs skip
+CSV parsing entirely. The cache file name holds the CSV size and
+modification time, so an edited or replaced CSV is parsed again.
+
+pandas is imported on first use, so importing the fitting package
+(e.g. for .edf files) does not load it.
 """
 
-import pandas as pd
+import os
+import numpy as np
+
+CACHE_DIR = ".interval_cache"
+DEFAULT_CHUNK_SIZE = 1_000_000
 
 
 def load_dataset(path):
@@ -38,5 +49,99 @@ def load_dataset(path):
             DataFrame containing columns such as
             'arr_time' or 'dep_time'.
     """
+    import pandas as pd
+
     df = pd.read_csv(path)
     return df
+
+
+def cache_path(path, column):
+    """
+    Cache file of one CSV column, keyed by the CSV size and mtime.
+
+    Args:
+        path (str): CSV file
+        column (str): interval column name
+
+    Returns:
+        str: `<csv dir>/.interval_cache/<name>.<column>.<size>_<mtime_ns>.npy`
+    """
+    info = os.stat(path)
+    name = os.path.basename(path)
+    return os.path.join(os.path.dirname(path), CACHE_DIR,
+                        f"{name}.{column}.{info.st_size}_{info.st_mtime_ns}.npy")
+
+
+def read_interval_column(path, column, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse one interval column of a CSV file in chunks.
+
+    Only `column` is parsed. Values that are not numbers, not finite or
+    negative are dropped chunk by chunk.
+
+    Args:
+        path (str): CSV file
+        column (str): "arr_time" or "dep_time"
+        chunk_size (int): rows parsed at a time
+
+    Returns:
+        np.ndarray: float64 intervals, in file order
+
+    Raises:
+        ValueError: the file has no such column
+    """
+    import pandas as pd
+
+    chunks = []
+    try:
+        reader = pd.read_csv(path, usecols=[column], chunksize=chunk_size)
+        for chunk in reader:
+            values = pd.to_numeric(chunk[column], errors="coerce").to_numpy(np.float64)
+            chunks.append(values[np.isfinite(values) & (values >= 0)])
+    except ValueError as e:
+        if "Usecols" in str(e):
+            raise ValueError(f"{path}: no '{column}' column") from e
+        raise
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+def load_intervals(path, column, chunk_size=DEFAULT_CHUNK_SIZE, cache=True):
+    """
+    Cleaned intervals of one CSV column, through the `.npy` cache.
+
+    On a cache hit the array is memory-mapped read-only; on a miss the
+    column is parsed with read_interval_column(), written to the cache
+    (replacing entries of older versions of the file) and returned.
+
+    Args:
+        path (str): CSV file
+        column (str): "arr_time" or "dep_time"
+        chunk_size (int): rows parsed at a time on a cache miss
+        cache (bool): False parses the CSV without reading or writing a cache
+
+    Returns:
+        np.ndarray: float64 intervals (np.memmap on a cache hit)
+    """
+    if not cache:
+        return read_interval_column(path, column, chunk_size)
+
+    target = cache_path(path, column)
+    if os.path.exists(target):
+        return np.load(target, mmap_mode="r")
+
+    values = read_interval_column(path, column, chunk_size)
+
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    prefix = f"{os.path.basename(path)}.{column}."
+    for old in os.listdir(directory):
+        if old.startswith(prefix) and old.endswith(".npy"):
+            os.remove(os.path.join(directory, old))
+
+    # Write then rename, so an interrupted run never leaves a partial cache
+    tmp = target + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, values)
+    os.replace(tmp, target)
+    print(f"[DATA] Cached {len(values)} {column} values of {path}")
+    return values
@@ -0,0 +1,202 @@
+"""
+detector_log.py
+----------------------
+Per-lane arrival and departure intervals from one raw detector log of
+a whole intersection, without pre-cut per-lane files.
+
+Expected CSV format (other columns are ignored):
+
+    timestamp,approach,movement,event
+    0.00,1,2,arrival
+    1.84,1,2,departure
+    2.10,3,1,green
+    ...
+
+- timestamp: seconds (numbers) or date/time strings
+- approach:  1-4 (lane index i)
+- movement:  1-3 or L/S/R (lane index j)
+- event:     "arrival" (car reaches the stop line queue), "departure"
+             (car crosses the stop line), optionally "green" / "red"
+             (lane light changes); other events are ignored
+
+Event names are those of recorder.py (benchmarks/bench_detector_log.py
+turns a recorded trace into such a log).
+
+For every lane (i,j):
+- arrival intervals ("(i,j)_arr") are the headways between
+  consecutive arrivals
+- departure intervals ("(i,j)_dep") are the saturation headways, i.e.
+  the time between two consecutive departures when the second car was
+  already queued at the first departure and the lane did not turn red
+  in between. This is the service interval drawn by Lane.move_cars().
+  Cars are matched to departures first-in first-out.
+
+The log is read once, in chunks, into compact time/lane/event arrays;
+all lanes are then processed together by sorting on a (lane, time) key.
+"""
+
+import os
+import numpy as np
+
+EVENTS = ("arrival", "departure", "green", "red")
+ARRIVAL, DEPARTURE, GREEN, RED = range(len(EVENTS))
+
+MOVEMENTS = {"1": 0, "2": 1, "3": 2, "L": 0, "S": 1, "R": 2}
+
+LOG_COLUMNS = ("timestamp", "approach", "movement", "event")
+DEFAULT_CHUNK_SIZE = 1_000_000
+DEFAULT_MIN_SAMPLES = 50
+
+
+def _parse_times(column):
+    """Timestamps in seconds: numbers as is, date/time strings converted."""
+    import pandas as pd
+
+    times = pd.to_numeric(column, errors="coerce").astype(np.float64)
+    missing = times.isna() & column.notna()
+    if missing.any():
+        stamps = pd.to_datetime(column[missing], errors="coerce", utc=True)
+        times[missing] = (stamps - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+    return times.to_numpy(np.float64)
+
+
+def read_detector_log(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a detector log in one chunked pass.
+
+    Rows with an unknown event, approach or movement, or an unreadable
+    timestamp are dropped.
+
+    Args:
+        path (str): CSV log file
+        chunk_size (int): rows parsed at a time
+
+    Returns:
+        tuple: (time float64, lane int8 = i*3 + j, event int8 in EVENTS)
+
+    Raises:
+        ValueError: a column of LOG_COLUMNS is missing
+    """
+    import pandas as pd
+
+    event_codes = {name: code for code, name in enumerate(EVENTS)}
+    times, lanes, events = [], [], []
+    try:
+        reader = pd.read_csv(path, usecols=list(LOG_COLUMNS), dtype={
+            "approach": str, "movement": str, "event": str
+        }, chunksize=chunk_size)
+        for chunk in reader:
+            event = chunk["event"].str.strip().str.lower().map(event_codes)
+            approach = pd.to_numeric(chunk["approach"], errors="coerce") - 1
+            movement = chunk["movement"].str.strip().str.upper().map(MOVEMENTS)
+            time = _parse_times(chunk["timestamp"])
+
+            keep = ((event.notna() & movement.notna() & approach.isin(range(4))).to_numpy()
+                    & np.isfinite(time))
+            times.append(time[keep])
+            lanes.append((approach.to_numpy()[keep] * 3
+                          + movement.to_numpy()[keep]).astype(np.int8))
+            events.append(event.to_numpy()[keep].astype(np.int8))
+    except ValueError as e:
+        if "Usecols" in str(e):
+            raise ValueError(f"{path}: a detector log needs columns "
+                             f"{', '.join(LOG_COLUMNS)}") from e
+        raise
+
+    if not times:
+        return np.empty(0), np.empty(0, np.int8), np.empty(0, np.int8)
+    return np.concatenate(times), np.concatenate(lanes), np.concatenate(events)
+
+
+def _lane_sorted(time, lane, mask):
+    """
+    Times and lanes of the selected rows sorted by (lane, time), with
+    the lane start offsets (13 entries, lane k spans start[k]:start[k+1]).
+    """
+    t, ln = time[mask], lane[mask]
+    order = np.lexsort((t, ln))
+    t, ln = t[order], ln[order]
+    start = np.searchsorted(ln, np.arange(13))
+    return t, ln, start
+
+
+def lane_intervals(time, lane, event):
+    """
+    Arrival headways and departure saturation headways of every lane.
+
+    Args:
+        time, lane, event: arrays as returned by read_detector_log()
+
+    Returns:
+        dict: "(i,j)_arr" / "(i,j)_dep" → np.ndarray of intervals, for
+            every lane and kind with at least one interval
+    """
+    arr_t, arr_lane, arr_start = _lane_sorted(time, lane, event == ARRIVAL)
+    dep_t, dep_lane, _ = _lane_sorted(time, lane, event == DEPARTURE)
+    red_t, red_lane, _ = _lane_sorted(time, lane, event == RED)
+
+    # Arrival headways: consecutive arrivals of the same lane
+    same = arr_lane[1:] == arr_lane[:-1]
+    arr_gap = np.diff(arr_t)[same]
+    arr_gap_lane = arr_lane[1:][same]
+
+    # FIFO: the k-th departure of a lane is its k-th arrival
+    dep_start = np.searchsorted(dep_lane, np.arange(13))
+    rank = np.arange(len(dep_t)) - dep_start[dep_lane]
+    n_arr = np.diff(arr_start)
+    matched = rank < n_arr[dep_lane]
+    car_arrival = np.full(len(dep_t), np.inf)
+    car_arrival[matched] = arr_t[(arr_start[dep_lane] + rank)[matched]]
+
+    # One key per (lane, time) so red lights of all lanes are searched at once
+    origin = time.min() if len(time) else 0.0
+    span = (time.max() if len(time) else 0.0) - origin + 1
+    dep_key = dep_lane * span + (dep_t - origin)
+    red_key = red_lane * span + (red_t - origin)
+    reds_before = np.searchsorted(red_key, dep_key, side="right")
+
+    # Saturation headways: the next car was queued and no red in between
+    same = dep_lane[1:] == dep_lane[:-1]
+    saturated = (
+        same
+        & (car_arrival[1:] <= dep_t[:-1])
+        & (reds_before[1:] == reds_before[:-1])
+    )
+    dep_gap = np.diff(dep_t)[saturated]
+    dep_gap_lane = dep_lane[1:][saturated]
+
+    intervals = {}
+    for index in range(12):
+        i, j = divmod(index, 3)
+        for kind, gaps, gap_lane in (("arr", arr_gap, arr_gap_lane),
+                                     ("dep", dep_gap, dep_gap_lane)):
+            values = gaps[gap_lane == index]
+            if len(values):
+                intervals[f"({i+1},{j+1})_{kind}"] = values
+    return intervals
+
+
+def load_detector_log(path, chunk_size=DEFAULT_CHUNK_SIZE, min_samples=DEFAULT_MIN_SAMPLES):
+    """
+    Per-lane intervals of a detector log, ready for fitting.
+
+    Args:
+        path (str): CSV log file
+        chunk_size (int): rows parsed at a time
+        min_samples (int): lanes/kinds with fewer intervals are left out
+
+    Returns:
+        dict: "(i,j)_arr" / "(i,j)_dep" → np.ndarray of intervals
+    """
+    time, lane, event = read_detector_log(path, chunk_size)
+    intervals = lane_intervals(time, lane, event)
+
+    name = os.path.basename(path)
+    print(f"[LOG] {name}: {len(time)} events, "
+          + ", ".join(f"{EVENTS[code]}={int(np.sum(event == code))}"
+                      for code in range(len(EVENTS))))
+    for key in sorted(intervals):
+        if len(intervals[key]) < min_samples:
+            print(f"[LOG] {name} {key}: only {len(intervals[key])} intervals, left out")
+            del intervals[key]
+    return intervals
@@ -3,23 +3,38 @@ fit_all_distributions.py
 -------------------------
 Full automated workflow for:
 
-1. Loading raw interval data (CSV)
+1. Loading raw interval data (CSV), or computing it from one raw
+   detector log of the whole intersection (detector_log.py)
 2. OR loading EasyFit `.edf` exported results
-3. Fitting distributions (AIC/BIC-based selection)
+3. Fitting distributions (AIC/BIC-based selection), with (file, model)
+   pairs spread over worker processes and a timeout per model fit,
+   either exhaustively or with the fast pruned two-stage pipeline
 4. Exporting final parameters to `config/distributions.json`
+5. Scoring every fitted model (KS/AD/CvM, optional bootstrap p-values)
+   into `model_comparison.csv` next to it
 """
 
 import os
-import json
+import re
 import glob
-import numpy as np
-from .dataset_loader import load_dataset
+from .dataset_loader import load_intervals, DEFAULT_CHUNK_SIZE
+from .detector_log import load_detector_log
 from .parse_edf import parse_edf
-from .fit_distributions import auto_fit_distribution
+from .fit_distributions import (
+    MODEL_LIST, fit_single_model, select_best, prune_candidates, initial_guess, subsample,
+    refine_start
+)
+from .fit_pool import run_fit_tasks
+from .goodness_of_fit import (
+    score_models, bootstrap_pvalues, write_comparison_table, print_gof_summary
+)
 from .export_to_config import export_distribution_config
 
 
-def fit_all(data_dir="data/", save_path="src/config/distributions.json"):
+def fit_all(data_dir="data/", save_path="src/config/distributions.json", workers=1,
+            timeout=None, models=None, method="exhaustive", subsample_size=5000, keep=3,
+            refine_iter=100, chunk_size=DEFAULT_CHUNK_SIZE, cache=True, detector_log=None,
+            n_boot=0):
     """
     Automatically fit all arrival/departure distributions.
 
@@ -36,21 +51,62 @@ def fit_all(data_dir="data/", save_path="src/config/distributions.json"):
     - CSV files (raw intervals)
     - EDF files (EasyFit export)
 
+    Every (CSV file, model) pair is one fitting task; tasks run over a
+    pool of `workers` processes (fit_pool.py). A model still fitting
+    after `timeout` seconds is dropped for that file. Fit times per model
+    and per file are printed at the end.
+
+    Only the interval column of each CSV is parsed, `chunk_size` rows at
+    a time, and kept in a `.npy` cache next to it (dataset_loader.py), so
+    later runs on unchanged files skip CSV parsing.
+
+    With `detector_log`, the arrival and departure intervals of every
+    lane are computed from that log in memory and fitted like CSV files
+    (they replace CSV/EDF data of the same lane).
+
+    Every model fitted on the full data of a lane is then scored with
+    goodness_of_fit.py; the table is written next to `save_path`. The
+    selection itself stays AIC-based.
+
+    method="fast" runs the pipeline of fit_distributions.fast_fits as two
+    rounds of tasks: pruned, warm-started fits on a subsample of each
+    file, then full-data refinement of the best `keep` per file.
+
     Args:
         data_dir (str): folder containing input datasets.
         save_path (str): where to save the output distributions.json
+        workers (int): concurrent fitting processes
+        timeout (float | None): wall-clock limit per model fit (s)
+        models (list | None): MODEL_LIST names to try (None = all)
+        method (str): "exhaustive" or "fast"
+        subsample_size, keep, refine_iter: fast pipeline settings
+        chunk_size (int): CSV rows parsed at a time
+        cache (bool): read/write the `.npy` interval cache
+        detector_log (str | None): raw detector log CSV to fit from
+        n_boot (int): parametric bootstrap samples per (lane, model)
+            for goodness-of-fit p-values (0 = no p-values)
+
+    Raises:
+        ValueError: unknown model name or method
     """
+    if method not in ("exhaustive", "fast"):
+        raise ValueError(f"Unknown fitting method '{method}'. Use 'exhaustive' or 'fast'.")
+    models = list(MODEL_LIST) if models is None else list(models)
+    unknown = [m for m in models if m not in MODEL_LIST]
+    if unknown:
+        raise ValueError(f"Unknown model(s): {', '.join(unknown)}")
 
-    files = glob.glob(os.path.join(data_dir, "*"))
+    files = sorted(glob.glob(os.path.join(data_dir, "*")))
 
     results = {}
+    samples = {}
 
     for file in files:
         fname = os.path.basename(file).lower()
 
         # Lane index extraction
         # Example: arr_12.csv → (1,2)
-        lane_match = __import__("re").search(r"(arr|dep)_([1-4])([1-3])", fname)
+        lane_match = re.search(r"(arr|dep)_([1-4])([1-3])", fname)
         if not lane_match:
             continue
 
@@ -60,14 +116,10 @@ def fit_all(data_dir="data/", save_path="src/config/distributions.json"):
 
         key = f"({i},{j})_{kind}"
 
-        # CASE 1: CSV raw data (direct intervals)
+        # CASE 1: CSV raw data (direct intervals) → fitted below
         if fname.endswith(".csv"):
-            df = load_dataset(file)
             column = "arr_time" if kind == "arr" else "dep_time"
-            data = df[column].dropna().values
-            dist_name, params = auto_fit_distribution(data)
-            results[key] = {"dist": dist_name, "params": params}
-            print(f"[FIT] {file} -> {dist_name} {params}")
+            samples[key] = (file, load_intervals(file, column, chunk_size, cache))
 
         # CASE 2: EasyFit EDF file → parse + convert to JSON
         elif fname.endswith(".edf"):
@@ -75,6 +127,147 @@ def fit_all(data_dir="data/", save_path="src/config/distributions.json"):
             results[key] = d
             print(f"[EDF] Loaded EasyFit model for {file}")
 
+    # CASE 3: raw detector log → per-lane intervals, fitted below
+    if detector_log is not None:
+        for key, data in load_detector_log(detector_log, chunk_size).items():
+            results.pop(key, None)
+            samples[key] = (f"{detector_log}:{key}", data)
+
+    def report(task_key, outcome):
+        key, name = task_key
+        status, result, seconds = outcome
+        detail = f"AIC={result[1]:.1f}" if status == "ok" else (result or "dropped")
+        print(f"  [FIT] {os.path.basename(samples[key][0])} {name:<9} "
+              f"{status:<7} {seconds:7.2f}s  {detail}")
+
+    if method == "exhaustive":
+        # One task per (file, model)
+        tasks = [
+            ((key, name), fit_single_model, (name, data))
+            for key, (_, data) in samples.items()
+            for name in models
+        ]
+    else:
+        # Stage 1: pruned models, warm-started, on a subsample of each file
+        tasks = []
+        for key, (_, data) in samples.items():
+            sample = subsample(data, subsample_size)
+            for name in prune_candidates(data, models):
+                tasks.append(((key, name), fit_single_model,
+                              (name, sample, initial_guess(name, sample))))
+
+    if tasks:
+        print(f"[FIT] {len(tasks)} {method} fits ({len(samples)} file(s), "
+              f"{len(models)} model(s)) on {workers} worker(s), timeout={timeout}")
+    outcomes = run_fit_tasks(tasks, workers, timeout, on_result=report)
+
+    if method == "fast":
+        outcomes = _refine_best(samples, models, outcomes, workers, timeout, subsample_size,
+                                keep, refine_iter, report)
+
+    scores, selected = {}, {}
+    for key, (file, data) in samples.items():
+        fits = {
+            name: outcomes[(key, name)][1]
+            for name in models if outcomes[(key, name)][0] == "ok"
+        }
+        try:
+            dist_name, params = select_best(fits)
+        except ValueError:
+            print(f"[FIT] {file}: no model fitted, lane left out")
+            continue
+        results[key] = {"dist": dist_name, "params": params}
+        print(f"[FIT] {file} -> {dist_name} {params}")
+        scores[key] = score_models(data, fits)
+        selected[key] = dist_name
+
+    if samples:
+        print_fit_summary(samples, models, outcomes)
+
+    if n_boot > 0 and scores:
+        _bootstrap_scores(samples, scores, outcomes, n_boot, workers, refine_iter)
+
     # Export everything to JSON
     export_distribution_config(results, save_path)
     print(f"\nSaved final distributions to {save_path}")
+
+    if scores:
+        write_comparison_table(scores, selected, save_path)
+        print_gof_summary(scores, selected)
+
+
+def _refine_best(samples, models, stage1, workers, timeout, subsample_size, keep,
+                 refine_iter, report):
+    """
+    Stage 2 of the fast pipeline: refine the best `keep` subsample fits of
+    each file on its full data.
+
+    Returns:
+        dict: (key, model) → final outcome for every model; models pruned
+            or not kept are marked "pruned" (with their stage-1 time)
+    """
+    final = {}
+    tasks = []
+    for key, (_, data) in samples.items():
+        fitted = sorted(
+            (name for name in models
+             if stage1.get((key, name), ("pruned",))[0] == "ok"),
+            key=lambda name: stage1[(key, name)][1][1]
+        )
+        for name in models:
+            outcome = stage1.get((key, name))
+            final[(key, name)] = outcome if outcome is not None else ("pruned", None, 0.0)
+
+        if len(data) <= subsample_size:
+            continue    # stage 1 already used the full data
+        for name in fitted[keep:]:
+            final[(key, name)] = ("pruned", None, stage1[(key, name)][2])
+        for name in fitted[:keep]:
+            params = refine_start(name, data, stage1[(key, name)][1][0])
+            tasks.append(((key, name), fit_single_model, (name, data, params, refine_iter)))
+
+    for task_key, (status, result, seconds) in run_fit_tasks(
+            tasks, workers, timeout, on_result=report).items():
+        final[task_key] = (status, result, seconds + stage1[task_key][2])
+    return final
+
+
+def _bootstrap_scores(samples, scores, outcomes, n_boot, workers, refine_iter):
+    """Add parametric bootstrap p-values to `scores`, one task per (lane, model)."""
+    tasks = [
+        ((key, name), bootstrap_pvalues,
+         (name, outcomes[(key, name)][1][0], len(samples[key][1]), row, n_boot, seed,
+          refine_iter))
+        for seed, (key, name, row) in enumerate(
+            (key, name, row) for key in scores for name, row in scores[key].items()
+        )
+    ]
+    print(f"\n[GOF] Bootstrap: {len(tasks)} model(s) x {n_boot} samples "
+          f"on {workers} worker(s)")
+    for (key, name), (status, result, seconds) in run_fit_tasks(tasks, workers).items():
+        if status == "ok":
+            scores[key][name].update(result)
+        else:
+            print(f"[GOF] {key} {name}: bootstrap {status}: {result}")
+
+
+def print_fit_summary(samples, models, outcomes):
+    """Print fit time per model and per file, with failures, timeouts and pruning."""
+    print("\n[FIT] Time per model")
+    print(f"  {'model':<10} {'total s':>9} {'mean s':>8} {'max s':>8} {'failed':>7} "
+          f"{'timeout':>8} {'pruned':>7}")
+    for name in models:
+        runs = [outcomes[(key, name)] for key in samples]
+        seconds = [r[2] for r in runs]
+        print(f"  {name:<10} {sum(seconds):>9.2f} {sum(seconds) / len(runs):>8.2f} "
+              f"{max(seconds):>8.2f} {sum(r[0] == 'error' for r in runs):>7} "
+              f"{sum(r[0] == 'timeout' for r in runs):>8} "
+              f"{sum(r[0] == 'pruned' for r in runs):>7}")
+
+    print("[FIT] Time per file")
+    print(f"  {'file':<24} {'samples':>8} {'total s':>9} {'slowest model':>14}")
+    for key, (file, data) in samples.items():
+        runs = {name: outcomes[(key, name)] for name in models}
+        slowest = max(runs, key=lambda name: runs[name][2])
+        print(f"  {os.path.basename(file):<24} {len(data):>8} "
+              f"{sum(r[2] for r in runs.values()):>9.2f} {slowest:>14}")
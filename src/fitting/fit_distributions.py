@@ -18,10 +18,22 @@ Supported models:
 
 Returned format:
     ("distribution_name", [shape, loc, scale])
+
+Two pipelines:
+- auto_fit_distribution: every model, SciPy's default starting values,
+  full data (exhaustive)
+- fast_fit_distribution: models whose family cannot match the sample
+  skewness, kurtosis or support are pruned; the rest are fitted on a
+  subsample from moment/quantile-based starting values, and only the
+  best `keep` of them are refined on the full data with a few
+  optimizer iterations
 """
 
+import math
+from functools import partial
 import numpy as np
 import scipy.stats as st
+from scipy.optimize import fmin
 
 
 # Scipy distribution objects
@@ -49,14 +61,33 @@ def compute_bic(n_params, log_likelihood, n):
     return n_params * np.log(n) - 2 * log_likelihood
 
 
-def fit_model(dist, data):
+def _limited_fmin(func, x0, args=(), disp=0, maxiter=None):
+    """SciPy's default fit optimizer (Nelder-Mead) with an iteration cap."""
+    return fmin(func, x0, args=args, disp=disp, maxiter=maxiter)
+
+
+def fit_model(dist, data, start=None, maxiter=None):
     """
     Fit a SciPy distribution and compute ln-likelihood.
+
+    Args:
+        dist: SciPy distribution
+        data (array): samples
+        start (tuple | None): starting values (shapes..., loc, scale);
+            None = SciPy's defaults
+        maxiter (int | None): cap on optimizer iterations
+
     Returns:
         (params, log_likelihood)
     """
+    args, kwargs = (), {}
+    if start is not None:
+        *args, kwargs["loc"], kwargs["scale"] = start
+    if maxiter is not None:
+        kwargs["optimizer"] = partial(_limited_fmin, maxiter=maxiter)
+
     # Fit distribution parameters
-    params = dist.fit(data)
+    params = dist.fit(data, *args, **kwargs)
 
     # Compute log-likelihood under fitted parameters
     log_pdf = dist.logpdf(data, *params)
@@ -65,6 +96,67 @@ def fit_model(dist, data):
     return params, log_likelihood
 
 
+def fit_single_model(name, data, start=None, maxiter=None):
+    """
+    Fit one model of MODEL_LIST and score it.
+
+    Args:
+        start, maxiter: see fit_model
+
+    Returns:
+        (params list, AIC, BIC)
+    """
+    data = np.asarray(data)
+    n = len(data)
+    params, ll = fit_model(MODEL_LIST[name], data, start, maxiter)
+    k = len(params)
+    return [float(p) for p in params], compute_aic(k, ll, n), compute_bic(k, ll, n)
+
+
+def select_best(fits):
+    """
+    Pick the model with minimum AIC.
+
+    Fits with a non-finite AIC or parameter (e.g. a normal "fitted" to an
+    empty sample) are ignored.
+
+    Args:
+        fits (dict): name → (params, aic, bic) of the models that fitted
+
+    Returns:
+        (best_name, best_params)
+
+    Raises:
+        ValueError: no model fitted
+    """
+    fits = {name: fit for name, fit in fits.items()
+            if np.isfinite(fit[1]) and np.all(np.isfinite(fit[0]))}
+    if not fits:
+        raise ValueError("No distribution model could be fitted to the data.")
+    best_name, (best_params, _, _) = min(fits.items(), key=lambda x: x[1][1])
+    return best_name, list(best_params)
+
+
+def exhaustive_fits(data, models=None):
+    """
+    Fit every model with SciPy's defaults on the full data.
+
+    Returns:
+        dict: name → (params, aic, bic) of the models that fitted
+    """
+    data = np.array(data)
+
+    results = {}
+
+    for name in (MODEL_LIST if models is None else models):
+        try:
+            results[name] = fit_single_model(name, data)
+        except Exception:
+            continue  # Skip models that fail to converge
+
+    return results
+
+
 def auto_fit_distribution(data):
     """
     Try all supported models and select the best according to AIC.
@@ -75,25 +167,206 @@ def auto_fit_distribution(data):
     Returns:
         (best_name, best_params)
     """
-    data = np.array(data)
-    n = len(data)
+    return select_best(exhaustive_fits(data))
 
-    results = {}
 
-    for name, dist in MODEL_LIST.items():
+# (skewness, excess kurtosis) of the families without a shape parameter
+FIXED_SHAPE_MOMENTS = {
+    "norm":     (0.0, 0.0),
+    "logistic": (0.0, 1.2),
+    "rayleigh": (0.631, 0.245),
+    "expon":    (2.0, 6.0),
+}
+
+# Families whose skewness is always positive
+POSITIVE_SKEW = ("gamma", "lognorm")
+
+# Families unbounded below; pruned for non-negative samples when their
+# moment fit would put more than NEGATIVE_MASS below zero
+UNBOUNDED_BELOW = {
+    "norm":     lambda mean, std: st.norm.cdf(0, mean, std),
+    "logistic": lambda mean, std: st.logistic.cdf(0, mean, std * math.sqrt(3) / math.pi),
+}
+NEGATIVE_MASS = 1e-3
+
+# Fewer samples have no usable skewness: nothing is pruned
+MIN_PRUNE_SAMPLES = 3
+
+
+def prune_candidates(data, models=None):
+    """
+    Drop models whose family cannot reproduce the sample shape or support.
+
+    - moments: fixed-shape families must lie within a tolerance of their
+      skewness (0.5 plus five standard errors) and excess kurtosis (wider,
+      as sample kurtosis is noisy for heavy tails); gamma / lognormal
+      need a skewness that is not clearly negative, and Pareto
+      (skewness > 2 whenever finite) a clearly right-skewed sample
+    - support: for non-negative samples (intervals), normal / logistic
+      are dropped when their moment fit puts more than NEGATIVE_MASS
+      below zero, i.e. they would generate negative intervals
+
+    Returns:
+        list: remaining model names, in MODEL_LIST order (all of them
+            for fewer than MIN_PRUNE_SAMPLES samples, as the exhaustive
+            search would try)
+    """
+    x = np.asarray(data, dtype=float)
+    models = list(MODEL_LIST if models is None else models)
+    if len(x) < MIN_PRUNE_SAMPLES:
+        return models
+
+    n = len(x)
+    skew = float(st.skew(x))
+    kurt = float(st.kurtosis(x))
+    tol = 0.5 + 5 * math.sqrt(6 / n)
+    mean, std = float(x.mean()), float(x.std())
+    non_negative = float(x.min()) >= 0
+
+    kept = []
+    for name in models:
+        if name in FIXED_SHAPE_MOMENTS:
+            family_skew, family_kurt = FIXED_SHAPE_MOMENTS[name]
+            kurt_tol = 1 + 0.5 * family_kurt + 10 * (1 + family_kurt) * math.sqrt(24 / n)
+            if abs(skew - family_skew) > tol or abs(kurt - family_kurt) > kurt_tol:
+                continue
+        if name in POSITIVE_SKEW and skew < -tol:
+            continue
+        if name == "pareto" and skew < 1.0:
+            continue
+        if (name in UNBOUNDED_BELOW and non_negative and std > 0
+                and UNBOUNDED_BELOW[name](mean, std) > NEGATIVE_MASS):
+            continue
+        kept.append(name)
+    return kept
+
+
+def initial_guess(name, data):
+    """
+    Moment/quantile-based starting values (shapes..., loc, scale).
+
+    Returns:
+        tuple | None: None when no sensible guess exists (SciPy's
+            defaults are used instead)
+    """
+    x = np.asarray(data, dtype=float)
+    if len(x) < 2:
+        return None
+    mean, std, low = float(x.mean()), float(x.std()), float(x.min())
+    if not std > 0:
+        return None
+    skew = float(st.skew(x))
+    eps = 0.01 * std  # keep the lower bound just below the minimum
+
+    if name == "norm":
+        guess = (mean, std)
+    elif name == "logistic":
+        guess = (mean, std * math.sqrt(3) / math.pi)
+    elif name == "expon":
+        guess = (low, mean - low)
+    elif name == "rayleigh":
+        scale = std / math.sqrt((4 - math.pi) / 2)
+        guess = (mean - scale * math.sqrt(math.pi / 2), scale)
+    elif name == "gamma":
+        a = min((2 / skew) ** 2, 400.0) if skew > 0.1 else 400.0
+        scale = std / math.sqrt(a)
+        guess = (a, mean - a * scale, scale)
+    elif name == "lognorm":
+        loc = low - eps
+        y = np.log(x - loc)
+        guess = (float(y.std()), loc, math.exp(float(y.mean())))
+    elif name == "weibull":
+        loc = low - eps
+        y = x - loc
+        c = (float(y.std()) / float(y.mean())) ** -1.086
+        guess = (c, loc, float(y.mean()) / math.gamma(1 + 1 / c))
+    elif name == "gev":
+        # Gumbel (c = 0) moments; SciPy's c < 0 means a heavier right tail
+        scale = std * math.sqrt(6) / math.pi
+        guess = (-0.1 if skew > 1.14 else 0.1, mean - 0.5772 * scale, scale)
+    elif name == "pareto":
+        loc, scale = low - std, std
+        b = len(x) / float(np.sum(np.log((x - loc) / scale)))
+        guess = (b, loc, scale)
+    elif name == "burr12":
+        # d = 1 is the log-logistic: log(x - loc) is logistic with scale 1/c
+        loc = low - eps
+        y = np.log(x - loc)
+        c = math.pi / (math.sqrt(3) * float(y.std()))
+        guess = (c, 1.0, loc, float(np.exp(np.median(y))))
+    else:
+        return None
+
+    return guess if all(math.isfinite(v) for v in guess) else None
+
+
+def refine_start(name, data, params):
+    """
+    Starting values for refining a subsample fit on the full data.
+
+    A subsample fit may put the lower bound above the smallest value of
+    the full data; its parameters are then replaced by initial_guess()
+    on the full data.
+    """
+    with np.errstate(all="ignore"):
+        ll = np.sum(MODEL_LIST[name].logpdf(data, *params))
+    return tuple(params) if np.isfinite(ll) else initial_guess(name, data)
+
+
+def subsample(data, size, seed=0):
+    """Random subsample without replacement (all data if not larger)."""
+    data = np.asarray(data)
+    if len(data) <= size:
+        return data
+    return np.random.default_rng(seed).choice(data, size, replace=False)
+
+
+def fast_fits(data, models=None, subsample_size=5000, keep=3, refine_iter=100, seed=0):
+    """
+    Pruned, warm-started, two-stage fit.
+
+    1. prune_candidates() on the full data
+    2. fit the remaining models on a subsample, from initial_guess()
+    3. refine the best `keep` (by subsample AIC) on the full data,
+       starting from their subsample fit (see refine_start), with at
+       most `refine_iter` optimizer iterations
+
+    Without subsampling (data no larger than `subsample_size`) step 2
+    already uses the full data and step 3 is skipped.
+
+    Returns:
+        dict: name → (params, aic, bic) on the full data
+    """
+    data = np.asarray(data, dtype=float)
+    sample = subsample(data, subsample_size, seed)
+
+    stage1 = {}
+    for name in prune_candidates(data, models):
         try:
-            params, ll = fit_model(dist, data)
-            k = len(params)
-            aic = compute_aic(k, ll, n)
-            bic = compute_bic(k, ll, n)
-            results[name] = (params, aic, bic)
+            stage1[name] = fit_single_model(name, sample, initial_guess(name, sample))
         except Exception:
             continue  # Skip models that fail to converge
 
-    # Choose best model based on minimum AIC
-    best = min(results.items(), key=lambda x: x[1][1])  # compare AIC
+    if len(sample) == len(data):
+        return stage1
+
+    ranked = sorted((name for name in stage1 if np.isfinite(stage1[name][1])),
+                    key=lambda name: stage1[name][1])
+    results = {}
+    for name in ranked[:keep]:
+        try:
+            start = refine_start(name, data, stage1[name][0])
+            results[name] = fit_single_model(name, data, start, refine_iter)
+        except Exception:
+            continue
+    return results
 
-    best_name = best[0]
-    best_params = list(best[1][0])  # convert tuple → list
 
-    return best_name, best_params
+def fast_fit_distribution(data, **options):
+    """
+    Fast version of auto_fit_distribution (options: see fast_fits).
+
+    Returns:
+        (best_name, best_params)
+    """
+    return select_best(fast_fits(data, **options))
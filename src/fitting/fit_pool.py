@@ -0,0 +1,104 @@
+"""
+fit_pool.py
+----------------------
+Process pool for distribution fits, with a wall-clock timeout per task.
+
+concurrent.futures cannot stop a running task, so a non-converging
+MLE fit would hold its worker forever. Here every task runs in its own
+process (at most `workers` at a time); a task still running after
+`timeout` seconds is terminated and reported as "timeout", and the
+remaining tasks carry on.
+
+Without a timeout and with one worker, tasks run in this process.
+"""
+
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from time import perf_counter
+
+
+def _run_task(func, args):
+    """Run one task: (status, result or error message, seconds)."""
+    start = perf_counter()
+    try:
+        return "ok", func(*args), perf_counter() - start
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}", perf_counter() - start
+
+
+def _task_worker(conn, func, args):
+    try:
+        conn.send(_run_task(func, args))
+    finally:
+        conn.close()
+
+
+def run_fit_tasks(tasks, workers=1, timeout=None, on_result=None):
+    """
+    Execute tasks in separate processes with a per-task timeout.
+
+    Args:
+        tasks (list): [(key, func, args), ...] where func is picklable
+        workers (int): maximum concurrent processes
+        timeout (float | None): seconds before a task is terminated
+        on_result (callable | None): called as on_result(key, outcome)
+            as soon as each task ends
+
+    Returns:
+        dict: key → (status, result, seconds), status being "ok",
+            "error" (result = message) or "timeout" (result = None)
+    """
+    outcomes = {}
+
+    def finish(key, outcome):
+        outcomes[key] = outcome
+        if on_result is not None:
+            on_result(key, outcome)
+
+    if workers <= 1 and timeout is None:
+        for key, func, args in tasks:
+            finish(key, _run_task(func, args))
+        return outcomes
+
+    ctx = multiprocessing.get_context()
+    pending = deque(tasks)
+    running = {}    # pipe end → (key, process, start time)
+
+    while pending or running:
+        while pending and len(running) < max(1, workers):
+            key, func, args = pending.popleft()
+            reader, writer = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_task_worker, args=(writer, func, args), daemon=True)
+            process.start()
+            writer.close()
+            running[reader] = (key, process, perf_counter())
+
+        wait_for = None
+        if timeout is not None:
+            first_deadline = min(start for _, _, start in running.values()) + timeout
+            wait_for = max(0.0, first_deadline - perf_counter())
+
+        for reader in wait(list(running), wait_for):
+            key, process, start = running.pop(reader)
+            try:
+                outcome = reader.recv()
+            except EOFError:
+                process.join()
+                outcome = ("error", f"worker exited with code {process.exitcode}",
+                           perf_counter() - start)
+            reader.close()
+            process.join()
+            finish(key, outcome)
+
+        if timeout is not None:
+            now = perf_counter()
+            for reader, (key, process, start) in list(running.items()):
+                if now - start >= timeout:
+                    process.terminate()
+                    process.join()
+                    reader.close()
+                    del running[reader]
+                    finish(key, ("timeout", None, now - start))
+
+    return outcomes
@@ -0,0 +1,176 @@
+"""
+goodness_of_fit.py
+----------------------
+Goodness-of-fit scores for all fitted candidate models of a sample.
+
+The sample is sorted once; the CDF of every candidate is evaluated on
+that sorted array and the three EDF statistics are computed together,
+for all candidates at once, from the resulting (models × n) matrix:
+
+- KS   (Kolmogorov-Smirnov):  max |F(x_i) - EDF|
+- AD   (Anderson-Darling):    -n - 1/n Σ (2i-1) [ln F_i + ln(1 - F_{n+1-i})]
+- CvM  (Cramér-von Mises):    1/(12n) + Σ (F_i - (2i-1)/(2n))²
+
+Parameters are estimated from the same data, so the textbook
+critical values do not apply. With `n_boot` > 0, p-values come from a
+parametric bootstrap instead: samples are drawn from each fitted model,
+refitted (warm-started from the fitted parameters) and scored, and the
+p-value is the share of bootstrap statistics at least as large as the
+observed one. One bootstrap per (lane, model) runs as a fit_pool task.
+
+write_comparison_table() writes one row per (lane, model) next to
+distributions.json.
+"""
+
+import csv
+import os
+import numpy as np
+
+from .fit_distributions import MODEL_LIST, fit_single_model
+
+STATISTICS = ("ks", "ad", "cvm")
+COMPARISON_FILE = "model_comparison.csv"
+
+# CDF values are clipped away from 0 and 1 so AD stays finite
+CDF_EPS = 1e-12
+
+
+def gof_statistics(cdf):
+    """
+    KS, AD and CvM statistics of CDF values on a sorted sample.
+
+    Args:
+        cdf (np.ndarray): (models, n) CDF of each model at the sorted
+            sample, or (n,) for a single model
+
+    Returns:
+        dict: "ks" / "ad" / "cvm" → np.ndarray of one value per model
+            (floats for a 1-D input)
+    """
+    single = cdf.ndim == 1
+    cdf = np.atleast_2d(cdf)
+    n = cdf.shape[1]
+    i = np.arange(1, n + 1)
+
+    ks = np.maximum((i / n - cdf).max(axis=1), (cdf - (i - 1) / n).max(axis=1))
+    cvm = 1 / (12 * n) + ((cdf - (2 * i - 1) / (2 * n)) ** 2).sum(axis=1)
+
+    clipped = np.clip(cdf, CDF_EPS, 1 - CDF_EPS)
+    ad = -n - ((2 * i - 1) * (np.log(clipped) + np.log1p(-clipped[:, ::-1]))).sum(axis=1) / n
+
+    stats = {"ks": ks, "ad": ad, "cvm": cvm}
+    return {k: float(v[0]) for k, v in stats.items()} if single else stats
+
+
+def score_models(data, fits):
+    """
+    Goodness-of-fit of every fitted model on one sample.
+
+    Args:
+        data (array): samples
+        fits (dict): model name → (params, aic, bic), as fit_single_model
+
+    Returns:
+        dict: model name → {"aic", "bic", "ks", "ad", "cvm"}
+    """
+    names = list(fits)
+    if not names:
+        return {}
+
+    x = np.sort(np.asarray(data, dtype=float))
+    with np.errstate(all="ignore"):
+        cdf = np.vstack([MODEL_LIST[name].cdf(x, *fits[name][0]) for name in names])
+    stats = gof_statistics(np.nan_to_num(cdf, nan=0.0))
+
+    return {
+        name: {"aic": fits[name][1], "bic": fits[name][2],
+               **{s: float(stats[s][m]) for s in STATISTICS}}
+        for m, name in enumerate(names)
+    }
+
+
+def bootstrap_pvalues(name, params, n, observed, n_boot, seed=0, maxiter=100):
+    """
+    Parametric bootstrap p-values of one fitted model.
+
+    Args:
+        name (str): MODEL_LIST name
+        params (list): fitted parameters
+        n (int): sample size
+        observed (dict): observed "ks" / "ad" / "cvm"
+        n_boot (int): bootstrap samples
+        seed (int): random seed
+        maxiter (int | None): optimizer iterations per refit
+
+    Returns:
+        dict: "ks_p" / "ad_p" / "cvm_p" → p-value, plus "n_boot" (refits
+            that succeeded)
+    """
+    dist = MODEL_LIST[name]
+    rng = np.random.default_rng(seed)
+    exceed = dict.fromkeys(STATISTICS, 0)
+    done = 0
+
+    for _ in range(n_boot):
+        sample = dist.rvs(*params, size=n, random_state=rng)
+        with np.errstate(all="ignore"):
+            try:
+                refit = fit_single_model(name, sample, tuple(params), maxiter)[0]
+            except Exception:
+                continue
+            cdf = dist.cdf(np.sort(sample), *refit)
+        if not np.all(np.isfinite(cdf)):
+            continue
+        stats = gof_statistics(cdf)
+        done += 1
+        for s in STATISTICS:
+            exceed[s] += stats[s] >= observed[s]
+
+    pvalues = {f"{s}_p": (exceed[s] + 1) / (done + 1) if done else float("nan")
+               for s in STATISTICS}
+    pvalues["n_boot"] = done
+    return pvalues
+
+
+def write_comparison_table(scores, selected, save_path):
+    """
+    Write the per-lane model comparison next to distributions.json.
+
+    Args:
+        scores (dict): lane key → score_models() result, optionally
+            with bootstrap p-values merged in
+        selected (dict): lane key → selected model name
+        save_path (str): path of distributions.json
+
+    Returns:
+        str: path of the written table
+    """
+    path = os.path.join(os.path.dirname(save_path), COMPARISON_FILE)
+    columns = ["lane", "model", "selected", "aic", "bic", *STATISTICS,
+               *(f"{s}_p" for s in STATISTICS), "n_boot"]
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="")
+        writer.writeheader()
+        for key in sorted(scores):
+            for name, row in sorted(scores[key].items(), key=lambda item: item[1]["aic"]):
+                writer.writerow({"lane": key, "model": name,
+                                 "selected": int(name == selected.get(key)), **row})
+
+    print(f"[GOF] Model comparison of {len(scores)} lane(s) → {path}")
+    return path
+
+
+def print_gof_summary(scores, selected):
+    """Print the statistics of each lane's selected model and the best model per statistic."""
+    print("\n[GOF] Selected models")
+    print(f"  {'lane':<12} {'model':<9} {'KS':>8} {'AD':>9} {'CvM':>8} {'KS p':>6}   "
+          f"best KS / AD / CvM")
+    for key in sorted(scores):
+        rows = scores[key]
+        chosen = rows[selected[key]]
+        best = " / ".join(min(rows, key=lambda name: rows[name][s]) for s in STATISTICS)
+        p = chosen.get("ks_p")
+        p = f"{p:>6.3f}" if p is not None else f"{'-':>6}"
+        print(f"  {key:<12} {selected[key]:<9} {chosen['ks']:>8.4f} {chosen['ad']:>9.3f} "
+              f"{chosen['cvm']:>8.4f} {p}   {best}")
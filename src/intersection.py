@@ -0,0 +1,327 @@
+"""
+intersection.py
+------------------------
+State of one simulated intersection.
+
+An Intersection owns everything a single run mutates:
+- its departure queues and vanish counts
+- the 4x3 lane grid
+- the signal controller (fixed or adaptive)
+- the arrival generators
+
+Several intersections may share one SimPy environment; they never
+touch each other's state, so each behaves exactly as in an isolated run.
+"""
+
+import copy
+import random
+from .lane import Lane
+from .delay_stats import DelayStats
+from .scenario import load_scenario
+from .light_control import LightControl
+from .adaptive_light_control import AdaptiveLightControl
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+
+# Lanes without traffic (no left turn on East/West approaches)
+INACTIVE_LANES = [(0, 0), (2, 0)]
+
+
+def gen_cars(env, lane, i, j, arr_duration, arr_stream=None, arr_dist=None):
+    """
+    Generate arriving vehicles according to the arrival distribution.
+
+    If `arr_stream` is given, intervals are taken from the buffered
+    stream; otherwise one scalar PPF of `arr_dist` is evaluated per
+    arrival.
+    """
+    green, red = arr_duration[i]
+    cycle = green + red
+
+    if lane.resume_arrival is not None:
+        # Resumed from a snapshot: finish the interrupted wait
+        wait, adds_car = lane.resume_arrival
+        lane.resume_arrival = None
+        yield env.timeout(wait)
+        if adds_car:
+            if lane.profile is not None:
+                lane.profile.record("arrivals")
+            lane.add_car()
+
+    while True:
+        # Check if upstream signal is red
+        if (env.now + 60) % cycle > green:
+            extra = 0
+            if len(lane.lane_q) < 15:
+                extra = (15 - len(lane.lane_q)) * 2.5
+            jump = cycle - env.now % cycle + extra
+            lane.arrival_wake, lane.arrival_adds = env.now + jump, False
+            yield env.timeout(jump)
+
+        else:
+            if arr_stream is not None:
+                delay = arr_stream.next()
+            else:
+                delay = float(arr_dist.ppf(random.random()))
+            lane.arrival_wake, lane.arrival_adds = env.now + delay, True
+            yield env.timeout(delay)
+            if lane.profile is not None:
+                lane.profile.record("arrivals")
+            lane.add_car()
+
+
+class Intersection:
+    """One intersection: lanes, departure queues and signal controller."""
+
+    def __init__(self, env, policy, duration, seed, controller="fixed",
+                 block_size=DEFAULT_BLOCK_SIZE, log_enabled=True, profile=None,
+                 sampling="mc", antithetic=False, scenario=None, recorder=None,
+                 fed_approaches=()):
+        """
+        Args:
+            env: simpy.Environment or event_engine.HeapEnvironment
+            policy (list): list of phases, each phase is list of (lane, dir)
+            duration (list): green duration for each phase
+            seed (int): seed of this intersection's variate streams
+            controller (str): "fixed" or "adaptive"
+            block_size (int): variate stream block size
+            log_enabled (bool): adaptive only — keep the duration log
+            profile (RunProfile | None): collect hot-path counters/timers
+            sampling (str): uniform scheme of the variate streams
+                ("mc", "lhs" or "sobol", see sampling.py)
+            antithetic (bool): drive all streams with 1 - u
+            scenario (Scenario | None): compiled configuration
+                (None = load_scenario() of the default config directory)
+            recorder (EventRecorder | None): stream per-event traces
+            fed_approaches (iterable): approaches (0-based) whose vehicles
+                come from upstream intersections (network.py) instead of
+                the arrival generators
+
+        Adaptive controller options (pressure mode, window, alpha, log
+        size) come from the scenario's "adaptive" settings.
+        """
+        self.env = env
+        self.policy = policy
+        self.controller_kind = controller
+        self.seed = seed
+        self.sampling = sampling
+        self.antithetic = antithetic
+        self.scenario = scenario = scenario if scenario is not None else load_scenario()
+        self.dep_queue, self.dep_vanish = scenario.make_departure_state()
+        self.lane_list = self._build_lanes(block_size)
+
+        if controller == "fixed":
+            self.controller = LightControl(
+                env, policy, duration, scenario.dep_cycle, self.dep_queue, self.dep_vanish
+            )
+        elif controller == "adaptive":
+            # The adaptive controller edits its durations → private copy
+            self.controller = AdaptiveLightControl(
+                env, policy, list(duration), scenario.dep_cycle,
+                self.dep_queue, self.dep_vanish, self.lane_list, log_enabled,
+                **scenario.adaptive
+            )
+        else:
+            raise ValueError(f"Unknown controller '{controller}'. Use 'fixed' or 'adaptive'.")
+
+        # Register callbacks
+        for i in range(4):
+            for j in range(3):
+                self.controller.green_list[i][j].append(self.lane_list[i][j].green_light)
+                self.controller.red_list[i][j].append(self.lane_list[i][j].red_light)
+
+        # Instrumentation (None = disabled)
+        self.profile = profile
+        self.controller.profile = profile
+        for row in self.lane_list:
+            for lane in row:
+                lane.profile = profile
+                lane.dep_stream.profile = profile
+
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.bind(env, self.controller)
+            for row in self.lane_list:
+                for lane in row:
+                    lane.recorder = recorder
+
+        # Car generators
+        self.arr_streams = {}
+        for i in range(4):
+            for j in range(3):
+                if (i, j) in INACTIVE_LANES or i in fed_approaches:
+                    continue
+                arr_stream = scenario.make_arr_stream(i, j, seed, block_size,
+                                                      sampling, antithetic)
+                arr_stream.profile = profile
+                self.arr_streams[(i, j)] = arr_stream
+                env.process(gen_cars(env, self.lane_list[i][j], i, j, scenario.dep_cycle,
+                                     arr_stream, scenario.arr_dist(i, j)))
+
+    def _build_lanes(self, block_size):
+        """Create all Lane objects for the intersection."""
+        types = ["East", "South", "West", "North"]
+        dirs = ["left", "straight", "right"]
+
+        return [
+            [
+                Lane(
+                    f"{types[i]} {dirs[j]}", self.env, i, j, self.scenario,
+                    self.dep_queue,
+                    dep_stream=self.scenario.make_dep_stream(
+                        i, j, self.seed, block_size, self.sampling, self.antithetic
+                    )
+                )
+                for j in range(3)
+            ]
+            for i in range(4)
+        ]
+
+    def average_delay(self):
+        """Average delay per served vehicle over all active lanes."""
+        total_delay = 0
+        total_cust = 0
+
+        for i in range(4):
+            for j in range(3):
+                if (i, j) in INACTIVE_LANES:
+                    continue
+                total_delay += self.lane_list[i][j].total_delay
+                total_cust  += self.lane_list[i][j].total_customer
+
+        return total_delay / total_cust
+
+    def delay_summary(self):
+        """
+        Delay percentiles and maximum queue per lane and overall.
+
+        Returns:
+            dict: {"lanes": {lane name: DelayStats.summary()},
+                   "intersection": summary over all active lanes}
+        """
+        total = DelayStats()
+        lanes = {}
+        for i in range(4):
+            for j in range(3):
+                if (i, j) in INACTIVE_LANES:
+                    continue
+                lane = self.lane_list[i][j]
+                total.merge(lane.stats)
+                lanes[lane.name] = lane.stats.summary()
+
+        return {"lanes": lanes, "intersection": total.summary()}
+
+    def snapshot(self, include_streams=True):
+        """
+        Capture the full state of the intersection at env.now.
+
+        Call between env.run() calls: every event before env.now has been
+        processed and none at or after it. Pending timers (green left in
+        the current phase, discharges in progress, next arrivals) are
+        stored relative to env.now.
+
+        Args:
+            include_streams (bool): also copy every variate stream's
+                position, so restore(..., keep_streams=True) continues
+                with exactly the same random numbers
+
+        Returns:
+            dict: picklable snapshot for restore()
+        """
+        now = self.env.now
+        ctl = self.controller
+
+        lanes = []
+        for i in range(4):
+            for j in range(3):
+                lane = self.lane_list[i][j]
+                lanes.append({
+                    "queue": list(lane.lane_q),
+                    "green": lane.green,
+                    "init_left": max(0, lane.init_count - lane.total_customer),
+                    "busy": max(0.0, lane.busy_until - now),
+                    "arrival": (
+                        None if (i, j) in INACTIVE_LANES
+                        else (max(0.0, lane.arrival_wake - now), lane.arrival_adds)
+                    ),
+                })
+
+        snap = {
+            "time": now,
+            "controller": self.controller_kind,
+            "policy": self.policy,
+            "duration": list(ctl.duration),
+            "phase": (ctl.phase_index, max(0.0, ctl.phase_end - now)),
+            "dep_queue": list(self.dep_queue),
+            "lanes": lanes,
+            "streams": None,
+        }
+
+        if self.controller_kind == "adaptive":
+            snap["adaptive"] = copy.deepcopy({
+                "pressure": ctl.pressure,
+                "cycles": ctl._cycles,
+                "duration_log": ctl.duration_log,
+                "duration_log_stride": ctl.duration_log_stride,
+            })
+
+        if include_streams:
+            snap["streams"] = {
+                "arr": {key: s.get_state() for key, s in self.arr_streams.items()},
+                "dep": [lane.dep_stream.get_state() for row in self.lane_list for lane in row],
+            }
+
+        return snap
+
+    def restore(self, snap, keep_streams=False):
+        """
+        Continue from a snapshot in a fresh environment.
+
+        Call right after construction, before the environment runs. The
+        environment must start at the snapshot time (see
+        event_engine.make_environment). Delay statistics start from zero,
+        so average_delay() then covers only the time after the snapshot.
+
+        Args:
+            snap (dict): from snapshot()
+            keep_streams (bool): continue the snapshot's random streams
+                instead of this intersection's own (fresh) streams
+
+        Raises:
+            ValueError: the environment does not start at the snapshot time
+        """
+        if self.env.now != snap["time"]:
+            raise ValueError(
+                f"Environment starts at {self.env.now}, snapshot was taken at {snap['time']}."
+            )
+
+        lanes = [lane for row in self.lane_list for lane in row]
+        for lane, state in zip(lanes, snap["lanes"]):
+            lane.lane_q.extend(state["queue"])
+            lane.green = state["green"]
+            lane.init_count = state["init_left"]
+            # An interrupted discharge only matters while the lane is green
+            lane.resume_wait = state["busy"] if state["green"] else 0.0
+            lane.resume_arrival = state["arrival"]
+
+        self.dep_queue[:] = snap["dep_queue"]
+
+        ctl = self.controller
+        ctl.duration = list(snap["duration"])
+        ctl.resume_phase = snap["phase"]
+
+        if self.controller_kind == "adaptive":
+            state = copy.deepcopy(snap["adaptive"])
+            ctl.pressure = state["pressure"]
+            for lane, tracker in zip(lanes, ctl.pressure):
+                lane.pressure = tracker
+            ctl._cycles = state["cycles"]
+            ctl.duration_log = state["duration_log"]
+            ctl.duration_log_stride = state["duration_log_stride"]
+
+        if keep_streams:
+            if snap["streams"] is None:
+                raise ValueError("Snapshot was taken without stream states.")
+            for key, state in snap["streams"]["arr"].items():
+                self.arr_streams[key].set_state(state)
+            for lane, state in zip(lanes, snap["streams"]["dep"]):
+                lane.dep_stream.set_state(state)
@@ -4,105 +4,160 @@ lane.py
 Lane model for the intersection.
 
 Each lane contains:
-- FIFO queue of vehicles
-- timestamps of arrival
+- bounded FIFO of vehicle arrival timestamps
 - dynamic delay calculation
+- constant-memory delay statistics (delay_stats.py)
 - movement to departure queue
+
+Capacities, initial counts and distributions come from the Scenario
+(scenario.py) the lane is built with.
 """
 
 import random
-from .config_loader import load_json
-from .distributions_dynamic import get_inverse_cdf
-
-# Load configs
-dist_cfg = load_json("distributions.json")
-init_cfg = load_json("init_conditions.json")
-capacity_cfg = load_json("capacity.json")
-
-capacity_matrix = capacity_cfg["capacity"]
-dep_capacity = capacity_cfg["departure_capacity"]
-dep_cycle = capacity_cfg["departure_cycle"]
-
-# Departure queue (shared)
-dep_queue = [0, 0, 0, 0]
-dep_vanish = [cycle[0] // 1 for cycle in dep_cycle]  # cars that disappear during red
-
+from collections import deque
+from .delay_stats import DelayStats
+from .recorder import ARRIVAL, DEPARTURE, DROPPED, BLOCKED, GREEN, RED
 
-def get_arr_time(p, i, j):
-    """Return inverse CDF for arrival distribution of lane (i,j)."""
-    key = f"({i+1},{j+1})_arr"
-    d = dist_cfg[key]
-    return get_inverse_cdf(d["dist"], d["params"], p)
-
-
-def get_dep_time(p, i, j):
-    """Return inverse CDF for departure distribution of lane (i,j)."""
-    key = f"({i+1},{j+1})_dep"
-    d = dist_cfg[key]
-    return get_inverse_cdf(d["dist"], d["params"], p)
+NAN = float("nan")
 
 
 class Lane:
-    def __init__(self, name, env, i, j, capacity):
+    def __init__(self, name, env, i, j, scenario, dep_queue, dep_stream=None):
+        """
+        Args:
+            name (str): display name, e.g. "East left"
+            env: simpy.Environment or event_engine.HeapEnvironment
+            i, j (int): approach and direction (0-based)
+            scenario (Scenario): capacities, initial counts, distributions
+            dep_queue (list): departure queues of the owning intersection
+            dep_stream (VariateStream | None): buffered departure intervals
+        """
         self.name = name
         self.env = env
         self.i = i
         self.j = j
-        self.capacity = capacity
+        self.capacity = scenario.capacity_matrix[i][j]
+        self.dep_capacity = scenario.dep_capacity
+
+        # Initial dummy cars, whose delay is not counted
+        self.init_count = scenario.init_counts[i][j]
+
+        # Departure queues of the owning intersection
+        self.dep_queue = dep_queue
 
-        self.lane_q = []
-        self.time_q = []
+        # Buffered departure sampler (falls back to scalar PPF if None)
+        self.dep_stream = dep_stream
+        self.dep_dist = scenario.dep_dist(i, j)
+
+        # Arrival timestamps of waiting cars (O(1) append/popleft ring)
+        self.lane_q = deque(maxlen=self.capacity)
         self.green = False
 
         self.dep_lane = (i + j) % 4
+        self.index = i * 3 + j
 
         self.total_customer = 0
         self.total_delay = 0
-        self.delay_list = []
+        # Mean/variance, percentiles and max queue in fixed memory
+        self.stats = DelayStats()
+
+        # Optional pressure tracker attached by the adaptive controller
+        self.pressure = None
+
+        # Optional RunProfile (see profiling.py) and EventRecorder (recorder.py)
+        self.profile = None
+        self.recorder = None
+
+        # Optional network.Link carrying discharged cars downstream
+        self.downstream = None
 
-    def add_car(self, car):
+        # Pending timers, read by snapshots (see warmup.py):
+        # end of the current discharge / blocked wait, and the next
+        # wake-up of the arrival generator (adds a car or not)
+        self.busy_until = 0.0
+        self.arrival_wake = 0.0
+        self.arrival_adds = False
+
+        # Set before the environment runs to finish interrupted timers
+        self.resume_wait = 0.0
+        self.resume_arrival = None
+
+    def add_car(self):
         """Add a car to the lane queue or pass immediately if green."""
         if self.green and not self.lane_q:
             self.total_customer += 1
-            self.delay_list.append(0)
+            self.stats.add(0)
+            if self.pressure is not None:
+                self.pressure.add(0)
+            if self.recorder is not None:
+                self.recorder.record(self.index, DEPARTURE, 0.0, 0)
         else:
             if len(self.lane_q) < self.capacity:
-                self.lane_q.append(car)
-                self.time_q.append(self.env.now)
+                self.lane_q.append(self.env.now)
+                if len(self.lane_q) > self.stats.max_queue:
+                    self.stats.max_queue = len(self.lane_q)
+                if self.recorder is not None:
+                    self.recorder.record(self.index, ARRIVAL, NAN, len(self.lane_q))
+            elif self.recorder is not None:
+                self.recorder.record(self.index, DROPPED, NAN, len(self.lane_q))
 
     def move_cars(self):
         """Move cars from this lane to the departure lane."""
+        if self.resume_wait:
+            # Resumed from a snapshot: finish the interrupted discharge
+            wait, self.resume_wait = self.resume_wait, 0.0
+            yield self.env.timeout(wait)
+
         while self.green and self.lane_q:
 
             # If departure lane is full → wait
-            if dep_queue[self.dep_lane] > dep_capacity[self.dep_lane]:
+            if self.dep_queue[self.dep_lane] > self.dep_capacity[self.dep_lane]:
+                if self.profile is not None:
+                    self.profile.record("dep_queue_blocks")
+                if self.recorder is not None:
+                    self.recorder.record(self.index, BLOCKED, NAN, len(self.lane_q))
+                self.busy_until = self.env.now + 1
                 yield self.env.timeout(1)
                 continue
 
-            car = self.lane_q.pop(0)
-            t = self.time_q.pop(0)
+            t = self.lane_q.popleft()
 
-            dep_queue[self.dep_lane] += 1
+            self.dep_queue[self.dep_lane] += 1
+            if self.downstream is not None:
+                self.downstream.send(self.env.now)
 
             delay = self.env.now - t
 
             # Ignore initial dummy cars
-            init_count = init_cfg.get(f"({self.i+1},{self.j+1})", 0)
-            if self.total_customer < init_count:
+            if self.total_customer < self.init_count:
                 delay = 0
 
             self.total_customer += 1
             self.total_delay += delay
-            self.delay_list.append(delay)
-
-            dep_delay = get_dep_time(random.random(), self.i, self.j)
+            self.stats.add(delay)
+            if self.pressure is not None:
+                self.pressure.add(delay)
+            if self.profile is not None:
+                self.profile.record("discharges")
+            if self.recorder is not None:
+                self.recorder.record(self.index, DEPARTURE, delay, len(self.lane_q))
+
+            if self.dep_stream is not None:
+                dep_delay = self.dep_stream.next()
+            else:
+                dep_delay = float(self.dep_dist.ppf(random.random()))
+            self.busy_until = self.env.now + dep_delay
             yield self.env.timeout(dep_delay)
 
     def green_light(self):
         """Callback when this lane receives green."""
         self.green = True
+        if self.recorder is not None:
+            self.recorder.record(self.index, GREEN, NAN, len(self.lane_q))
         self.env.process(self.move_cars())
 
     def red_light(self):
         """Callback when this lane receives red."""
         self.green = False
+        if self.recorder is not None:
+            self.recorder.record(self.index, RED, NAN, len(self.lane_q))
@@ -11,68 +11,109 @@ This module handles:
 Used by both fixed and adaptive simulations.
 """
 
-from .lane import dep_queue, dep_vanish
-
 
 class LightControl:
-    def __init__(self, env, policy, duration, dep_cycle):
+    def __init__(self, env, policy, duration, dep_cycle, dep_queue, dep_vanish):
         """
         Args:
             env (simpy.Environment)
             policy (list): list of phases, each phase is list of (lane, dir)
             duration (list): green duration for each phase
             dep_cycle (list): departure lane signal cycle (green/red)
+            dep_queue (list): departure queue lengths of this intersection
+            dep_vanish (list): cars cleared from each departure lane per red
         """
         self.env = env
         self.policy = policy
         self.duration = duration
         self.dep_cycle = dep_cycle
+        self.dep_queue = dep_queue
+        self.dep_vanish = dep_vanish
 
         # Create green/red light subscriber lists
         self.green_list = [[[] for _ in range(3)] for _ in range(4)]
         self.red_list   = [[[] for _ in range(3)] for _ in range(4)]
 
+        # Optional RunProfile (see profiling.py)
+        self.profile = None
+
+        # Current phase and the time its green ends (read by snapshots);
+        # resume_phase = (phase index, remaining green) continues an
+        # interrupted phase when set before the environment runs
+        self.phase_index = 0
+        self.phase_end = 0.0
+        self.resume_phase = None
+
         # Start light processes
         env.process(self.run_main_lights())
         env.process(self.run_departure_lights())
 
     def _broadcast(self, subscribers):
         """Trigger all registered callbacks (lane.green_light / red_light)."""
+        if self.profile is not None:
+            self.profile.record("light_broadcasts")
         for callback in subscribers:
             callback()
 
     def run_main_lights(self):
-        """Run the fixed green durations for each phase."""
+        """Run the green durations for each phase, cycle after cycle."""
+        start, remaining = self.resume_phase or (0, None)
+
         while True:
-            for phase_index, phase in enumerate(self.policy):
+            for phase_index in range(start, len(self.policy)):
+                phase = self.policy[phase_index]
+                self.phase_index = phase_index
 
                 # Activate all lanes in this phase
                 for lane, d in phase:
                     self._broadcast(self.green_list[lane - 1][d - 1])
 
                 # Keep lights green for specified duration
-                yield self.env.timeout(self.duration[phase_index])
+                # (only the rest of it when resuming a snapshot)
+                green = self.duration[phase_index] if remaining is None else remaining
+                remaining = None
+                self.phase_end = self.env.now + green
+                yield self.env.timeout(green)
 
                 # Turn red for all lanes in this phase
                 for lane, d in phase:
                     self._broadcast(self.red_list[lane - 1][d - 1])
 
+            start = 0
+            self.end_of_cycle()
+
+    def end_of_cycle(self):
+        """Hook called after every full cycle (fixed schedule: nothing)."""
+
     def run_departure_lights(self):
         """
         Departure lane behavior:
         - Red time: clear vanishing queue
         - Green time: vehicles freely disappear (no blocking)
+
+        The schedule never changes, so a run resumed from a snapshot at
+        time t simply starts at position t modulo the full cycle.
         """
+        total = sum(red_t + green_t for red_t, green_t in self.dep_cycle)
+        offset = self.env.now % total if total else 0
+
         while True:
             for lane in range(4):
                 red_t, green_t = self.dep_cycle[lane]
 
+                # Skip stages that ended before a resume time
+                if offset >= red_t + green_t and offset:
+                    offset -= red_t + green_t
+                    continue
+
                 # Red time → departure queue is reduced
-                yield self.env.timeout(red_t)
-                if dep_queue[lane] < dep_vanish[lane]:
-                    dep_queue[lane] = 0
-                else:
-                    dep_queue[lane] -= dep_vanish[lane]
+                if offset <= red_t:
+                    yield self.env.timeout(red_t - offset)
+                    if self.dep_queue[lane] < self.dep_vanish[lane]:
+                        self.dep_queue[lane] = 0
+                    else:
+                        self.dep_queue[lane] -= self.dep_vanish[lane]
 
                 # Green time
-                yield self.env.timeout(green_t)
+                yield self.env.timeout(green_t if offset <= red_t else red_t + green_t - offset)
+                offset = 0
@@ -0,0 +1,423 @@
+"""
+network.py
+------------------------
+Corridors and small networks of linked intersections.
+
+A topology (network.json in the config directory, or corridor_topology())
+lists intersections and directed links:
+
+    {
+      "intersections": [
+        {"name": "A", "policy_index": 0, "duration_index": 0, "controller": "fixed"},
+        {"name": "B", ...}
+      ],
+      "links": [
+        {"from": ["A", 4], "to": ["B", 3], "travel_time": 30,
+         "turn_split": [0, 0.8, 0.2]}
+      ]
+    }
+
+"from" is (intersection, departure lane 1-4) and "to" is (intersection,
+approach 1-4), numbered like the policies (1 East, 2 South, 3 West,
+4 North; departure lane 4 collects the eastbound movements, 2 the
+westbound ones). Every car discharged into a linked departure lane
+reaches the downstream approach `travel_time` seconds later and joins its
+left / straight / right lane by `turn_split`. Approaches fed by a link
+get no external arrivals; departure lanes keep their vanish behaviour,
+which stands for the storage between the intersections.
+
+Execution is split into partitions (contiguous groups of intersections)
+that advance in conservative time windows as long as the shortest link
+travel time: a car sent during [t, t+L) cannot arrive before t+L, so
+each partition simulates a window on its own and cars are exchanged at
+the window boundary. With more than one partition each runs in its own
+process, connected to this one by a pipe. Cars are delivered the same
+way whatever the partitioning, so results do not depend on it.
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import traceback
+from collections import namedtuple
+from time import perf_counter
+import numpy as np
+from .intersection import Intersection, INACTIVE_LANES
+from .config_loader import CONFIG_DIR
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .event_engine import make_environment
+from .scenario import load_scenario
+
+NETWORK_FILE = "network.json"
+DEFAULT_TURN_SPLIT = (0.0, 0.8, 0.2)
+
+# Seed of intersection k is seed + SEED_STRIDE * k
+SEED_STRIDE = 10007
+
+# Compiled link: 0-based indices, cumulative turn split
+LinkSpec = namedtuple(
+    "LinkSpec", "index src dep_lane dst approach travel_time cumulative"
+)
+
+
+def corridor_topology(n, travel_time=30.0, turn_split=DEFAULT_TURN_SPLIT,
+                      controller="fixed", policy_index=0, duration_index=0):
+    """
+    Topology of `n` intersections in a west-east row, linked both ways.
+
+    Eastbound cars leave intersection k by departure lane 4 and enter
+    k+1 on its West approach; westbound cars leave k+1 by departure
+    lane 2 and enter k on its East approach.
+    """
+    names = [f"I{k}" for k in range(n)]
+    intersections = [
+        {"name": name, "policy_index": policy_index,
+         "duration_index": duration_index, "controller": controller}
+        for name in names
+    ]
+
+    links = []
+    for west, east in zip(names, names[1:]):
+        links.append({"from": [west, 4], "to": [east, 3],
+                      "travel_time": travel_time, "turn_split": list(turn_split)})
+        links.append({"from": [east, 2], "to": [west, 1],
+                      "travel_time": travel_time, "turn_split": list(turn_split)})
+
+    return {"intersections": intersections, "links": links}
+
+
+def load_topology(config_dir=None):
+    """
+    Load network.json from a config directory.
+
+    Raises:
+        FileNotFoundError: the directory has no network.json
+        ValueError: the file is not valid JSON
+    """
+    path = os.path.join(config_dir or CONFIG_DIR, NETWORK_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Network topology not found: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON file '{NETWORK_FILE}': {e}")
+
+
+def compile_links(topology):
+    """
+    Validate the links of a topology.
+
+    Returns:
+        list: LinkSpec per link, in topology order
+
+    Raises:
+        ValueError: unknown intersection, index out of range, travel
+            time <= 0, invalid turn split, or a departure lane linked twice
+    """
+    names = [node["name"] for node in topology["intersections"]]
+    if len(set(names)) != len(names):
+        raise ValueError("Intersection names in the topology must be unique.")
+    index = {name: k for k, name in enumerate(names)}
+
+    specs = []
+    used = set()
+    for n, link in enumerate(topology.get("links", [])):
+        (src, dep_lane), (dst, approach) = link["from"], link["to"]
+        for name in (src, dst):
+            if name not in index:
+                raise ValueError(f"Link {n}: unknown intersection '{name}'.")
+        if not (1 <= dep_lane <= 4 and 1 <= approach <= 4):
+            raise ValueError(f"Link {n}: departure lane and approach must be 1-4.")
+        if (src, dep_lane) in used:
+            raise ValueError(f"Link {n}: departure lane {dep_lane} of '{src}' is linked twice.")
+        used.add((src, dep_lane))
+
+        travel_time = float(link["travel_time"])
+        if travel_time <= 0:
+            raise ValueError(f"Link {n}: travel_time must be positive.")
+
+        split = [float(p) for p in link.get("turn_split", DEFAULT_TURN_SPLIT)]
+        if len(split) != 3 or min(split) < 0 or not math.isclose(sum(split), 1.0):
+            raise ValueError(f"Link {n}: turn_split must be 3 probabilities summing to 1.")
+        for j, p in enumerate(split):
+            if p > 0 and (approach - 1, j) in INACTIVE_LANES:
+                raise ValueError(f"Link {n}: lane ({approach},{j+1}) has no traffic.")
+
+        specs.append(LinkSpec(n, index[src], dep_lane - 1, index[dst], approach - 1,
+                              travel_time, tuple(np.cumsum(split))))
+    return specs
+
+
+def split_partitions(n, partitions):
+    """Contiguous groups of intersection indices, as even as possible."""
+    partitions = max(1, min(partitions, n))
+    bounds = [round(p * n / partitions) for p in range(partitions + 1)]
+    return [list(range(bounds[p], bounds[p + 1])) for p in range(partitions)]
+
+
+class Link:
+    """Source end of a link: sends discharged cars to the outbox."""
+
+    __slots__ = ("spec", "rng", "outbox", "sent")
+
+    def __init__(self, spec, seed, outbox):
+        self.spec = spec
+        self.rng = np.random.default_rng([seed, spec.index])
+        self.outbox = outbox
+        self.sent = 0
+
+    def send(self, now):
+        """Queue one car leaving at `now` for delivery downstream."""
+        spec = self.spec
+        u = self.rng.random()
+        j = 0
+        while j < 2 and u >= spec.cumulative[j]:
+            j += 1
+        self.outbox.append((now + spec.travel_time, spec.index, self.sent,
+                            spec.dst, spec.approach, j))
+        self.sent += 1
+
+
+class Partition:
+    """Intersections simulated together in one environment."""
+
+    def __init__(self, topology, members, specs, seed, block_size=DEFAULT_BLOCK_SIZE,
+                 backend="simpy", scenario=None):
+        """
+        Args:
+            topology (dict): see module docstring
+            members (list): indices of the intersections in this partition
+            specs (list): LinkSpec of every link in the network
+            seed (int): network seed
+        """
+        scenario = scenario if scenario is not None else load_scenario()
+        self.env = make_environment(backend)
+        self.outbox = []
+
+        fed = {}
+        for spec in specs:
+            fed.setdefault(spec.dst, set()).add(spec.approach)
+
+        self.intersections = {}
+        for k in members:
+            node = topology["intersections"][k]
+            idx = node.get("duration_index", 0)
+            policy = scenario.policies[node["policy_index"]] if "policy_index" in node \
+                else scenario.policy_for(idx)
+            self.intersections[k] = Intersection(
+                self.env, policy, scenario.durations[idx], seed + SEED_STRIDE * k,
+                node.get("controller", "fixed"), block_size, log_enabled=False,
+                scenario=scenario, fed_approaches=fed.get(k, ())
+            )
+
+        for spec in specs:
+            if spec.src not in self.intersections:
+                continue
+            link = Link(spec, seed, self.outbox)
+            for row in self.intersections[spec.src].lane_list:
+                for lane in row:
+                    if lane.dep_lane == spec.dep_lane:
+                        lane.downstream = link
+
+    def _deliver(self, inter, cars):
+        """Process adding the cars of one window to their lanes."""
+        env = self.env
+        for arrival, _, _, _, i, j in cars:
+            yield env.timeout(arrival - env.now)
+            inter.lane_list[i][j].add_car()
+
+    def advance(self, until, inbox):
+        """
+        Deliver incoming cars and simulate up to `until`.
+
+        Args:
+            until (float): end of the window
+            inbox (list): cars for this partition, all arriving >= now
+
+        Returns:
+            list: cars sent during the window
+        """
+        by_target = {}
+        for car in sorted(inbox):
+            by_target.setdefault(car[3], []).append(car)
+        for k in sorted(by_target):
+            self.env.process(self._deliver(self.intersections[k], by_target[k]))
+
+        self.env.run(until)
+
+        sent = list(self.outbox)
+        self.outbox.clear()
+        return sent
+
+    def results(self):
+        """Per-intersection delay totals and summaries."""
+        results = {}
+        for k, inter in self.intersections.items():
+            summary = inter.delay_summary()["intersection"]
+            results[k] = {
+                "vehicles": summary["count"],
+                "total_delay": summary["mean"] * summary["count"],
+                "summary": summary,
+            }
+        return results
+
+
+class _LocalPartition:
+    """Partition in this process, with the same interface as _RemotePartition."""
+
+    def __init__(self, args):
+        self.partition = Partition(*args)
+        self._reply = None
+
+    def request(self, command, *payload):
+        if command == "advance":
+            self._reply = self.partition.advance(*payload)
+        else:
+            self._reply = self.partition.results()
+
+    def reply(self):
+        return self._reply
+
+    def close(self):
+        pass
+
+
+def _partition_worker(conn, args):
+    """Worker process: build a partition and serve window requests."""
+    try:
+        partition = Partition(*args)
+        while True:
+            command, *payload = conn.recv()
+            if command == "advance":
+                conn.send(("ok", partition.advance(*payload)))
+            else:
+                conn.send(("ok", partition.results()))
+                break
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class _RemotePartition:
+    """Partition in a worker process, driven over a pipe."""
+
+    def __init__(self, args):
+        ctx = multiprocessing.get_context()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_partition_worker, args=(child, args), daemon=True)
+        self.process.start()
+        child.close()
+
+    def request(self, command, *payload):
+        self.conn.send((command,) + payload)
+
+    def reply(self):
+        status, payload = self.conn.recv()
+        if status == "error":
+            raise RuntimeError(f"Network partition failed:\n{payload}")
+        return payload
+
+    def close(self):
+        self.conn.close()
+        self.process.join()
+
+
+def run_network(topology, runtime, seed, partitions=1, block_size=DEFAULT_BLOCK_SIZE,
+                backend="simpy", scenario=None):
+    """
+    Simulate a network of linked intersections.
+
+    Args:
+        topology (dict): see module docstring
+        runtime (float): simulated time
+        seed (int): network seed (intersection k uses seed + SEED_STRIDE*k)
+        partitions (int): number of partitions; > 1 runs each partition
+            in its own process. Results do not depend on this value.
+
+    Returns:
+        dict:
+            {
+                "mean_delay": delay per intersection passage, network-wide,
+                "intersections": [{"name", "vehicles", "mean_delay",
+                                   "p95_delay", "max_queue"}, ...],
+                "partitions", "windows", "lookahead", "transfers",
+                "wall": wall time (s)
+            }
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    specs = compile_links(topology)
+    n = len(topology["intersections"])
+    groups = split_partitions(n, partitions)
+    owner = {k: p for p, group in enumerate(groups) for k in group}
+
+    # Conservative lookahead: no car arrives sooner than this after leaving
+    lookahead = min((spec.travel_time for spec in specs), default=runtime)
+
+    start = perf_counter()
+    runner = _LocalPartition if len(groups) == 1 else _RemotePartition
+    parts = [runner((topology, group, specs, seed, block_size, backend, scenario))
+             for group in groups]
+
+    try:
+        inboxes = [[] for _ in parts]
+        now = 0.0
+        windows = transfers = 0
+        while now < runtime:
+            until = min(now + lookahead, runtime)
+            for part, inbox in zip(parts, inboxes):
+                part.request("advance", until, inbox)
+
+            inboxes = [[] for _ in parts]
+            for part in parts:
+                for car in part.reply():
+                    inboxes[owner[car[3]]].append(car)
+                    transfers += 1
+
+            now = until
+            windows += 1
+
+        merged = {}
+        for part in parts:
+            part.request("results")
+        for part in parts:
+            merged.update(part.reply())
+    finally:
+        for part in parts:
+            part.close()
+    wall = perf_counter() - start
+
+    vehicles = sum(r["vehicles"] for r in merged.values())
+    total_delay = sum(r["total_delay"] for r in merged.values())
+    return {
+        "mean_delay": total_delay / vehicles if vehicles else 0.0,
+        "intersections": [
+            {
+                "name": topology["intersections"][k]["name"],
+                "vehicles": merged[k]["vehicles"],
+                "mean_delay": merged[k]["summary"]["mean"],
+                "p95_delay": merged[k]["summary"]["p95"],
+                "max_queue": merged[k]["summary"]["max_queue"],
+            }
+            for k in range(n)
+        ],
+        "partitions": len(groups),
+        "windows": windows,
+        "lookahead": lookahead,
+        "transfers": transfers,
+        "wall": wall,
+    }
+
+
+def print_network_results(result):
+    """Print the per-intersection table of a run_network() result."""
+    print(f"{'intersection':<14} {'vehicles':>9} {'mean':>8} {'p95':>8} {'max queue':>10}")
+    for row in result["intersections"]:
+        print(f"{row['name']:<14} {row['vehicles']:>9} {row['mean_delay']:>8.2f} "
+              f"{row['p95_delay']:>8.2f} {row['max_queue']:>10}")
+    print(f"[NETWORK] {len(result['intersections'])} intersections, "
+          f"{result['partitions']} partition(s), {result['windows']} windows of "
+          f"{result['lookahead']:g}s, {result['transfers']} cars transferred, "
+          f"mean delay {result['mean_delay']:.4f}, {result['wall']:.2f}s wall")
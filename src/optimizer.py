@@ -0,0 +1,295 @@
+"""
+optimizer.py
+------------------------
+Green-split optimizer for fixed-schedule signals.
+
+Searches the green times of one policy at a fixed cycle length, using
+noisy run_fixed evaluations instead of a hand-written durations.json grid:
+
+1. Successive halving: a seeded sample of random splits (plus the equal
+   split) is evaluated with a few replications; the best 1/eta are kept
+   and get eta times as many replications, until one candidate is left.
+2. Coordinate search: from that split, green time is moved between every
+   pair of phases in steps that halve whenever no move improves the
+   mean delay, down to the split resolution.
+3. The final split is replicated until `final_rep` runs and returned with
+   its confidence interval.
+
+Replication r of every candidate uses the same seed (common random
+numbers), so candidates are compared on identical traffic. Each round of
+evaluations is fanned out over the process pool (parallel.py).
+"""
+
+import math
+import numpy as np
+from .simulation_core import run_batch
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .scenario import load_scenario
+from .parallel import run_tasks
+from .experiment import ci_half_width
+
+# Seed offset keeping optimizer runs apart from the experiment seeds
+SEED_OFFSET = 5000
+
+
+def random_splits(n, phases, cycle, min_green, resolution, rng):
+    """
+    Draw `n` distinct integer green splits summing to `cycle`.
+
+    Splits are uniform on the simplex (Dirichlet(1)), rounded to
+    `resolution` seconds, with every phase at least `min_green`.
+
+    Returns:
+        list: tuples of green times; the equal split comes first
+    """
+    spare = cycle - phases * min_green
+    if spare < 0:
+        raise ValueError(
+            f"Cycle {cycle}s is too short for {phases} phases of {min_green}s minimum green."
+        )
+    if spare % resolution:
+        raise ValueError(
+            f"Cycle {cycle}s minus minimum greens is not a multiple of {resolution}s."
+        )
+    units = spare // resolution
+
+    def to_split(parts):
+        # Largest-remainder rounding to whole units
+        floor = np.floor(parts).astype(int)
+        order = np.argsort(floor - parts, kind="stable")[:units - floor.sum()]
+        floor[order] += 1
+        return tuple(int(min_green + u * resolution) for u in floor)
+
+    equal = to_split(np.full(phases, units / phases))
+    splits = [equal]
+    seen = {equal}
+    attempts = 0
+    while len(splits) < n and attempts < 100 * n:
+        attempts += 1
+        split = to_split(rng.dirichlet(np.ones(phases)) * units)
+        if split not in seen:
+            seen.add(split)
+            splits.append(split)
+
+    return splits
+
+
+def grid_size(phases, cycle, min_green, resolution):
+    """Number of splits in the full grid at this resolution."""
+    units = (cycle - phases * min_green) // resolution
+    return math.comb(units + phases - 1, phases - 1)
+
+
+class SplitOptimizer:
+    def __init__(self, policy, cycle, seed, runtime, min_green=10, resolution=1,
+                 confidence=0.95, workers=1, block_size=DEFAULT_BLOCK_SIZE,
+                 backend="simpy", scenario=None):
+        """
+        Args:
+            policy (list): list of phases, each phase is list of (lane, dir)
+            cycle (int): cycle length (s), the sum of all green times
+            seed (int): base seed; replication r uses seed + SEED_OFFSET + r
+            runtime (float): simulated time per run
+            min_green (int): minimum green time per phase (s)
+            resolution (int): green-time granularity (s)
+            confidence (float): confidence level of reported intervals
+            workers (int): worker processes per evaluation round
+            scenario (Scenario | None): configuration to simulate
+        """
+        self.policy = policy
+        self.phases = len(policy)
+        self.cycle = cycle
+        self.seed = seed
+        self.runtime = runtime
+        self.min_green = min_green
+        self.resolution = resolution
+        self.confidence = confidence
+        self.workers = workers
+        self.block_size = block_size
+        self.backend = backend
+        self.scenario = scenario if scenario is not None else load_scenario()
+
+        # split tuple → list of average delays (replication r at index r)
+        self.samples = {}
+        self.runs = 0
+
+    def mean(self, split, reps=None):
+        """Mean delay over the first `reps` replications (all if None)."""
+        return float(np.mean(self.samples[split][:reps]))
+
+    def evaluate(self, splits, reps):
+        """
+        Bring every split up to `reps` replications, in one parallel round.
+
+        Means use only the first `reps` replications, so every split is
+        compared on the same seeds even if some have more runs.
+
+        Returns:
+            list: mean delay of each split
+        """
+        tasks = []
+        for split in splits:
+            done = len(self.samples.setdefault(split, []))
+            if done >= reps:
+                continue
+            specs = [
+                {"policy": self.policy, "duration": list(split),
+                 "seed": self.seed + SEED_OFFSET + r, "controller": "fixed"}
+                for r in range(done, reps)
+            ]
+            tasks.append((split, run_batch,
+                          (specs, self.runtime, self.block_size, self.backend,
+                           self.scenario)))
+
+        for (split, _, args), delays in zip(tasks, run_tasks(tasks, self.workers)):
+            self.samples[split].extend(delays)
+            self.runs += len(args[0])
+
+        return [self.mean(split, reps) for split in splits]
+
+    def successive_halving(self, n_candidates=27, eta=3, initial_rep=2, rng=None):
+        """
+        Narrow random splits down to one by successive halving.
+
+        Returns:
+            tuple: surviving split
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
+        candidates = random_splits(n_candidates, self.phases, self.cycle,
+                                   self.min_green, self.resolution, rng)
+        reps = initial_rep
+
+        while len(candidates) > 1:
+            means = self.evaluate(candidates, reps)
+            keep = max(1, len(candidates) // eta)
+            order = np.argsort(means, kind="stable")[:keep]
+            candidates = [candidates[k] for k in order]
+            print(f"  [HALVING] {len(means)} → {keep} split(s) at {reps} rep(s); "
+                  f"best {candidates[0]} = {means[order[0]]:.4f}")
+            reps *= eta
+
+        return candidates[0]
+
+    def neighbours(self, split, step):
+        """Splits reached by moving `step` seconds from one phase to another."""
+        result = []
+        for a in range(self.phases):
+            if split[a] - step < self.min_green:
+                continue
+            for b in range(self.phases):
+                if a == b:
+                    continue
+                moved = list(split)
+                moved[a] -= step
+                moved[b] += step
+                result.append(tuple(moved))
+        return result
+
+    def coordinate_search(self, start, step=8, local_rep=6, max_rounds=50):
+        """
+        Pairwise green-transfer search with a shrinking step.
+
+        Returns:
+            tuple: best split found
+        """
+        best = start
+        step = max(self.resolution, step - step % self.resolution)
+        rounds = 0
+
+        while rounds < max_rounds:
+            rounds += 1
+            candidates = [best] + self.neighbours(best, step)
+            means = self.evaluate(candidates, local_rep)
+            k = int(np.argmin(means))
+
+            if k == 0:
+                print(f"  [COORD] step {step}s: no improvement on {best} ({means[0]:.4f})")
+                if step == self.resolution:
+                    break
+                step = max(self.resolution, (step // 2) - (step // 2) % self.resolution)
+            else:
+                best = candidates[k]
+                print(f"  [COORD] step {step}s: moved to {best} ({means[k]:.4f})")
+
+        return best
+
+    def optimize(self, n_candidates=27, eta=3, initial_rep=2, coord_step=8,
+                 local_rep=6, final_rep=20):
+        """
+        Full search: successive halving, coordinate search, final replication.
+
+        Returns:
+            dict:
+                {
+                    "duration": best split,
+                    "mean_delay": float,
+                    "half_width": CI half-width,
+                    "runs": replications of the best split,
+                    "total_runs": simulations used by the search,
+                    "evaluated": number of distinct splits simulated
+                }
+        """
+        print(f"[OPTIMIZER] {self.phases} phases, cycle={self.cycle}s, "
+              f"min_green={self.min_green}s, resolution={self.resolution}s")
+
+        start = self.successive_halving(n_candidates, eta, initial_rep)
+        best = self.coordinate_search(start, coord_step, local_rep)
+        self.evaluate([best], final_rep)
+
+        delays = self.samples[best]
+        result = {
+            "duration": list(best),
+            "mean_delay": float(np.mean(delays)),
+            "half_width": ci_half_width(delays, self.confidence),
+            "runs": len(delays),
+            "total_runs": self.runs,
+            "evaluated": len(self.samples),
+        }
+
+        print(f"[OPTIMIZER] Best split {result['duration']}: "
+              f"{result['mean_delay']:.4f} ± {result['half_width']:.4f} "
+              f"({result['runs']} runs)")
+        return result
+
+
+def optimize_green_split(workers=1, policy_index=None, cycle=None, backend=None,
+                         scenario=None):
+    """
+    Run the green-split optimizer with settings from base_settings.json.
+
+    Settings come from its "optimizer" block; `policy_index` and `cycle`
+    override the configured values. Also reports how many simulations the
+    full grid would need at the same resolution and fixed_rep.
+
+    Returns:
+        dict: see SplitOptimizer.optimize
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    base = scenario.base
+    cfg = dict(base.get("optimizer", {}))
+
+    configured_policy = cfg.pop("policy_index", 0)
+    configured_cycle = cfg.pop("cycle", 100)
+    policy_index = configured_policy if policy_index is None else policy_index
+    cycle = configured_cycle if cycle is None else cycle
+
+    # Remaining keys: search schedule → optimize(), the rest → SplitOptimizer
+    search = {k: cfg.pop(k) for k in
+              ("n_candidates", "eta", "initial_rep", "coord_step", "local_rep", "final_rep")
+              if k in cfg}
+
+    optimizer = SplitOptimizer(
+        scenario.policies[policy_index], cycle, base["seed"], base["runtime"],
+        workers=workers,
+        block_size=base.get("variate_block_size", DEFAULT_BLOCK_SIZE),
+        backend=backend or base.get("backend", "simpy"),
+        scenario=scenario,
+        **cfg,
+    )
+    result = optimizer.optimize(**search)
+
+    grid_runs = grid_size(optimizer.phases, cycle, optimizer.min_green,
+                          optimizer.resolution) * base["fixed_rep"]
+    print(f"[OPTIMIZER] {result['total_runs']} simulations over {result['evaluated']} "
+          f"splits; a full grid needs {grid_runs}.")
+    return result
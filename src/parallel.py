@@ -0,0 +1,65 @@
+"""
+parallel.py
+------------------------
+Process-pool executor for independent simulation runs.
+
+Each task is a top-level function plus its arguments (e.g. run_fixed,
+run_adaptive). Every run seeds itself from its own arguments, so the
+results are identical whatever the number of workers; only the order
+in which progress is reported changes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def resolve_workers(workers):
+    """
+    Normalize a worker count.
+
+    Args:
+        workers (int | None): requested workers; 0 or None means
+            one worker per CPU core.
+
+    Returns:
+        int: number of worker processes (>= 1)
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def run_tasks(tasks, workers=1, on_result=None):
+    """
+    Execute tasks serially or across a process pool.
+
+    Args:
+        tasks (list): [(key, func, args), ...] where func is picklable
+        workers (int): number of worker processes (1 = run in-process)
+        on_result (callable | None): called as on_result(key, result)
+            in the parent as soon as each run finishes
+
+    Returns:
+        list: results in the same order as `tasks`
+    """
+    results = [None] * len(tasks)
+
+    if workers <= 1 or len(tasks) <= 1:
+        for n, (key, func, args) in enumerate(tasks):
+            results[n] = func(*args)
+            if on_result is not None:
+                on_result(key, results[n])
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        futures = {
+            pool.submit(func, *args): (n, key)
+            for n, (key, func, args) in enumerate(tasks)
+        }
+        for future in as_completed(futures):
+            n, key = futures[future]
+            results[n] = future.result()
+            if on_result is not None:
+                on_result(key, results[n])
+
+    return results
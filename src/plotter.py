@@ -10,7 +10,7 @@ Saves PNG plots to results/plots/
 
 import os
 import matplotlib.pyplot as plt
-from .config_loader import load_json
+from .scenario import load_scenario
 
 
 def ensure_dir(path):
@@ -18,7 +18,7 @@ def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
-def plot_results(fixed_results, adaptive_results):
+def plot_results(fixed_results, adaptive_results, scenario=None):
     """
     Plot comparison between:
     - mean delay of each fixed schedule
@@ -27,15 +27,18 @@ def plot_results(fixed_results, adaptive_results):
     Args:
         fixed_results (list): from run_all_fixed_experiments()
         adaptive_results (dict): from run_adaptive_experiment()
+        scenario (Scenario | None): supplies "plot_dir"
+            (None = load_scenario() of the default config directory)
     """
-    cfg = load_json("base_settings.json")
-    plot_dir = cfg["plot_dir"]
+    scenario = scenario if scenario is not None else load_scenario()
+    plot_dir = scenario.base["plot_dir"]
     ensure_dir(plot_dir)
 
     # Extract data
     fixed_means = [f["mean_delay"] for f in fixed_results]
     fixed_stds  = [f["std_delay"] for f in fixed_results]
-    fixed_labels = [f"Set {i}" for i in range(len(fixed_results))]
+    fixed_index = [f.get("set_index", i) for i, f in enumerate(fixed_results)]
+    fixed_labels = [f"Set {i}" for i in fixed_index]
 
     ada_mean = adaptive_results["mean_delay"]
     ada_std = adaptive_results["std_delay"]
@@ -48,7 +51,7 @@ def plot_results(fixed_results, adaptive_results):
 
     # Fixed results
     plt.errorbar(
-        list(range(len(fixed_means))),
+        fixed_index,
         fixed_means,
         yerr=fixed_stds,
         fmt='o-', label="Fixed Scheduling"
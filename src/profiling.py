@@ -0,0 +1,103 @@
+"""
+profiling.py
+------------------------
+Lightweight hot-path instrumentation for a simulation run.
+
+A RunProfile collects counters and cumulative timers for:
+- arrivals generated            (intersection.gen_cars)
+- discharges                    (Lane.move_cars)
+- departure-queue blocks        (Lane.move_cars, departure lane full)
+- PPF evaluations               (VariateStream refills, timed)
+- controller updates            (AdaptiveLightControl.update_duration, timed)
+- light broadcasts              (LightControl._broadcast)
+
+Components hold a `profile` attribute that is None unless a profile is
+attached, so a disabled profile costs one attribute test per event.
+"""
+
+import cProfile
+import time
+
+COUNTERS = [
+    "arrivals",
+    "discharges",
+    "dep_queue_blocks",
+    "ppf_evaluations",
+    "controller_updates",
+    "light_broadcasts",
+]
+
+
+class RunProfile:
+    """Counters and cumulative timers of one (or several merged) runs."""
+
+    __slots__ = ("counts", "seconds", "wall")
+
+    def __init__(self):
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(COUNTERS, 0.0)
+        self.wall = 0.0
+
+    def record(self, name, n=1, seconds=0.0):
+        """Add `n` events (and optionally their elapsed time) to a counter."""
+        self.counts[name] += n
+        self.seconds[name] += seconds
+
+    def merge(self, other):
+        """Accumulate another profile into this one."""
+        for name in COUNTERS:
+            self.counts[name] += other.counts[name]
+            self.seconds[name] += other.seconds[name]
+        self.wall += other.wall
+
+    def as_dict(self):
+        return {
+            "wall": self.wall,
+            "counts": dict(self.counts),
+            "seconds": dict(self.seconds),
+        }
+
+
+def print_profile(profile):
+    """Print a breakdown table of a RunProfile."""
+    print(f"[PROFILE] wall={profile.wall:.4f} s")
+    print(f"{'counter':<20} {'count':>10} {'total_s':>10} {'us/event':>10} {'%wall':>7}")
+
+    for name in COUNTERS:
+        n = profile.counts[name]
+        secs = profile.seconds[name]
+        if secs > 0:
+            per = f"{secs / n * 1e6:.2f}" if n else "-"
+            share = f"{secs / profile.wall * 100:.1f}" if profile.wall else "-"
+            print(f"{name:<20} {n:>10} {secs:>10.4f} {per:>10} {share:>7}")
+        else:
+            print(f"{name:<20} {n:>10} {'-':>10} {'-':>10} {'-':>7}")
+
+
+def profile_call(func, *args, stats_path=None, **kwargs):
+    """
+    Call `func`, optionally under cProfile.
+
+    If `stats_path` is given, cProfile statistics are dumped there in
+    pstats format (readable by pstats, snakeviz, flameprof, gprof2dot).
+
+    Returns:
+        (result, wall seconds)
+    """
+    profiler = cProfile.Profile() if stats_path else None
+
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    wall = time.perf_counter() - start
+
+    if profiler is not None:
+        profiler.dump_stats(stats_path)
+        print(f"[PROFILE] cProfile stats saved → {stats_path}")
+
+    return result, wall
@@ -0,0 +1,233 @@
+"""
+result_cache.py
+------------------------
+Persistent, content-addressed cache of simulation results.
+
+Each run's average delay and delay summary (percentiles and maximum
+queue, see Intersection.delay_summary) are stored in a SQLite database
+(by default results/cache.sqlite) under a SHA-256 key of everything
+that determines them:
+- policy, duration set, runtime, seed and controller type
+- sampling scheme and antithetic flag
+- digests of the scenario's configuration (distributions,
+  init_conditions, capacity and the simulation-relevant base settings)
+
+Block size and event backend are left out: results do not depend on
+them (every sampling scheme draws the same uniforms for any block size
+that is a multiple of its stratification size). Changing any
+configuration file therefore invalidates exactly the runs it affects.
+The database is bounded to `max_entries` rows with least-recently-used
+eviction, and hit/miss counters are kept in the database so runs in
+worker processes are counted too.
+
+Disable with the "cache" block of base_settings.json ("enabled": false)
+or the ASC_NO_CACHE environment variable (set by `main.py --no-cache`).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Bump when a model change alters results for the same inputs
+# (2: LHS uniforms drawn group by group)
+CACHE_VERSION = 2
+
+DEFAULT_PATH = os.path.join("results", "cache.sqlite")
+DEFAULT_MAX_ENTRIES = 100_000
+
+# base_settings.json keys that change simulation results
+RESULT_SETTINGS = ("ppf_mode", "ppf_max_error", "adaptive")
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# Scenario digest → config_digest() result
+_config_digests = {}
+
+
+def config_digest(scenario):
+    """Digest of the scenario configuration that simulation results depend on."""
+    digest = _config_digests.get(scenario.digest)
+    if digest is None:
+        raw = scenario.raw
+        digest = _config_digests[scenario.digest] = _digest({
+            "distributions": _digest(raw["dists"]),
+            "init_conditions": _digest(raw["init"]),
+            "capacity": _digest(raw["caps"]),
+            "base_settings": _digest({k: raw["base"].get(k) for k in RESULT_SETTINGS}),
+            "version": CACHE_VERSION,
+        })
+    return digest
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path (str): SQLite database file (created if missing)
+            max_entries (int): LRU bound on stored results
+        """
+        self.path = path
+        self.max_entries = max_entries
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Several worker processes may share the file
+        self.conn = sqlite3.connect(path, timeout=60)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, delay REAL NOT NULL, last_used REAL NOT NULL, "
+                "summary TEXT)"
+            )
+            # Databases written before summaries were stored
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+            if "summary" not in columns:
+                self.conn.execute("ALTER TABLE results ADD COLUMN summary TEXT")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def key(self, scenario, policy, duration, runtime, seed, controller="fixed",
+            sampling="mc", antithetic=False):
+        """Content key of one run of `scenario`."""
+        return _digest({
+            "policy": policy,
+            "duration": list(duration),
+            "runtime": runtime,
+            "seed": seed,
+            "controller": controller,
+            "sampling": sampling,
+            "antithetic": bool(antithetic),
+            "config": config_digest(scenario),
+        })
+
+    def get_many(self, keys, require_summary=False):
+        """
+        Look up several keys, refreshing their LRU position.
+
+        Args:
+            keys (list): cache keys
+            require_summary (bool): treat rows stored without a delay
+                summary as misses
+
+        Returns:
+            dict: key → (delay, summary dict or None) for the keys found
+        """
+        found = {}
+        with self.conn:
+            for key in keys:
+                row = self.conn.execute(
+                    "SELECT delay, summary FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (require_summary and row[1] is None):
+                    continue
+                found[key] = (row[0], json.loads(row[1]) if row[1] is not None else None)
+
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            self._count("hits", len(found))
+            self._count("misses", len(keys) - len(found))
+
+        return found
+
+    def put_many(self, items):
+        """Store (key, delay, summary) triples and evict beyond `max_entries`."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (key, delay, last_used, summary) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, float(delay), now, json.dumps(summary) if summary is not None else None)
+                 for key, delay, summary in items]
+            )
+            excess = self.size() - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self._count("evictions", excess)
+
+    def get(self, key, require_summary=False):
+        return self.get_many([key], require_summary).get(key)
+
+    def put(self, key, delay, summary=None):
+        self.put_many([(key, delay, summary)])
+
+    def size(self):
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _count(self, name, n):
+        if n:
+            self.conn.execute(
+                "INSERT INTO stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, n)
+            )
+
+    def stats(self):
+        """Cumulative counters: {"hits", "misses", "evictions", "entries"}."""
+        counts = dict(self.conn.execute("SELECT name, value FROM stats").fetchall())
+        return {
+            "hits": counts.get("hits", 0),
+            "misses": counts.get("misses", 0),
+            "evictions": counts.get("evictions", 0),
+            "entries": self.size(),
+        }
+
+
+# Process-wide cache and the process that opened it
+_cache = None
+_cache_pid = None
+
+
+def get_cache(scenario):
+    """
+    Process-wide ResultCache, or None when caching is disabled.
+
+    Settings come from the "cache" block of the scenario's base settings;
+    one cache is kept open per database path and process. A SQLite
+    connection must not be used across fork(), so a worker forked after
+    the parent opened the cache opens its own.
+    """
+    global _cache, _cache_pid
+    cfg = scenario.base.get("cache", {})
+    if os.environ.get("ASC_NO_CACHE") or not cfg.get("enabled", True):
+        return None
+
+    path = cfg.get("path", DEFAULT_PATH)
+    if _cache is None or _cache.path != path or _cache_pid != os.getpid():
+        _cache = ResultCache(path, cfg.get("max_entries", DEFAULT_MAX_ENTRIES))
+        _cache_pid = os.getpid()
+    return _cache
+
+
+def disable_cache():
+    """Turn caching off for this process and the workers it starts."""
+    global _cache
+    os.environ["ASC_NO_CACHE"] = "1"
+    _cache = None
+
+
+def print_cache_stats(before, after):
+    """Print hit/miss counts between two ResultCache.stats() snapshots."""
+    hits = after["hits"] - before["hits"]
+    misses = after["misses"] - before["misses"]
+    total = hits + misses
+    rate = hits / total * 100 if total else 0.0
+    print(f"[CACHE] {hits} hit(s), {misses} miss(es) ({rate:.1f}% hit rate), "
+          f"{after['evictions'] - before['evictions']} evicted, "
+          f"{after['entries']} entries stored")
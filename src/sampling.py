@@ -0,0 +1,151 @@
+"""
+sampling.py
+------------------------
+Uniform random number sources feeding VariateStream.
+
+Schemes:
+- "mc":    plain Monte Carlo (independent uniforms)
+- "lhs":   Latin hypercube — each run of `strata` consecutive uniforms
+           has exactly one point in each of `strata` equal cells,
+           in random order
+- "sobol": scrambled Sobol' — each run of `strata` consecutive
+           uniforms is a randomized Sobol' net, in random order
+
+Any scheme can be made antithetic (u → 1 - u), which is how the second
+run of an antithetic replication pair is driven from the same seed.
+
+Stratification works on short groups rather than whole buffer blocks,
+because a lane may use only a few hundred variates in a run.
+"""
+
+import numpy as np
+from scipy.stats import qmc
+
+DEFAULT_STRATA = 64
+
+SAMPLING_SCHEMES = ("mc", "lhs", "sobol")
+
+# Largest double below 1.0: keeps antithetic uniforms off the PPF pole at 1
+_ONE_MINUS = np.nextafter(1.0, 0.0)
+
+
+class MonteCarloUniforms:
+    """Independent uniforms from a NumPy generator."""
+
+    def __init__(self, seed, antithetic=False):
+        self.rng = np.random.default_rng(seed)
+        self.antithetic = antithetic
+
+    def _draw(self, n):
+        return self.rng.random(n)
+
+    def block(self, n):
+        """Return the next `n` uniforms."""
+        u = self._draw(n)
+        if self.antithetic:
+            u = np.minimum(1.0 - u, _ONE_MINUS)
+        return u
+
+
+class LatinHypercubeUniforms(MonteCarloUniforms):
+    """Consecutive groups of `strata` uniforms are Latin hypercube samples."""
+
+    def __init__(self, seed, antithetic=False, strata=DEFAULT_STRATA):
+        super().__init__(seed, antithetic)
+        self.strata = strata
+
+    def _draw(self, n):
+        # Group by group (cells, then jitter), so the sequence does not
+        # depend on how many groups a block holds
+        u = np.empty((_groups(n, self.strata), self.strata))
+        for group in u:
+            cells = self.rng.permutation(self.strata)
+            group[:] = (cells + self.rng.random(self.strata)) / self.strata
+        return u.ravel()
+
+
+class SobolUniforms(MonteCarloUniforms):
+    """Consecutive groups of `strata` uniforms are scrambled Sobol' nets."""
+
+    def __init__(self, seed, antithetic=False, strata=DEFAULT_STRATA):
+        super().__init__(seed, antithetic)
+        if strata & (strata - 1):
+            raise ValueError(f"Sobol' strata must be a power of 2, got {strata}.")
+        self.strata = strata
+        self.sobol = qmc.Sobol(d=1, scramble=True, seed=self.rng)
+
+    def _draw(self, n):
+        groups = _groups(n, self.strata)
+        points = np.vstack([self.sobol.random(self.strata).T for _ in range(groups)])
+        return self.rng.permuted(points, axis=1).ravel()
+
+
+def _groups(n, strata):
+    """Number of stratified groups in a block of n uniforms."""
+    if n % strata:
+        raise ValueError(
+            f"Block size {n} must be a multiple of the stratification size {strata}."
+        )
+    return n // strata
+
+
+def make_uniform_source(scheme, seed, antithetic=False):
+    """
+    Create a uniform source.
+
+    Args:
+        scheme (str): "mc", "lhs" or "sobol"
+        seed (int | list[int]): seed for numpy.random.default_rng
+        antithetic (bool): return 1 - u instead of u
+    """
+    if scheme == "mc":
+        return MonteCarloUniforms(seed, antithetic)
+    if scheme == "lhs":
+        return LatinHypercubeUniforms(seed, antithetic)
+    if scheme == "sobol":
+        return SobolUniforms(seed, antithetic)
+    raise ValueError(f"Unknown sampling scheme '{scheme}'. Use one of {SAMPLING_SCHEMES}.")
+
+
+def variance_reduction_factor(samples, antithetic, reference=None, runs_are_mc=False):
+    """
+    Estimate variance reduction versus plain Monte Carlo, per run spent.
+
+    Args:
+        samples (list): per-run results in replication order; with
+            antithetic=True consecutive runs (0,1), (2,3), ... are pairs
+        antithetic (bool): whether runs form antithetic pairs
+        reference (list | None): plain Monte Carlo runs of the same
+            scenario, used to estimate the plain per-run variance
+        runs_are_mc (bool): the individual runs are themselves plain
+            Monte Carlo runs ("mc" antithetic pairs), so their spread
+            estimates the plain variance without a reference
+
+    Returns:
+        float | None: Var_MC(per run) / Var_scheme(per run); values > 1
+        mean fewer runs are needed for the same confidence. None when
+        it cannot be estimated.
+    """
+    samples = np.asarray(samples, dtype=float)
+
+    if antithetic:
+        n_pairs = len(samples) // 2
+        if n_pairs < 2:
+            return None
+        pair_means = samples[:2 * n_pairs].reshape(n_pairs, 2).mean(axis=1)
+        scheme_var = 2.0 * np.var(pair_means, ddof=1)
+    else:
+        if len(samples) < 2:
+            return None
+        scheme_var = np.var(samples, ddof=1)
+
+    if reference is not None and len(reference) >= 2:
+        mc_var = np.var(np.asarray(reference, dtype=float), ddof=1)
+    elif runs_are_mc:
+        mc_var = np.var(samples, ddof=1)
+    else:
+        return None
+
+    if scheme_var <= 0:
+        return None
+    return float(mc_var / scheme_var)
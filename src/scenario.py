@@ -0,0 +1,211 @@
+"""
+scenario.py
+------------------------
+Compiled, immutable scenario configuration.
+
+A Scenario is built once from a config directory and holds everything a
+run reads, already parsed into fast structures:
+- base settings, duration sets and policies (phases as tuples of
+  (lane, dir) tuples)
+- capacity matrix, departure capacities and departure cycles
+- initial dummy-car counts per lane as a 4x3 table
+- the compiled distribution registry (distributions_dynamic.py)
+
+It is passed explicitly into run_fixed / run_adaptive / run_batch and on
+to the Intersection, lanes and controllers, so per-run setup reads no
+files. load_scenario() caches one Scenario per directory and rebuilds it
+only when a file's mtime or size changes *and* its contents hash
+differently, so scenarios can be swapped (or refitted) without
+re-importing any module.
+
+Pickling a Scenario (e.g. for a worker process) only sends its directory
+and digest; the worker loads its own cached copy and checks the digest.
+"""
+
+import hashlib
+import json
+import os
+from types import MappingProxyType
+from .config_loader import CONFIG_DIR
+from .distributions_dynamic import (
+    compile_registry, VariateStream, DEFAULT_BLOCK_SIZE, DEFAULT_MAX_ERROR
+)
+
+# Config file → key in Scenario.raw (the layout validate_all() expects)
+CONFIG_FILES = {
+    "base_settings.json": "base",
+    "durations.json": "durations",
+    "policies.json": "policies",
+    "distributions.json": "dists",
+    "init_conditions.json": "init",
+    "capacity.json": "caps",
+}
+
+
+def normalize_policy(policy):
+    """
+    Convert a policy to a tuple of phases of (lane, dir) tuples.
+
+    A flat policy ([[1,2], [1,3], ...], one movement per entry) is read
+    as one single-movement phase per entry.
+    """
+    if all(len(entry) == 2 and all(isinstance(v, int) for v in entry) for entry in policy):
+        return tuple(((int(lane), int(d)),) for lane, d in policy)
+    return tuple(tuple((int(lane), int(d)) for lane, d in phase) for phase in policy)
+
+
+def _parse_init(init_cfg):
+    """4x3 table of initial dummy-car counts ("(i,j)" keys, null = 0)."""
+    counts = [[0] * 3 for _ in range(4)]
+    for key, value in init_cfg.items():
+        i, j = (int(v) for v in key.strip("()").split(","))
+        counts[i - 1][j - 1] = value or 0
+    return tuple(tuple(row) for row in counts)
+
+
+class Scenario:
+    """Read-only, pre-parsed configuration of one config directory."""
+
+    def __init__(self, config_dir, raw, digest):
+        """
+        Args:
+            config_dir (str): directory the files were read from
+            raw (dict): parsed JSON files, keyed as in CONFIG_FILES
+            digest (str): SHA-256 over the file contents
+        """
+        base = raw["base"]
+        caps = raw["caps"]
+
+        values = {
+            "config_dir": config_dir,
+            "digest": digest,
+            "raw": MappingProxyType(raw),
+            "base": MappingProxyType(base),
+            "adaptive": MappingProxyType(dict(base.get("adaptive", {}))),
+            "durations": tuple(tuple(d) for d in raw["durations"]["duration_sets"]),
+            "policies": tuple(normalize_policy(p) for p in raw["policies"]["policy_sets"]),
+            "capacity_matrix": tuple(tuple(row) for row in caps["capacity"]),
+            "dep_capacity": tuple(caps["departure_capacity"]),
+            "dep_cycle": tuple(tuple(c) for c in caps["departure_cycle"]),
+            "init_counts": _parse_init(raw["init"]),
+            # Compile distributions once ("exact" or "tabulated" PPF)
+            "dist_registry": MappingProxyType(compile_registry(
+                raw["dists"],
+                mode=base.get("ppf_mode", "exact"),
+                max_error=base.get("ppf_max_error", DEFAULT_MAX_ERROR),
+            )),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Scenario is immutable; edit the config files instead.")
+
+    def __reduce__(self):
+        return (_restore, (self.config_dir, self.digest))
+
+    def policy_for(self, idx):
+        """Policy of duration set `idx` (the first policy if there is none)."""
+        return self.policies[idx] if idx < len(self.policies) else self.policies[0]
+
+    def arr_dist(self, i, j):
+        """Compiled arrival distribution of lane (i,j) (0-based)."""
+        return self.dist_registry[f"({i+1},{j+1})_arr"]
+
+    def dep_dist(self, i, j):
+        """Compiled departure distribution of lane (i,j) (0-based)."""
+        return self.dist_registry[f"({i+1},{j+1})_dep"]
+
+    def make_departure_state(self):
+        """
+        Return fresh departure-lane state for one intersection:
+        (dep_queue, dep_vanish), where dep_vanish counts the cars that
+        disappear from each departure lane during its red time.
+        """
+        dep_queue = [0, 0, 0, 0]
+        dep_vanish = [cycle[0] // 1 for cycle in self.dep_cycle]
+        return dep_queue, dep_vanish
+
+    def make_arr_stream(self, i, j, seed, block_size=DEFAULT_BLOCK_SIZE, sampling="mc",
+                        antithetic=False):
+        """Return a buffered arrival-interval stream for lane (i,j)."""
+        return VariateStream(self.arr_dist(i, j), [seed, i, j, 0], block_size,
+                             sampling, antithetic)
+
+    def make_dep_stream(self, i, j, seed, block_size=DEFAULT_BLOCK_SIZE, sampling="mc",
+                        antithetic=False):
+        """Return a buffered departure-interval stream for lane (i,j)."""
+        return VariateStream(self.dep_dist(i, j), [seed, i, j, 1], block_size,
+                             sampling, antithetic)
+
+
+# config_dir → (file signature, Scenario)
+_scenarios = {}
+
+
+def _signature(config_dir):
+    """(name, mtime_ns, size) of every config file."""
+    signature = []
+    for filename in CONFIG_FILES:
+        path = os.path.join(config_dir, filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Config file not found: {path}")
+        stat = os.stat(path)
+        signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_scenario(config_dir=None):
+    """
+    Return the Scenario of a config directory, building it at most once.
+
+    The cached Scenario is reused while file mtimes and sizes are
+    unchanged; otherwise the files are re-read and a new Scenario is
+    compiled only if their contents hash differently.
+
+    Args:
+        config_dir (str | None): None = config_loader.CONFIG_DIR
+
+    Raises:
+        FileNotFoundError: a config file is missing
+        ValueError: a config file is not valid JSON
+    """
+    config_dir = os.path.abspath(config_dir or CONFIG_DIR)
+    signature = _signature(config_dir)
+
+    cached = _scenarios.get(config_dir)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    contents = {}
+    sha = hashlib.sha256()
+    for filename in CONFIG_FILES:
+        with open(os.path.join(config_dir, filename), "rb") as f:
+            contents[filename] = f.read()
+        sha.update(filename.encode("utf-8") + b"\0" + contents[filename])
+    digest = sha.hexdigest()
+
+    if cached is not None and cached[1].digest == digest:
+        _scenarios[config_dir] = (signature, cached[1])
+        return cached[1]
+
+    raw = {}
+    for filename, key in CONFIG_FILES.items():
+        try:
+            raw[key] = json.loads(contents[filename])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON file '{filename}': {e}")
+
+    scenario = Scenario(config_dir, raw, digest)
+    _scenarios[config_dir] = (signature, scenario)
+    return scenario
+
+
+def _restore(config_dir, digest):
+    """Unpickle a Scenario by loading it from its directory."""
+    scenario = load_scenario(config_dir)
+    if scenario.digest != digest:
+        raise RuntimeError(
+            f"Config files in {config_dir} changed while the scenario was in use."
+        )
+    return scenario
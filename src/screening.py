@@ -0,0 +1,195 @@
+"""
+screening.py
+------------------------
+Analytical delay screening of duration sets.
+
+Scores every duration set with an HCM-style signalized-intersection
+delay model instead of simulating it:
+
+    d1 = 0.5 C (1 - g/C)^2 / (1 - min(1, X) g/C)                (uniform)
+    d2 = 900 T [(X - 1) + sqrt((X - 1)^2 + 4 X / (c T))]        (random)
+
+with cycle C, effective green g, degree of saturation X = v / c,
+lane capacity c = s g / C (veh/h) and analysis period T (h).
+
+Because a lane in the simulation drops arrivals once its storage
+(capacity.json) is full, a lane's delay is capped at the red time plus
+the time to discharge a full queue, and lanes are weighted by the flow
+they can actually serve, min(v, c).
+
+Rates come from the configuration:
+- arrival rate v: 1 / mean arrival interval, scaled by the fraction of
+  time the upstream signal lets cars arrive (departure_cycle)
+- saturation flow s: 1 / mean departure interval
+
+Only the top-K or within-threshold sets are then simulated. Lanes that
+no phase serves are left out of the score, just as the simulation's
+average delay only counts served vehicles.
+"""
+
+import math
+import numpy as np
+from scipy.stats import spearmanr
+from .intersection import INACTIVE_LANES
+
+
+def lane_rates(scenario):
+    """
+    Mean arrival rate and saturation flow of each active lane.
+
+    Args:
+        scenario (Scenario): compiled configuration
+
+    Returns:
+        dict: (i, j) → (arrival rate veh/s, saturation flow veh/s)
+    """
+    rates = {}
+    for i in range(4):
+        green, red = scenario.dep_cycle[i]
+        open_frac = green / (green + red)
+
+        for j in range(3):
+            if (i, j) in INACTIVE_LANES:
+                continue
+            mean_arr = scenario.arr_dist(i, j).frozen.mean()
+            mean_dep = scenario.dep_dist(i, j).frozen.mean()
+            rates[(i, j)] = (open_frac / mean_arr, 1.0 / mean_dep)
+
+    return rates
+
+
+def hcm_delay(v, s, g, cycle, period):
+    """
+    Uniform + random control delay (s/veh) of one lane group.
+
+    Args:
+        v (float): arrival rate (veh/s)
+        s (float): saturation flow (veh/s)
+        g (float): effective green (s)
+        cycle (float): cycle length (s)
+        period (float): analysis period (s)
+    """
+    g_ratio = g / cycle
+    cap = s * g_ratio * 3600.0          # veh/h
+    x = v * 3600.0 / cap
+    t = period / 3600.0                 # h
+
+    if g_ratio >= 1.0:
+        d1 = 0.0                        # green in every phase: no uniform delay
+    else:
+        d1 = 0.5 * cycle * (1.0 - g_ratio) ** 2 / (1.0 - min(1.0, x) * g_ratio)
+    d2 = 900.0 * t * ((x - 1.0) + math.sqrt((x - 1.0) ** 2 + 4.0 * x / (cap * t)))
+    return d1 + d2
+
+
+def analytical_delay(policy, duration, runtime, scenario, rates=None):
+    """
+    Flow-weighted average delay of a (policy, duration set) pair.
+
+    `rates` (from lane_rates) may be passed to avoid recomputing them.
+
+    Returns:
+        float: estimated average delay per served vehicle (s)
+    """
+    rates = rates if rates is not None else lane_rates(scenario)
+    cycle = float(sum(duration))
+
+    # Green time each lane receives per cycle (a lane may be in several phases)
+    green = {}
+    for pi, phase in enumerate(policy):
+        for lane, d in phase:
+            key = (lane - 1, d - 1)
+            green[key] = green.get(key, 0.0) + duration[pi]
+
+    weighted = 0.0
+    flow = 0.0
+    for key, (v, s) in rates.items():
+        g = green.get(key, 0.0)
+        if g <= 0:
+            continue
+
+        discharge = s * g / cycle       # average veh/s the lane can serve
+        served = min(v, discharge)
+        full_queue = (cycle - g) + scenario.capacity_matrix[key[0]][key[1]] / discharge
+
+        delay = min(hcm_delay(v, s, g, cycle, runtime), full_queue)
+        weighted += served * delay
+        flow += served
+
+    return weighted / flow if flow else math.inf
+
+
+def screen_duration_sets(scenario, runtime=None, top_k=None, threshold=None):
+    """
+    Score every duration set and choose which ones to simulate.
+
+    Args:
+        scenario (Scenario): duration sets, policies and lane rates
+        runtime (float | None): simulated horizon, used as analysis
+            period (None = the scenario's runtime)
+        top_k (int | None): keep the K best-scoring sets
+        threshold (float | None): keep sets scoring within
+            (1 + threshold) × best score
+
+    Returns:
+        (ranking, selected):
+            ranking: [{"set_index", "duration_set", "score"}, ...] best first
+            selected: sorted list of set indices to simulate
+    """
+    durations = scenario.durations
+    runtime = runtime if runtime is not None else scenario.base["runtime"]
+    rates = lane_rates(scenario)
+
+    ranking = []
+    for idx, duration_set in enumerate(durations):
+        ranking.append({
+            "set_index": idx,
+            "duration_set": list(duration_set),
+            "score": analytical_delay(scenario.policy_for(idx), duration_set, runtime,
+                                      scenario, rates),
+        })
+    ranking.sort(key=lambda r: r["score"])
+
+    kept = ranking
+    if threshold is not None and ranking:
+        best = ranking[0]["score"]
+        kept = [r for r in kept if r["score"] <= best * (1.0 + threshold)]
+    if top_k is not None:
+        kept = kept[:top_k]
+
+    selected = sorted(r["set_index"] for r in kept)
+
+    print(f"[SCREENING] {len(selected)}/{len(durations)} duration sets forwarded to simulation")
+    for r in ranking:
+        mark = "*" if r["set_index"] in selected else " "
+        print(f"  {mark} Set {r['set_index']}: score={r['score']:.4f} duration={r['duration_set']}")
+
+    return ranking, selected
+
+
+def screening_correlation(ranking, fixed_results):
+    """
+    Compare screened scores with simulated mean delays.
+
+    Args:
+        ranking (list): from screen_duration_sets()
+        fixed_results (list): from run_all_fixed_experiments()
+
+    Returns:
+        dict: {"n", "spearman", "pearson"} over the simulated sets
+    """
+    score = {r["set_index"]: r["score"] for r in ranking}
+    pairs = [
+        (score[f["set_index"]], f["mean_delay"])
+        for f in fixed_results if math.isfinite(score[f["set_index"]])
+    ]
+
+    result = {"n": len(pairs), "spearman": float("nan"), "pearson": float("nan")}
+    if len(pairs) >= 3:
+        x, y = np.array(pairs).T
+        result["spearman"] = float(spearmanr(x, y).correlation)
+        result["pearson"] = float(np.corrcoef(x, y)[0, 1])
+
+    print(f"[SCREENING] Screened vs simulated over {result['n']} sets: "
+          f"spearman={result['spearman']:.3f}, pearson={result['pearson']:.3f}")
+    return result
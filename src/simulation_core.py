@@ -4,92 +4,175 @@ simulation_core.py
 Provides:
 - run_fixed(): run simulation with fixed schedule
 - run_adaptive(): run simulation with adaptive controller
+- run_batch(): run many independent intersections in one environment
+
+All three return average delays, or with summary=True also the delay
+percentiles and maximum queues of Intersection.delay_summary().
+They accept backend="simpy" (default) or "heap" for the
+lightweight event loop in event_engine.py; both give the same results.
+They also take the compiled Scenario to simulate (scenario.py); None
+means the default config directory, loaded once per process.
+
+Every run owns its Intersection state, so results depend only on the
+arguments and not on earlier or concurrent runs in the same process.
+That also makes them safe to cache: unless caching is disabled, results
+are looked up in / stored to the persistent cache (result_cache.py).
+Profiled and recorded runs always simulate.
 """
 
-import simpy
 import random
-from .lane import Lane, capacity_matrix
-from .light_control import LightControl
-from .config_loader import load_json
-from .lane import get_arr_time
+from time import perf_counter
+from .intersection import Intersection
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .event_engine import make_environment
+from .result_cache import get_cache
+from .scenario import load_scenario
 
 
-def gen_cars(env, lane, i, j, arr_duration):
-    """
-    Generate arriving vehicles according to the arrival distribution.
-    """
-    green, red = arr_duration[i]
-    cycle = green + red
-
-    while True:
-        # Check if upstream signal is red
-        if (env.now + 60) % cycle > green:
-            extra = 0
-            if len(lane.lane_q) < 15:
-                extra = (15 - len(lane.lane_q)) * 2.5
-            jump = cycle - env.now % cycle + extra
-            yield env.timeout(jump)
+def _run_env(env, runtime, profile):
+    """Run the environment, recording wall time into `profile` if given."""
+    if profile is None:
+        env.run(runtime)
+        return
 
-        else:
-            delay = get_arr_time(random.random(), i, j)
-            yield env.timeout(delay)
-            lane.add_car(object())
+    start = perf_counter()
+    env.run(runtime)
+    profile.wall += perf_counter() - start
 
 
-def _build_lanes(env):
+def run_fixed(policy, duration, runtime, seed, block_size=DEFAULT_BLOCK_SIZE,
+              backend="simpy", profile=None, sampling="mc", antithetic=False,
+              scenario=None, recorder=None, summary=False):
     """
-    Helper: create all Lane objects for the intersection.
+    Run fixed scheduling simulation.
+
+    Each lane draws its arrival/departure intervals from its own
+    buffered stream seeded from (seed, lane), in blocks of up to
+    `block_size`.
+    Pass a profiling.RunProfile as `profile` to collect hot-path counters,
+    or a recorder.EventRecorder as `recorder` to stream per-event traces
+    (the caller closes it).
+    `sampling` / `antithetic` select a variance-reduction scheme for the
+    uniforms driving those streams (see sampling.py).
+
+    Returns:
+        float: average delay, or (average delay, delay summary) if
+            `summary` is true
     """
-    types = ["East", "South", "West", "North"]
-    dirs = ["left", "straight", "right"]
+    scenario = scenario if scenario is not None else load_scenario()
+    cache = get_cache(scenario) if profile is None and recorder is None else None
+    if cache is not None:
+        key = cache.key(scenario, policy, duration, runtime, seed, "fixed",
+                        sampling, antithetic)
+        hit = cache.get(key, require_summary=summary)
+        if hit is not None:
+            return hit if summary else hit[0]
 
-    lane_list = [
-        [Lane(f"{types[i]} {dirs[j]}", env, i, j, capacity_matrix[i][j]) for j in range(3)]
-        for i in range(4)
-    ]
+    random.seed(seed)
+    env = make_environment(backend)
 
-    return lane_list
+    inter = Intersection(env, policy, duration, seed, "fixed", block_size,
+                         profile=profile, sampling=sampling, antithetic=antithetic,
+                         scenario=scenario, recorder=recorder)
+    _run_env(env, runtime, profile)
 
+    delay, stats = inter.average_delay(), inter.delay_summary()
+    if cache is not None:
+        cache.put(key, delay, stats)
+    return (delay, stats) if summary else delay
 
-def run_fixed(policy, duration, runtime, seed):
-    """
-    Run fixed scheduling simulation.
+
+def run_adaptive(policy, duration, runtime, seed, block_size=DEFAULT_BLOCK_SIZE,
+                 log_enabled=True, backend="simpy", profile=None,
+                 sampling="mc", antithetic=False, scenario=None, recorder=None,
+                 summary=False):
     """
-    random.seed(seed)
-    env = simpy.Environment()
+    Run adaptive scheduling simulation.
 
-    lane_list = _build_lanes(env)
+    `duration` is the initial green split; the controller adjusts a
+    private copy of it after every cycle. Returns as run_fixed.
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    cache = get_cache(scenario) if profile is None and recorder is None else None
+    if cache is not None:
+        key = cache.key(scenario, policy, duration, runtime, seed, "adaptive",
+                        sampling, antithetic)
+        hit = cache.get(key, require_summary=summary)
+        if hit is not None:
+            return hit if summary else hit[0]
 
-    dep_cycle = load_json("capacity.json")["departure_cycle"]
-    arr_duration = load_json("capacity.json")["departure_cycle"]
+    random.seed(seed)
+    env = make_environment(backend)
 
-    # Create controller
-    ctl = LightControl(env, policy, duration, dep_cycle)
+    inter = Intersection(env, policy, duration, seed, "adaptive", block_size,
+                         log_enabled, profile, sampling, antithetic, scenario, recorder)
+    _run_env(env, runtime, profile)
 
-    # Register callbacks
-    for i in range(4):
-        for j in range(3):
-            ctl.green_list[i][j].append(lane_list[i][j].green_light)
-            ctl.red_list[i][j].append(lane_list[i][j].red_light)
+    delay, stats = inter.average_delay(), inter.delay_summary()
+    if cache is not None:
+        cache.put(key, delay, stats)
+    return (delay, stats) if summary else delay
 
-    # Car generators
-    for i in range(4):
-        for j in range(3):
-            if (i, j) in [(0, 0), (2, 0)]:
-                continue
-            env.process(gen_cars(env, lane_list[i][j], i, j, arr_duration))
 
+def run_batch(specs, runtime, block_size=DEFAULT_BLOCK_SIZE, backend="simpy",
+              scenario=None, summary=False):
+    """
+    Run many independent intersections inside a single environment.
+
+    This amortizes environment and interpreter overhead across
+    replications; each result equals the matching isolated run.
+    Cached runs are not simulated again.
+
+    Args:
+        specs (list): [{"policy": ..., "duration": ..., "seed": int,
+                        "controller": "fixed" | "adaptive",
+                        "sampling": str, "antithetic": bool}, ...]
+            ("controller", "sampling" and "antithetic" are optional)
+        runtime (float): simulated time horizon shared by all runs
+        block_size (int): variate stream block size
+        backend (str): "simpy" or "heap"
+        scenario (Scenario | None): compiled configuration
+        summary (bool): also return each intersection's delay summary
+
+    Returns:
+        list: average delay of each intersection, in `specs` order
+            (with `summary`: (average delay, delay summary) pairs)
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    cache = get_cache(scenario)
+    delays = [None] * len(specs)
+    keys = []
+    if cache is not None:
+        keys = [
+            cache.key(scenario, spec["policy"], spec["duration"], runtime, spec["seed"],
+                      spec.get("controller", "fixed"), spec.get("sampling", "mc"),
+                      spec.get("antithetic", False))
+            for spec in specs
+        ]
+        found = cache.get_many(keys, require_summary=summary)
+        delays = [found.get(key) for key in keys]
+
+    pending = [k for k, delay in enumerate(delays) if delay is None]
+    if not pending:
+        return delays if summary else [delay for delay, _ in delays]
+
+    env = make_environment(backend)
+
+    intersections = [
+        Intersection(
+            env, specs[k]["policy"], specs[k]["duration"], specs[k]["seed"],
+            specs[k].get("controller", "fixed"), block_size,
+            sampling=specs[k].get("sampling", "mc"),
+            antithetic=specs[k].get("antithetic", False),
+            scenario=scenario
+        )
+        for k in pending
+    ]
     env.run(runtime)
 
-    # Compute performance
-    total_delay = 0
-    total_cust = 0
-
-    for i in range(4):
-        for j in range(3):
-            if (i, j) in [(0, 0), (2, 0)]:
-                continue
-            total_delay += lane_list[i][j].total_delay
-            total_cust  += lane_list[i][j].total_customer
+    for k, inter in zip(pending, intersections):
+        delays[k] = (inter.average_delay(), inter.delay_summary())
+    if cache is not None:
+        cache.put_many([(keys[k],) + delays[k] for k in pending])
 
-    return total_delay / total_cust
+    return delays if summary else [delay for delay, _ in delays]
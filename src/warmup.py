@@ -0,0 +1,201 @@
+"""
+warmup.py
+------------------------
+Warm-up detection, state snapshots and replications forked from them.
+
+Every cold replication starts from empty queues plus the dummy cars of
+init_conditions.json and has to simulate the transient again. Here the
+warm-up is simulated once per scenario instead:
+
+1. A pilot run records the average delay of every `interval` seconds.
+   The end of the warm-up is the MSER-5 truncation point of that series
+   (the truncation that minimizes the squared standard error of the
+   mean of the remaining batch means, searched over the first half).
+2. A second run with the same seed stops at that time and takes an
+   Intersection.snapshot(): lane queues, pending discharges and
+   arrivals, departure queues, current signal phase, controller
+   durations and pressure state, and the random stream positions.
+3. Each replication restores the snapshot in a fresh environment that
+   starts at the warm-up time, with its own fresh random streams, and
+   measures only the following `runtime` seconds.
+
+Restoring with the snapshot's own streams continues the original run
+exactly, so the snapshot is complete. Results are steady-state delays,
+i.e. without the transient that cold replications average in.
+"""
+
+import math
+from time import perf_counter
+import numpy as np
+from .intersection import Intersection, INACTIVE_LANES
+from .distributions_dynamic import DEFAULT_BLOCK_SIZE
+from .event_engine import make_environment
+from .parallel import run_tasks
+from .scenario import load_scenario
+
+DEFAULT_INTERVAL = 20
+DEFAULT_BATCH = 5
+
+
+def mser_truncation(series, batch=DEFAULT_BATCH):
+    """
+    MSER-k truncation point of an output series.
+
+    Args:
+        series (list): observations in time order
+        batch (int): observations per batch (k)
+
+    Returns:
+        int: number of leading observations to discard
+    """
+    y = np.asarray(series, dtype=float)
+    n = len(y) // batch
+    if n < 2:
+        return 0
+
+    means = y[:n * batch].reshape(n, batch).mean(axis=1)
+
+    best_d, best = 0, math.inf
+    for d in range(n // 2 + 1):
+        tail = means[d:]
+        stat = np.sum((tail - tail.mean()) ** 2) / len(tail) ** 2
+        if stat < best:
+            best_d, best = d, stat
+
+    return best_d * batch
+
+
+def _interval_delays(env, inter, interval, series):
+    """Process appending the average delay of every `interval` seconds."""
+    lanes = [inter.lane_list[i][j] for i in range(4) for j in range(3)
+             if (i, j) not in INACTIVE_LANES]
+    last_delay = last_count = 0
+    value = 0.0
+
+    while True:
+        yield env.timeout(interval)
+        delay = sum(lane.total_delay for lane in lanes)
+        count = sum(lane.total_customer for lane in lanes)
+
+        # An interval without departures repeats the previous value
+        if count > last_count:
+            value = (delay - last_delay) / (count - last_count)
+        series.append(value)
+        last_delay, last_count = delay, count
+
+
+def detect_warmup(policy, duration, seed, horizon, controller="fixed",
+                  interval=DEFAULT_INTERVAL, batch=DEFAULT_BATCH,
+                  block_size=DEFAULT_BLOCK_SIZE, backend="simpy", scenario=None):
+    """
+    Pilot run + MSER truncation.
+
+    Returns:
+        (warm-up time in s, interval delay series)
+    """
+    env = make_environment(backend)
+    inter = Intersection(env, policy, duration, seed, controller, block_size,
+                         log_enabled=False, scenario=scenario)
+    series = []
+    env.process(_interval_delays(env, inter, interval, series))
+    env.run(horizon)
+
+    # At least one interval, so the snapshot is past the start-up events
+    warmup = max(1, mser_truncation(series, batch)) * interval
+    return warmup, series
+
+
+def take_warm_snapshot(policy, duration, seed, warmup, controller="fixed",
+                       block_size=DEFAULT_BLOCK_SIZE, backend="simpy",
+                       scenario=None, include_streams=False):
+    """Simulate `warmup` seconds and snapshot the intersection."""
+    env = make_environment(backend)
+    inter = Intersection(env, policy, duration, seed, controller, block_size,
+                         log_enabled=False, scenario=scenario)
+    env.run(warmup)
+    return inter.snapshot(include_streams)
+
+
+def fork_replication(snap, runtime, seed, block_size=DEFAULT_BLOCK_SIZE,
+                     backend="simpy", scenario=None):
+    """
+    Continue a snapshot for `runtime` seconds with fresh streams.
+
+    Returns:
+        float: average delay of the vehicles served after the snapshot
+    """
+    env = make_environment(backend, snap["time"])
+    inter = Intersection(env, snap["policy"], snap["duration"], seed, snap["controller"],
+                         block_size, log_enabled=False, scenario=scenario)
+    inter.restore(snap)
+    env.run(snap["time"] + runtime)
+    return inter.average_delay()
+
+
+def run_warm_replications(policy, duration, runtime, seed, n_rep, controller="fixed",
+                          workers=1, block_size=DEFAULT_BLOCK_SIZE, backend="simpy",
+                          scenario=None):
+    """
+    Simulate the warm-up once and fork `n_rep` replications from it.
+
+    Settings come from the "warmup" block of base_settings.json:
+    "horizon" (pilot length, default runtime), "interval" and "batch"
+    (MSER-5 on interval delays). Replication r uses seed + 1 + r.
+
+    Returns:
+        dict:
+            {
+                "warmup": warm-up time (s),
+                "mean_delay", "std_delay": over the replications,
+                "samples": [...],
+                "pilot_s", "snapshot_s", "forks_s": wall times,
+                "saved_s": estimated wall time saved versus n_rep cold
+                    replications that each simulate the warm-up
+            }
+    """
+    scenario = scenario if scenario is not None else load_scenario()
+    cfg = scenario.base.get("warmup", {})
+    horizon = cfg.get("horizon") or runtime
+    interval = cfg.get("interval", DEFAULT_INTERVAL)
+    batch = cfg.get("batch", DEFAULT_BATCH)
+
+    start = perf_counter()
+    warmup, series = detect_warmup(policy, duration, seed, horizon, controller, interval,
+                                   batch, block_size, backend, scenario)
+    pilot_s = perf_counter() - start
+    print(f"[WARMUP] MSER-{batch} over {len(series)} intervals of {interval}s "
+          f"→ warm-up ends at t={warmup:g}s ({pilot_s:.2f}s pilot)")
+
+    start = perf_counter()
+    snap = take_warm_snapshot(policy, duration, seed, warmup, controller,
+                              block_size, backend, scenario)
+    snapshot_s = perf_counter() - start
+
+    tasks = [
+        (r, fork_replication, (snap, runtime, seed + 1 + r, block_size, backend, scenario))
+        for r in range(n_rep)
+    ]
+
+    def report(r, delay):
+        print(f"  Forked run {r+1}/{n_rep} → delay={delay:.4f}")
+
+    start = perf_counter()
+    samples = run_tasks(tasks, workers, on_result=report)
+    forks_s = perf_counter() - start
+
+    # Cold replications would each simulate the warm-up again
+    saved_s = n_rep * snapshot_s - (pilot_s + snapshot_s)
+    print(f"[WARMUP] Warm-up simulated once ({snapshot_s:.2f}s) instead of {n_rep} times; "
+          f"forks took {forks_s:.2f}s, estimated saving {saved_s:+.2f}s "
+          f"including the pilot.")
+
+    return {
+        "warmup": warmup,
+        "mean_delay": float(np.mean(samples)),
+        "std_delay": float(np.std(samples)),
+        "samples": samples,
+        "pilot_s": pilot_s,
+        "snapshot_s": snapshot_s,
+        "forks_s": forks_s,
+        "saved_s": saved_s,
+    }